@@ -1,7 +1,13 @@
 from aiogram import Bot, Dispatcher
+from aiogram.fsm.storage.memory import SimpleEventIsolation
 
 from app.config import BOT_TOKEN
+from app.fsm.storage import create_storage
+from app.middlewares.outbound import OutboundRateLimiter
 
 bot = Bot(token=BOT_TOKEN)
+# Every outgoing call is paced against Telegram's global and per-chat limits
+bot.session.middleware(OutboundRateLimiter())
 
-dp = Dispatcher()
\ No newline at end of file
+# Updates of one chat are handled one at a time, so a double click cannot answer a question twice
+dp = Dispatcher(storage=create_storage(), events_isolation=SimpleEventIsolation())
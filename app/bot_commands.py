@@ -4,7 +4,11 @@ editor_commands = [
     BotCommand(command="start", description="Bot starten"),
     BotCommand(command="add_example", description="Neues Beispiel hinzufügen"),
     BotCommand(command="list_examples", description="Alle Beispiele anzeigen"),
+    BotCommand(command="search_examples", description="Beispiele durchsuchen"),
+    BotCommand(command="import_examples", description="Beispiele aus Datei importieren"),
+    BotCommand(command="export_examples", description="Beispiele als Datei exportieren"),
     BotCommand(command="add_access_codes", description="Die Zugangscodes hinzufügen"),
+    BotCommand(command="generate_access_codes", description="Neue Zugangscodes erzeugen"),
 ]
 
 user_commands = [
@@ -12,5 +16,6 @@ user_commands = [
     BotCommand(command="start_training", description="Training starten"),
     BotCommand(command="my_statistics", description="Meine Statistik anzeigen"),
     BotCommand(command="bot_settings", description="Bot-Einstellungen"),
+    BotCommand(command="redeem_code", description="Zugangscode einlösen"),
     BotCommand(command="feedback", description="Feedback an Entwickler")
 ]
@@ -3,4 +3,12 @@ from enum import Enum
 class UserRole(str, Enum):
     USER = "user"
     EDITOR = "editor"
-    ADMIN = "admin"
\ No newline at end of file
+    ADMIN = "admin"
+
+# Reference data every database starts with; level ids follow this order (A2 < B1 < ...)
+LEVEL_NAMES = ["A2", "B1", "B2", "C1", "C2"]
+CATEGORY_NAMES = [
+    "Präpositionen", "Verben mit Präposition",
+    "Konjunktionaladverbien", "Redewendungen",
+    "Grammatik", "Wortschatz", "Sonstiges",
+]
@@ -0,0 +1,110 @@
+import logging
+from typing import Callable
+
+from sqlalchemy import Table, inspect, insert, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError
+
+from app.db.enums import CATEGORY_NAMES, LEVEL_NAMES
+from app.db.models import Base, Category, Level, UserExampleStat
+from app.services.search import create_search_index
+
+logger = logging.getLogger(__name__)
+
+
+# === Migration steps ===
+# Each step runs in its own transaction together with the version bump. Steps check
+# what exists before changing it, so databases created before versioning (which start
+# at version 0) are brought up to date just like new ones.
+
+def _create_tables(connection: Connection):
+    # New databases get the whole current schema; existing tables are left alone
+    Base.metadata.create_all(connection)
+
+
+def _add_missing_columns(connection: Connection, table: Table, names: list[str]):
+    existing = {column["name"] for column in inspect(connection).get_columns(table.name)}
+    for name in names:
+        if name not in existing:
+            column = table.c[name]
+            column_type = column.type.compile(dialect=connection.dialect)
+            connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {name} {column_type}"))
+
+
+def _add_review_columns(connection: Connection):
+    _add_missing_columns(connection, UserExampleStat.__table__, ["last_attempt_at", "box", "due_at"])
+
+
+def _create_indexes(connection: Connection):
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+
+
+def _index_hot_queries(connection: Connection):
+    _create_indexes(connection)
+    # Planner statistics: without them SQLite filters the example list through the level
+    # index and sorts, instead of walking (sentence, id) and probing the level of each row
+    connection.execute(text("ANALYZE"))
+
+
+def _seed_reference_data(connection: Connection):
+    # Inserted in list order, so new databases get level ids in ascending level order
+    for model, names in ((Level, LEVEL_NAMES), (Category, CATEGORY_NAMES)):
+        existing = set(connection.execute(select(model.name)).scalars())
+        missing = [{"name": name} for name in names if name not in existing]
+        if missing:
+            connection.execute(insert(model.__table__), missing)
+
+
+# (version, description, step); append new steps, never change or reorder applied ones
+MIGRATIONS: list[tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "create tables", _create_tables),
+    (2, "add review columns to user_example_stats", _add_review_columns),
+    (3, "create indexes", _create_indexes),
+    (4, "create example search index", create_search_index),
+    (5, "seed levels and categories", _seed_reference_data),
+    (6, "index example levels and answers", _index_hot_queries),
+]
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def _read_version(connection: Connection) -> int:
+    try:
+        return connection.execute(text("SELECT version FROM schema_version")).scalar() or 0
+    except DBAPIError:
+        # No version table yet: a new database or one created before versioning
+        return 0
+
+
+def schema_version(engine: Engine) -> int:
+    with engine.connect() as connection:
+        return _read_version(connection)
+
+
+def migrate(engine: Engine) -> int:
+    """
+    Applies the pending migrations and returns how many ran.
+
+    An up-to-date database costs a single SELECT of the stored version: no table
+    reflection, no create_all and no seeding queries on a normal start.
+    """
+    version = schema_version(engine)
+    if version >= LATEST_VERSION:
+        return 0
+
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE IF NOT EXISTS schema_version (version INTEGER NOT NULL)"))
+
+    applied = 0
+    for number, description, step in MIGRATIONS:
+        with engine.begin() as connection:
+            # Re-read inside the transaction: another process may have migrated meanwhile
+            if number <= _read_version(connection):
+                continue
+            logger.info("Applying migration %s: %s", number, description)
+            step(connection)
+            connection.execute(text("DELETE FROM schema_version"))
+            connection.execute(text("INSERT INTO schema_version (version) VALUES (:version)"), {"version": number})
+        applied += 1
+    return applied
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, Boolean, DateTime, Table, Time
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Boolean, DateTime, Table, Time, Index, text
 from sqlalchemy.orm import relationship, declarative_base
 from datetime import datetime
 
@@ -9,7 +9,10 @@ example_levels = Table(
     "example_levels",
     Base.metadata,
     Column("example_id", Integer, ForeignKey("examples.id")),
-    Column("level_id", Integer, ForeignKey("levels.id"))
+    Column("level_id", Integer, ForeignKey("levels.id")),
+    # Examples of a level (list filter, index build) and levels of examples (answer history join)
+    Index("ix_example_levels_level_id_example_id", "level_id", "example_id"),
+    Index("ix_example_levels_example_id", "example_id"),
 )
 
 class User(Base):
@@ -34,6 +37,12 @@ class AccessCode(Base):
     used_by = Column(Integer, ForeignKey("users.id"), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        # Partial index over the codes that can still be redeemed; it shrinks as codes are used
+        Index("ix_access_codes_unused", "code",
+              sqlite_where=text("is_used = 0"), postgresql_where=text("NOT is_used")),
+    )
+
 
 class Level(Base):
     __tablename__ = "levels"
@@ -69,6 +78,12 @@ class Example(Base):
     answers = relationship("Answer", back_populates="example")
     user_stats = relationship("UserExampleStat", back_populates="example")
 
+    __table_args__ = (
+        # Keyset pagination of the editor list, overall and per category
+        Index("ix_examples_sentence_id", "sentence", "id"),
+        Index("ix_examples_category_sentence_id", "category_id", "sentence", "id"),
+    )
+
 
 class Answer(Base):
     __tablename__ = "answers"
@@ -80,6 +95,11 @@ class Answer(Base):
 
     example = relationship("Example", back_populates="answers")
 
+    __table_args__ = (
+        # Answers of the examples of a round
+        Index("ix_answers_example_id", "example_id"),
+    )
+
 
 class UserCategoryStat(Base):
     __tablename__ = "user_category_stats"
@@ -102,10 +122,19 @@ class UserExampleStat(Base):
 
     correct_attempts = Column(Integer, default=0)
     total_attempts = Column(Integer, default=0)
+    last_attempt_at = Column(DateTime, nullable=True)
+    # Leitner box (1 = just failed) and when the example is due again
+    box = Column(Integer, nullable=True)
+    due_at = Column(DateTime, nullable=True)
 
     user = relationship("User", back_populates="example_stats")
     example = relationship("Example", back_populates="user_stats")
 
+    __table_args__ = (
+        # Covering index for "weakest examples of a user" lookups
+        Index("ix_user_example_stats_user_attempts", "user_id", "total_attempts", "correct_attempts"),
+    )
+
 class UserSettings(Base):
     __tablename__ = "user_settings"
 
@@ -116,4 +145,9 @@ class UserSettings(Base):
     training_time = Column(Time, nullable=True)
 
     user = relationship("User", back_populates="settings")
-    level = relationship("Level")
\ No newline at end of file
+    level = relationship("Level")
+
+    __table_args__ = (
+        # Reminder lookups: distinct times and the users of one minute
+        Index("ix_user_settings_training_time", "training_time"),
+    )
\ No newline at end of file
@@ -1,7 +1,106 @@
 # app/db/session.py
-from sqlalchemy import create_engine
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from sqlalchemy import create_engine, event, make_url
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker
 
-DATABASE_URL = "sqlite:///./app/db/db.sqlite3"
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
\ No newline at end of file
+from app.config import (
+    DATABASE_URL, DB_MAX_OVERFLOW, DB_MAX_WORKERS, DB_POOL_RECYCLE, DB_POOL_SIZE, DB_POOL_TIMEOUT,
+    DB_STATEMENT_CACHE_SIZE, SQLITE_BUSY_TIMEOUT, SQLITE_CACHE_SIZE_KB, SQLITE_MMAP_SIZE,
+)
+
+
+def tune_sqlite(engine: Engine) -> Engine:
+    """
+    Sets the connection pragmas of the bot's SQLite profile on every new connection:
+    WAL, so readers never block the writer (and vice versa); synchronous=NORMAL,
+    which in WAL mode only syncs at checkpoints; a larger page cache and mmap reads;
+    and a busy timeout instead of failing at once when another writer holds the lock.
+    Does nothing for other databases.
+    """
+    if engine.dialect.name != "sqlite":
+        return engine
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+        # Negative: size in KiB rather than in pages
+        cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}")
+        cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT}")
+        cursor.close()
+
+    return engine
+
+
+def engine_options(url: str) -> dict:
+    """
+    create_engine keyword arguments for the database behind the URL.
+    """
+    options = {"query_cache_size": DB_STATEMENT_CACHE_SIZE}
+    if make_url(url).get_backend_name() == "sqlite":
+        # Sessions are opened in the DB threads, not in the thread that created the engine
+        options["connect_args"] = {"check_same_thread": False}
+        return options
+    return {
+        **options,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        # A connection the server closed (restart, idle timeout) is replaced before use
+        "pool_pre_ping": True,
+        # Reusing the most recent connection lets surplus ones sit idle until recycled
+        "pool_use_lifo": True,
+    }
+
+
+def create_db_engine(url: str = DATABASE_URL) -> Engine:
+    return tune_sqlite(create_engine(url, **engine_options(url)))
+
+
+engine = create_db_engine()
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Bounded pool for blocking ORM work, so one slow query never stalls the event loop
+db_executor = ThreadPoolExecutor(max_workers=DB_MAX_WORKERS, thread_name_prefix="db")
+
+
+async def run_db(func, *args, **kwargs):
+    """
+    Runs a blocking database function in the DB thread pool and returns its result.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(db_executor, partial(func, *args, **kwargs))
+
+
+def dialect_insert(session, table):
+    """
+    Returns an INSERT construct of the session's dialect, which supports ON CONFLICT upserts.
+    """
+    if session.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(table)
+
+
+def insert_many(session, stmt, rows: list[dict], chunk_size: int | None = None) -> list:
+    """
+    Runs a Core INSERT on a table (not a mapped class) as one plain executemany per
+    `chunk_size` rows, without the ORM bulk-insert bookkeeping (no mapped objects,
+    identity map or per-row events). Returns the first RETURNING column of every
+    inserted row, or an empty list when the statement returns nothing.
+    """
+    chunk_size = chunk_size or len(rows) or 1
+    returned = []
+    for start in range(0, len(rows), chunk_size):
+        result = session.execute(stmt, rows[start:start + chunk_size])
+        if result.returns_rows:
+            returned.extend(result.scalars())
+    return returned
@@ -0,0 +1,97 @@
+from typing import Any, Mapping
+
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, StateType, StorageKey
+
+_NOT_LOADED = object()
+
+
+class BufferedFSMContext(FSMContext):
+    """
+    FSMContext that reads state and data from storage at most once per update
+    and keeps every change in memory until commit() writes it back.
+    """
+
+    def __init__(self, storage: BaseStorage, key: StorageKey, state: Any = _NOT_LOADED):
+        super().__init__(storage, key)
+        self._state = state
+        self._data: Any = _NOT_LOADED
+        self._state_dirty = False
+        self._data_dirty = False
+        # Storage round-trips made through this context
+        self.storage_calls = 0
+
+    async def get_state(self) -> str | None:
+        if self._state is _NOT_LOADED:
+            self.storage_calls += 1
+            self._state = await self.storage.get_state(key=self.key)
+        return self._state
+
+    async def set_state(self, state: StateType = None) -> None:
+        self._state = state.state if isinstance(state, State) else state
+        self._state_dirty = True
+
+    async def _load_data(self) -> dict[str, Any]:
+        if self._data is _NOT_LOADED:
+            self.storage_calls += 1
+            self._data = dict(await self.storage.get_data(key=self.key))
+        return self._data
+
+    async def get_data(self) -> dict[str, Any]:
+        return (await self._load_data()).copy()
+
+    async def get_value(self, key: str, default: Any | None = None) -> Any | None:
+        return (await self._load_data()).get(key, default)
+
+    async def set_data(self, data: Mapping[str, Any]) -> None:
+        self._data = dict(data)
+        self._data_dirty = True
+
+    async def update_data(self, data: Mapping[str, Any] | None = None, **kwargs: Any) -> dict[str, Any]:
+        current = await self._load_data()
+        if data:
+            current.update(data)
+        current.update(kwargs)
+        self._data_dirty = True
+        return current.copy()
+
+    async def commit(self):
+        """
+        Writes the changed state and data back, one storage call each at most.
+        """
+        if self._state_dirty:
+            self.storage_calls += 1
+            await self.storage.set_state(key=self.key, state=self._state)
+            self._state_dirty = False
+        if self._data_dirty:
+            self.storage_calls += 1
+            await self.storage.set_data(key=self.key, data=self._data)
+            self._data_dirty = False
+
+
+class FSMMetrics:
+    """
+    Counts FSM storage round-trips per update.
+    """
+
+    def __init__(self):
+        self.updates = 0
+        self.storage_calls = 0
+        self.max_calls = 0
+
+    def record(self, calls: int):
+        self.updates += 1
+        self.storage_calls += calls
+        self.max_calls = max(self.max_calls, calls)
+
+    def snapshot(self) -> dict[str, float]:
+        return {
+            "updates": self.updates,
+            "storage_calls": self.storage_calls,
+            "calls_per_update": self.storage_calls / self.updates if self.updates else 0.0,
+            "max_calls_per_update": self.max_calls,
+        }
+
+
+fsm_metrics = FSMMetrics()
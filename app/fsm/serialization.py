@@ -0,0 +1,6 @@
+import json
+from functools import partial
+
+# Compact JSON for FSM data: no padding whitespace and umlauts kept as UTF-8
+dumps = partial(json.dumps, separators=(",", ":"), ensure_ascii=False)
+loads = json.loads
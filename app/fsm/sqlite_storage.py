@@ -0,0 +1,144 @@
+import asyncio
+import logging
+import sqlite3
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, DefaultKeyBuilder, KeyBuilder, StateType, StorageKey
+
+from app.fsm.serialization import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+
+class SQLiteStorage(BaseStorage):
+    """
+    FSM storage in a local SQLite file (WAL mode) with write-behind batching.
+
+    Writes land in an in-memory buffer that is also used for reads and are
+    written to disk in one transaction every `flush_interval` seconds and on close.
+    All SQLite access happens on one dedicated thread. A failed write puts its
+    changes back into the buffer (unless newer ones arrived) for the next flush.
+    """
+
+    def __init__(self, path: str, flush_interval: float = 0.05, key_builder: KeyBuilder | None = None):
+        self._key_builder = key_builder or DefaultKeyBuilder()
+        self._flush_interval = flush_interval
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="fsm-sqlite")
+        self._connection = self._executor.submit(self._connect, path).result()
+        # key -> pending value; None means "clear"
+        self._dirty_states: dict[str, str | None] = {}
+        self._dirty_data: dict[str, str | None] = {}
+        # Changes being written right now; still served to readers until they are on disk
+        self._writing_states: dict[str, str | None] = {}
+        self._writing_data: dict[str, str | None] = {}
+        self._flush_lock = asyncio.Lock()
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._flushing: asyncio.Task | None = None
+        self._closed = False
+
+    @staticmethod
+    def _connect(path: str) -> sqlite3.Connection:
+        connection = sqlite3.connect(path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute("CREATE TABLE IF NOT EXISTS fsm (key TEXT PRIMARY KEY, state TEXT, data TEXT)")
+        connection.commit()
+        return connection
+
+    async def _run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    def _schedule_flush(self):
+        if self._flush_handle is None:
+            loop = asyncio.get_running_loop()
+            self._flush_handle = loop.call_later(self._flush_interval, self._start_flush)
+
+    def _start_flush(self):
+        self._flush_handle = None
+        self._flushing = asyncio.get_running_loop().create_task(self._flush_on_timer())
+
+    async def _flush_on_timer(self):
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception("Failed to write FSM states, retrying")
+            self._schedule_flush()
+
+    async def flush(self):
+        async with self._flush_lock:
+            if not self._dirty_states and not self._dirty_data:
+                return
+            self._writing_states, self._dirty_states = self._dirty_states, {}
+            self._writing_data, self._dirty_data = self._dirty_data, {}
+            try:
+                await self._run(self._write, self._writing_states, self._writing_data)
+            except Exception:
+                # Keep the changes; ones made while this write ran are newer and win
+                for key, value in self._writing_states.items():
+                    self._dirty_states.setdefault(key, value)
+                for key, value in self._writing_data.items():
+                    self._dirty_data.setdefault(key, value)
+                raise
+            finally:
+                self._writing_states, self._writing_data = {}, {}
+
+    def _write(self, states: dict[str, str | None], data: dict[str, str | None]):
+        with self._connection:
+            self._connection.executemany(
+                "INSERT INTO fsm (key, state) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET state = excluded.state",
+                states.items(),
+            )
+            self._connection.executemany(
+                "INSERT INTO fsm (key, data) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET data = excluded.data",
+                data.items(),
+            )
+            self._connection.execute("DELETE FROM fsm WHERE state IS NULL AND data IS NULL")
+
+    def _read(self, key: str, column: str) -> str | None:
+        row = self._connection.execute(f"SELECT {column} FROM fsm WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        self._dirty_states[self._key_builder.build(key)] = state.state if isinstance(state, State) else state
+        self._schedule_flush()
+
+    async def get_state(self, key: StorageKey) -> str | None:
+        storage_key = self._key_builder.build(key)
+        for pending in (self._dirty_states, self._writing_states):
+            if storage_key in pending:
+                return pending[storage_key]
+        return await self._run(self._read, storage_key, "state")
+
+    async def set_data(self, key: StorageKey, data: Mapping[str, Any]) -> None:
+        self._dirty_data[self._key_builder.build(key)] = dumps(dict(data)) if data else None
+        self._schedule_flush()
+
+    async def get_data(self, key: StorageKey) -> dict[str, Any]:
+        storage_key = self._key_builder.build(key)
+        for pending in (self._dirty_data, self._writing_data):
+            if storage_key in pending:
+                raw = pending[storage_key]
+                break
+        else:
+            raw = await self._run(self._read, storage_key, "data")
+        return loads(raw) if raw else {}
+
+    async def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._flushing is not None:
+            await self._flushing
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception("Failed to write FSM states on close, %s changes are lost",
+                             len(self._dirty_states) + len(self._dirty_data))
+        await self._run(self._connection.close)
+        self._executor.shutdown()
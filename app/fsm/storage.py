@@ -0,0 +1,18 @@
+from aiogram.fsm.storage.base import BaseStorage
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from app.config import FSM_STORAGE, FSM_SQLITE_PATH, FSM_REDIS_URL
+from app.fsm.serialization import dumps, loads
+from app.fsm.sqlite_storage import SQLiteStorage
+
+
+def create_storage(backend: str = FSM_STORAGE) -> BaseStorage:
+    if backend == "memory":
+        return MemoryStorage()
+    if backend == "sqlite":
+        return SQLiteStorage(FSM_SQLITE_PATH)
+    if backend == "redis":
+        # Needs the optional `redis` package
+        from aiogram.fsm.storage.redis import RedisStorage
+        return RedisStorage.from_url(FSM_REDIS_URL, json_dumps=dumps, json_loads=loads)
+    raise ValueError(f"Unknown FSM storage: {backend}")
@@ -0,0 +1,64 @@
+from typing import Any, Awaitable, Callable
+
+from aiogram import Router
+from aiogram.dispatcher.event.bases import SkipHandler
+from aiogram.dispatcher.event.handler import CallableObject
+from aiogram.filters.callback_data import CallbackData
+from aiogram.types import CallbackQuery
+
+SEPARATOR = ":"
+
+
+class CallbackIndex:
+    """
+    Routes callback queries of a router with a single dict lookup on the prefix of
+    their data, instead of testing every handler's filter in registration order.
+
+    A route is either a CallbackData factory (its prefix is the key and the parsed
+    payload is passed to the handler as `callback_data`) or a plain string that must
+    equal the whole callback data. Unknown data is skipped, so handlers and routers
+    registered after the index still get a chance.
+    """
+
+    def __init__(self):
+        self._routes: dict[str, tuple[type[CallbackData] | None, CallableObject]] = {}
+
+    def __call__(self, key: str | type[CallbackData]):
+        if isinstance(key, str):
+            prefix, factory = key, None
+        else:
+            prefix, factory = key.__prefix__, key
+
+        def decorator(handler: Callable[..., Awaitable[Any]]):
+            if prefix in self._routes:
+                raise ValueError(f"Callback prefix {prefix!r} is already routed")
+            self._routes[prefix] = (factory, CallableObject(handler))
+            return handler
+
+        return decorator
+
+    def __len__(self) -> int:
+        return len(self._routes)
+
+    async def dispatch(self, callback: CallbackQuery, **kwargs: Any) -> Any:
+        data = callback.data or ""
+        route = self._routes.get(data.partition(SEPARATOR)[0])
+        if route is None:
+            raise SkipHandler()
+        factory, handler = route
+        if factory is None:
+            # Plain string routes match only the exact data
+            if SEPARATOR in data:
+                raise SkipHandler()
+        else:
+            try:
+                kwargs["callback_data"] = factory.unpack(data)
+            except (TypeError, ValueError):
+                raise SkipHandler()
+        return await handler.call(callback, **kwargs)
+
+    def attach(self, router: Router):
+        """
+        Registers the index as one callback_query handler of the router.
+        """
+        router.callback_query.register(self.dispatch)
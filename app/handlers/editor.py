@@ -1,22 +1,37 @@
-from datetime import datetime
+import os
+import tempfile
+from collections import OrderedDict
 
 from aiogram import Router, F
 from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton, BotCommandScopeChat, \
-    ReplyKeyboardRemove
+    ReplyKeyboardRemove, FSInputFile, BufferedInputFile
+from sqlalchemy import func
 from sqlalchemy.orm import joinedload
 
 from app.db.enums import UserRole
 from app.keyboards import editor as kb
-from app.db.models import Category, Level, User, Example, Answer, AccessCode, example_levels
-from aiogram.filters import Command, CommandStart
-from app.db.session import SessionLocal
+from app.keyboards.editor import CategoryCallback, ExamplePageCallback, ExampleViewCallback, LevelToggleCallback
+from app.db.models import Category, Level, User, Example, Answer, example_levels
+from aiogram.filters import Command, CommandObject, CommandStart
+from app.db.session import SessionLocal, run_db
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
 
 from app.bot_commands import editor_commands, user_commands
+from app.handlers.callbacks import CallbackIndex
+from app.services.access_codes import add_access_codes, create_access_codes, parse_codes, redeem_access_code
+from app.services.example_catalog import example_catalog
+from app.services.example_events import example_events
+from app.services.example_rules import incorrect_answers_error, levels_error, sentence_error
+from app.services.example_transfer import FORMATS, ExampleImporter, ImportReport, export_examples
+from app.services.role_cache import role_cache
+from app.services.search import search_examples
 from aiogram.client.bot import Bot
 
 router = Router()
+# Every callback query of this router is routed by its data prefix
+callbacks = CallbackIndex()
+callbacks.attach(router)
 
 class AccessCodeFSM(StatesGroup):
     waiting_for_code = State()
@@ -35,6 +50,10 @@ class ExampleAddFSM(StatesGroup):
     waiting_for_levels = State()
     preview_and_confirm = State()
 
+# === FSM States for importing examples from a file ===
+class ExampleImportFSM(StatesGroup):
+    waiting_for_file = State()
+
 # === FSM States for listing examples ===
 class ExampleListFSM(StatesGroup):
     browsing = State()
@@ -42,87 +61,257 @@ class ExampleListFSM(StatesGroup):
 
 # === Pagination Settings ===
 EXAMPLES_PER_PAGE = 10
+SEARCH_RESULTS_LIMIT = 10
 
-def is_user(user_id: int) -> bool:
-    session = SessionLocal()
-    user = session.query(User).filter(User.id == user_id).first()
-    session.close()
-    return user and user.role == UserRole.USER.value
+# Bots can download files of up to 20 MB
+MAX_IMPORT_FILE_SIZE = 20 * 1024 * 1024
+MAX_GENERATED_CODES = 100000
 
-def is_editor(user_id: int) -> bool:
-    session = SessionLocal()
-    user = session.query(User).filter(User.id == user_id).first()
-    session.close()
-    return user and user.role == UserRole.EDITOR.value
+# Roles are injected into handler data by RoleMiddleware (cached, no DB query per command)
+def is_user(role: str | None) -> bool:
+    return role == UserRole.USER.value
 
-def is_admin(user_id: int) -> bool:
-    session = SessionLocal()
-    user = session.query(User).filter(User.id == user_id).first()
-    session.close()
-    return user and user.role == UserRole.ADMIN.value
+def is_editor(role: str | None) -> bool:
+    return role == UserRole.EDITOR.value
 
+def is_admin(role: str | None) -> bool:
+    return role == UserRole.ADMIN.value
 
-@router.message(CommandStart())
-async def start_command(message: Message, state: FSMContext):
-    # Clear any previous FSM state (in case user comes from old version)
-    await state.clear()
 
+# === Blocking DB helpers (executed in the DB thread pool via run_db) ===
+def _ensure_user(user_id: int, username: str) -> str:
     session = SessionLocal()
     try:
-        user = session.query(User).filter_by(id=message.from_user.id).first()
+        user = session.query(User).filter_by(id=user_id).first()
 
         if not user:
             # Create a new user without any access code
-            user = User(
-                id=message.from_user.id,
-                username=(message.from_user.username or message.from_user.full_name),
-                role=UserRole.USER.value
-            )
+            user = User(id=user_id, username=username, role=UserRole.USER.value)
             session.add(user)
             session.commit()
+        return user.role
+    finally:
+        session.close()
 
-        # Reset bot commands before setting actual ones
-        await message.bot.delete_my_commands(scope=BotCommandScopeChat(chat_id=message.chat.id))
+
+def _get_categories():
+    session = SessionLocal()
+    try:
+        return session.query(Category).all()
     finally:
         session.close()
 
-    await _show_main_menu(message, state)
 
+def _get_levels(level_ids: list[int] = None):
+    session = SessionLocal()
+    try:
+        query = session.query(Level)
+        if level_ids is not None:
+            query = query.filter(Level.id.in_(level_ids))
+        return query.all()
+    finally:
+        session.close()
 
-async def _show_main_menu(message: Message, state: FSMContext):
-    bot: Bot = message.bot
 
+def _get_category(category_id: int):
     session = SessionLocal()
     try:
-        user = session.query(User).filter_by(id=message.from_user.id).first()
-        if not user:
-            await message.answer("⚠️ Benutzer nicht gefunden.")
-            return
+        return session.query(Category).filter(Category.id == category_id).first()
+    finally:
+        session.close()
 
-        if user.role == UserRole.EDITOR.value:
-            # Configure editor-specific commands
-            await bot.delete_my_commands(scope=BotCommandScopeChat(chat_id=message.chat.id))
-            await bot.set_my_commands(editor_commands, scope=BotCommandScopeChat(chat_id=message.chat.id))
-            await message.answer(
-                "👋 Willkommen, Redakteur! Hier sind deine verfügbaren Befehle.",
-                reply_markup=ReplyKeyboardRemove()
-            )
-            await message.answer("Wähle eine Option aus dem Menü unten 👇")
-        else:
-            # Configure normal user commands
-            await bot.set_my_commands(user_commands, scope=BotCommandScopeChat(chat_id=message.chat.id))
-            await message.answer(
-                "Hallo! 👋 Ich helfe dir beim Training für die Sprachbausteine.",
-                reply_markup=ReplyKeyboardRemove()
-            )
-            await message.answer("Wähle aus dem Menü unten, was du machen möchtest 👇")
+
+def _save_example(data: dict, user_id: int) -> int:
+    session = SessionLocal()
+    try:
+        example = Example(
+            sentence=data['sentence'],
+            explanation=data['explanation'],
+            category_id=data['category_id'],
+            created_by=user_id
+        )
+        session.add(example)
+        session.flush()
+
+        for level_id in data['selected_levels']:
+            level = session.query(Level).filter_by(id=level_id).first()
+            example.levels.append(level)
+
+        session.add_all([
+            Answer(example_id=example.id, text=data['correct_answer'], is_correct=True),
+            *[
+                Answer(example_id=example.id, text=ans, is_correct=False)
+                for ans in data['incorrect_answers']
+            ]
+        ])
+
+        session.commit()
+        return example.id
     finally:
         session.close()
 
 
+def _load_example_page(request: ExamplePageCallback):
+    session = SessionLocal()
+    try:
+        rows, has_previous, has_next = example_catalog.page(
+            session, EXAMPLES_PER_PAGE, request.category_id, request.level_id,
+            after=request.after, before=request.before,
+        )
+        total = example_catalog.count(session, request.category_id, request.level_id)
+        return rows, has_previous, has_next, total
+    finally:
+        session.close()
+
+
+def _resolve_list_filter(name: str) -> tuple[int | None, int | None] | None:
+    """
+    Maps a level or category name to the (category_id, level_id) filter of the example list.
+    """
+    session = SessionLocal()
+    try:
+        level_id = session.query(Level.id).filter(func.lower(Level.name) == name.lower()).scalar()
+        if level_id is not None:
+            return None, level_id
+        category_id = session.query(Category.id).filter(func.lower(Category.name) == name.lower()).scalar()
+        if category_id is not None:
+            return category_id, None
+        return None
+    finally:
+        session.close()
+
+
+def _search_examples(query: str) -> list[tuple[int, str]]:
+    session = SessionLocal()
+    try:
+        return search_examples(session, query, SEARCH_RESULTS_LIMIT)
+    finally:
+        session.close()
+
+
+def _import_examples(path: str, fmt: str, user_id: int) -> ImportReport:
+    session = SessionLocal()
+    try:
+        with open(path, encoding="utf-8-sig", newline="") as stream:
+            return ExampleImporter(session, user_id).run(stream, fmt)
+    finally:
+        session.close()
+
+
+def _export_examples(fmt: str) -> str:
+    """
+    Writes all examples to a temporary file and returns its path; the caller removes it.
+    """
+    descriptor, path = tempfile.mkstemp(suffix=f".{fmt}")
+    session = SessionLocal()
+    try:
+        with open(descriptor, "w", encoding="utf-8", newline="") as stream:
+            export_examples(session, stream, fmt)
+        return path
+    except Exception:
+        os.remove(path)
+        raise
+    finally:
+        session.close()
+
+
+def _file_format(file_name: str | None) -> str | None:
+    extension = os.path.splitext(file_name or "")[1].lstrip(".").lower()
+    return extension if extension in FORMATS else None
+
+
+def _load_example_detail(example_id: int):
+    session = SessionLocal()
+    try:
+        return session.query(Example).options(
+            joinedload(Example.answers),
+            joinedload(Example.category),
+            joinedload(Example.levels)
+        ).filter(Example.id == example_id).first()
+    finally:
+        session.close()
+
+
+def _add_access_codes(codes: list[str]) -> tuple[int, int]:
+    session = SessionLocal()
+    try:
+        return add_access_codes(session, codes)
+    finally:
+        session.close()
+
+
+def _redeem_access_code(code: str, user_id: int, username: str) -> bool:
+    session = SessionLocal()
+    try:
+        return redeem_access_code(session, code, user_id, username)
+    finally:
+        session.close()
+
+
+def _create_access_codes(count: int) -> list[str]:
+    session = SessionLocal()
+    try:
+        return create_access_codes(session, count)
+    finally:
+        session.close()
+
+
+@router.message(CommandStart())
+async def start_command(message: Message, state: FSMContext, role: str | None = None):
+    # Clear any previous FSM state (in case user comes from old version)
+    await state.clear()
+
+    if role is None:
+        role = await run_db(_ensure_user, message.from_user.id, message.from_user.username or message.from_user.full_name)
+        role_cache.set_role(message.from_user.id, role)
+
+    await _show_main_menu(message, state, role)
+
+
+# Role whose command menu each recently active chat already has, so repeated /start
+# calls skip the API; least recently used chats drop out (they just get the menu again)
+_chat_commands: OrderedDict[int, str] = OrderedDict()
+MAX_TRACKED_CHATS = 10000
+
+
+async def _set_chat_commands(bot: Bot, chat_id: int, role: str):
+    if _chat_commands.get(chat_id) == role:
+        _chat_commands.move_to_end(chat_id)
+        return
+    # set_my_commands replaces the whole command list of the chat scope
+    commands = editor_commands if role == UserRole.EDITOR.value else user_commands
+    await bot.set_my_commands(commands, scope=BotCommandScopeChat(chat_id=chat_id))
+    _chat_commands[chat_id] = role
+    _chat_commands.move_to_end(chat_id)
+    if len(_chat_commands) > MAX_TRACKED_CHATS:
+        _chat_commands.popitem(last=False)
+
+
+async def _show_main_menu(message: Message, state: FSMContext, role: str | None):
+    bot: Bot = message.bot
+
+    if role is None:
+        await message.answer("⚠️ Benutzer nicht gefunden.")
+        return
+
+    await _set_chat_commands(bot, message.chat.id, role)
+    if role == UserRole.EDITOR.value:
+        await message.answer(
+            "👋 Willkommen, Redakteur! Hier sind deine verfügbaren Befehle.",
+            reply_markup=ReplyKeyboardRemove()
+        )
+        await message.answer("Wähle eine Option aus dem Menü unten 👇")
+    else:
+        await message.answer(
+            "Hallo! 👋 Ich helfe dir beim Training für die Sprachbausteine.",
+            reply_markup=ReplyKeyboardRemove()
+        )
+        await message.answer("Wähle aus dem Menü unten, was du machen möchtest 👇")
+
+
 @router.message(Command("add_example"))
-async def start_example_addition(message: Message, state: FSMContext):
-    if not is_editor(message.from_user.id):
+async def start_example_addition(message: Message, state: FSMContext, role: str | None = None):
+    if not is_editor(role):
         await message.delete()
         return
     await state.set_state(ExampleAddFSM.waiting_for_sentence)
@@ -131,8 +320,9 @@ async def start_example_addition(message: Message, state: FSMContext):
 
 @router.message(ExampleAddFSM.waiting_for_sentence)
 async def handle_sentence(message: Message, state: FSMContext):
-    if "[x]" not in message.text:
-        await message.answer("⚠️ Bitte markiere die Lücke mit [x]. Versuche es erneut.")
+    error = sentence_error(message.text)
+    if error:
+        await message.answer(error)
         return
     await state.update_data(sentence=message.text)
     await state.set_state(ExampleAddFSM.waiting_for_correct_answer)
@@ -156,34 +346,31 @@ async def handle_explanation(message: Message, state: FSMContext):
 @router.message(ExampleAddFSM.waiting_for_incorrect_answers)
 async def handle_incorrect_answers(message: Message, state: FSMContext):
     incorrect = [s.strip() for s in message.text.split(",") if s.strip()]
-    if len(incorrect) < 2:
-        await message.answer("Bitte gib mindestens zwei falsche Antworten ein.")
+    error = incorrect_answers_error(incorrect)
+    if error:
+        await message.answer(error)
         return
     await state.update_data(incorrect_answers=incorrect)
 
     # Категории из БД
-    session = SessionLocal()
-    categories = session.query(Category).all()
-    session.close()
+    categories = await run_db(_get_categories)
 
-    buttons = [[InlineKeyboardButton(text=cat.name, callback_data=f"cat_{cat.id}")] for cat in categories]
+    buttons = [[InlineKeyboardButton(text=cat.name, callback_data=CategoryCallback(category_id=cat.id).pack())] for cat in categories]
     markup = InlineKeyboardMarkup(inline_keyboard=buttons)
     await state.set_state(ExampleAddFSM.waiting_for_category)
     await message.answer("📚 Wähle eine Kategorie:", reply_markup=markup)
 
 
-@router.callback_query(lambda c: c.data.startswith("cat_"))
-async def handle_category_selection(callback: CallbackQuery, state: FSMContext):
-    cat_id = int(callback.data.split("_")[1])
+@callbacks(CategoryCallback)
+async def handle_category_selection(callback: CallbackQuery, callback_data: CategoryCallback, state: FSMContext):
+    cat_id = callback_data.category_id
     await state.update_data(category_id=cat_id, selected_levels=[])
     await state.set_state(ExampleAddFSM.waiting_for_levels)
     await show_level_selection(callback, state)
 
 
 async def show_level_selection(callback: CallbackQuery, state: FSMContext):
-    session = SessionLocal()
-    levels = session.query(Level).all()
-    session.close()
+    levels = await run_db(_get_levels)
 
     data = await state.get_data()
     selected_levels = data.get("selected_levels", [])
@@ -191,7 +378,7 @@ async def show_level_selection(callback: CallbackQuery, state: FSMContext):
     buttons = []
     for level in levels:
         label = f"✔️ {level.name}" if level.id in selected_levels else level.name
-        buttons.append([InlineKeyboardButton(text=label, callback_data=f"level_toggle_{level.id}")])
+        buttons.append([InlineKeyboardButton(text=label, callback_data=LevelToggleCallback(level_id=level.id).pack())])
 
     buttons.append([InlineKeyboardButton(text="✅ Fertig", callback_data="level_done")])
 
@@ -199,9 +386,9 @@ async def show_level_selection(callback: CallbackQuery, state: FSMContext):
     await callback.message.edit_text("Bitte wähle bis zu zwei aufeinanderfolgende Niveaus:", reply_markup=markup)
 
 
-@router.callback_query(lambda c: c.data.startswith("level_toggle_"))
-async def handle_level_toggle(callback: CallbackQuery, state: FSMContext):
-    level_id = int(callback.data.split("_")[-1])
+@callbacks(LevelToggleCallback)
+async def handle_level_toggle(callback: CallbackQuery, callback_data: LevelToggleCallback, state: FSMContext):
+    level_id = callback_data.level_id
     data = await state.get_data()
     selected = data.get("selected_levels", [])
 
@@ -214,31 +401,22 @@ async def handle_level_toggle(callback: CallbackQuery, state: FSMContext):
     await show_level_selection(callback, state)
 
 
-@router.callback_query(lambda c: c.data == "level_done")
+@callbacks("level_done")
 async def handle_level_done(callback: CallbackQuery, state: FSMContext):
     data = await state.get_data()
     selected = data.get("selected_levels", [])
 
-    if not selected:
-        await callback.answer("❗️Bitte wähle mindestens ein Sprachniveau aus.", show_alert=True)
-        return
-
-    if len(selected) > 2:
-        await callback.answer("❗️Maximal zwei Niveaus erlaubt.", show_alert=True)
-        return
-
-    if len(selected) == 2 and abs(selected[0] - selected[1]) != 1:
-        await callback.answer("❗️Die gewählten Niveaus müssen aufeinanderfolgend sein.", show_alert=True)
+    levels = await run_db(_get_levels, selected)
+    error = levels_error([level.name for level in levels])
+    if error:
+        await callback.answer(error, show_alert=True)
         return
 
     await state.set_state(ExampleAddFSM.preview_and_confirm)
     await callback.message.edit_reply_markup()
 
     # Предпросмотр
-    session = SessionLocal()
-    levels = session.query(Level).filter(Level.id.in_(selected)).all()
-    category = session.query(Category).filter(Category.id == data["category_id"]).first()
-    session.close()
+    category = await run_db(_get_category, data["category_id"])
 
     preview = (
         f"📋 Vorschau des Beispiels:\n\n"
@@ -257,57 +435,47 @@ async def handle_level_done(callback: CallbackQuery, state: FSMContext):
     await callback.message.answer(preview, reply_markup=buttons)
 
 
-@router.callback_query(lambda c: c.data == "cancel_example")
+@callbacks("cancel_example")
 async def handle_cancel_example(callback: CallbackQuery, state: FSMContext):
     await state.clear()
     await callback.message.edit_reply_markup()
     await callback.message.answer("❌ Beispiel wurde nicht gespeichert.")
 
 
-@router.callback_query(lambda c: c.data == "save_example")
+@callbacks("save_example")
 async def handle_save_example(callback: CallbackQuery, state: FSMContext):
     data = await state.get_data()
-    session = SessionLocal()
-
-    example = Example(
-        sentence=data['sentence'],
-        explanation=data['explanation'],
-        category_id=data['category_id'],
-        created_by=callback.from_user.id
-    )
-    session.add(example)
-    session.flush()
-
-    for level_id in data['selected_levels']:
-        level = session.query(Level).filter_by(id=level_id).first()
-        example.levels.append(level)
-
-    session.add_all([
-        Answer(example_id=example.id, text=data['correct_answer'], is_correct=True),
-        *[
-            Answer(example_id=example.id, text=ans, is_correct=False)
-            for ans in data['incorrect_answers']
-        ]
-    ])
-
-    session.commit()
-    session.close()
+    example_id = await run_db(_save_example, data, callback.from_user.id)
+    # Available for training and in the list right away, in every worker process
+    example_events.added([(example_id, data['category_id'], data['selected_levels'])])
 
     await state.clear()
     await callback.message.edit_reply_markup()
     await callback.message.answer("✅ Beispiel wurde erfolgreich gespeichert.")
 
 
-def get_example_list_markup(page: int, examples: list[Example], total: int):
+def _button_label(sentence: str) -> str:
+    return sentence[:50] + ("..." if len(sentence) > 50 else "")
+
+
+def get_example_list_markup(request: ExamplePageCallback, rows, has_previous: bool, has_next: bool):
     buttons = [[
-        InlineKeyboardButton(text=e.sentence[:50] + ("..." if len(e.sentence) > 50 else ""), callback_data=f"view_example_{e.id}")
-    ] for e in examples]
+        InlineKeyboardButton(text=_button_label(e.sentence), callback_data=ExampleViewCallback(example_id=e.id).pack())
+    ] for e in rows]
 
+    # Neighbouring pages are anchored on the first/last example shown here
+    filters = {"category_id": request.category_id, "level_id": request.level_id}
     nav_buttons = []
-    if page > 1:
-        nav_buttons.append(InlineKeyboardButton(text="⬅️ Zurück", callback_data=f"page_{page - 1}"))
-    if page * EXAMPLES_PER_PAGE < total:
-        nav_buttons.append(InlineKeyboardButton(text="➡️ Weiter", callback_data=f"page_{page + 1}"))
+    if has_previous and rows:
+        nav_buttons.append(InlineKeyboardButton(
+            text="⬅️ Zurück",
+            callback_data=ExamplePageCallback(page=request.page - 1, before=rows[0].id, **filters).pack(),
+        ))
+    if has_next and rows:
+        nav_buttons.append(InlineKeyboardButton(
+            text="➡️ Weiter",
+            callback_data=ExamplePageCallback(page=request.page + 1, after=rows[-1].id, **filters).pack(),
+        ))
 
     if nav_buttons:
         buttons.append(nav_buttons)
@@ -316,52 +484,73 @@ def get_example_list_markup(page: int, examples: list[Example], total: int):
 
 
 @router.message(Command("list_examples"))
-async def list_examples(message: Message, state: FSMContext):
-    if not is_editor(message.from_user.id):
+async def list_examples(message: Message, state: FSMContext, role: str | None = None, command: CommandObject | None = None):
+    if not is_editor(role):
         await message.delete()
         return
+
+    # Optional filter: /list_examples B1 or /list_examples Präpositionen
+    category_id = level_id = None
+    if command and command.args:
+        list_filter = await run_db(_resolve_list_filter, command.args.strip())
+        if list_filter is None:
+            await message.answer("❗️ Unbekanntes Niveau oder unbekannte Kategorie.")
+            return
+        category_id, level_id = list_filter
+
     await state.set_state(ExampleListFSM.browsing)
-    await show_example_page(message, state, 1)
+    await show_example_page(message, state, ExamplePageCallback(page=1, category_id=category_id, level_id=level_id))
 
 
-@router.callback_query(lambda c: c.data.startswith("page_"))
-async def paginate_examples(callback: CallbackQuery, state: FSMContext):
-    page = int(callback.data.split("_")[1])
-    await show_example_page(callback.message, state, page, edit=True)
+@callbacks(ExamplePageCallback)
+async def paginate_examples(callback: CallbackQuery, callback_data: ExamplePageCallback, state: FSMContext):
+    await show_example_page(callback.message, state, callback_data, edit=True)
     await callback.answer()
 
 
-async def show_example_page(target: Message, state: FSMContext, page: int, edit=False):
-    session = SessionLocal()
-    total = session.query(Example).count()
-    examples = (
-        session.query(Example)
-        .order_by(Example.sentence)  # 🔠 Алфавитная сортировка
-        .offset((page - 1) * EXAMPLES_PER_PAGE)
-        .limit(EXAMPLES_PER_PAGE)
-        .all()
-    )
-    session.close()
+async def show_example_page(target: Message, state: FSMContext, request: ExamplePageCallback, edit=False):
+    rows, has_previous, has_next, total = await run_db(_load_example_page, request)
+    # Remembered so "back" from an example returns to this page
+    await state.update_data(example_list_page=request.pack())
 
-    markup = get_example_list_markup(page, examples, total)
+    markup = get_example_list_markup(request, rows, has_previous, has_next)
+    pages = max(1, -(-total // EXAMPLES_PER_PAGE))
+    text = f"📋 Liste der Beispiele (Seite {request.page}/{pages}):"
     if edit:
-        await target.edit_text("📋 Liste der Beispiele:", reply_markup=markup)
+        await target.edit_text(text, reply_markup=markup)
     else:
-        await target.answer("📋 Liste der Beispiele:", reply_markup=markup)
+        await target.answer(text, reply_markup=markup)
 
 
-@router.callback_query(lambda c: c.data.startswith("view_example_"))
-async def view_example_detail(callback: CallbackQuery, state: FSMContext):
-    example_id = int(callback.data.split("_")[2])
-    session = SessionLocal()
+@router.message(Command("search_examples"))
+async def search_examples_command(message: Message, state: FSMContext, role: str | None = None,
+                                  command: CommandObject | None = None):
+    if not is_editor(role):
+        await message.delete()
+        return
 
-    example = session.query(Example).options(
-        joinedload(Example.answers),
-        joinedload(Example.category),
-        joinedload(Example.levels)
-    ).filter(Example.id == example_id).first()
+    query = command.args.strip() if command and command.args else ""
+    if not query:
+        await message.answer("🔎 Bitte gib einen Suchbegriff an, z. B. /search_examples freuen auf")
+        return
 
-    session.close()
+    results = await run_db(_search_examples, query)
+    if not results:
+        await message.answer("🔎 Keine Beispiele gefunden.")
+        return
+
+    markup = InlineKeyboardMarkup(inline_keyboard=[
+        [InlineKeyboardButton(text=_button_label(sentence), callback_data=ExampleViewCallback(example_id=example_id).pack())]
+        for example_id, sentence in results
+    ])
+    await state.set_state(ExampleListFSM.browsing)
+    await message.answer(f"🔎 Ergebnisse für „{query}“:", reply_markup=markup)
+
+
+@callbacks(ExampleViewCallback)
+async def view_example_detail(callback: CallbackQuery, callback_data: ExampleViewCallback, state: FSMContext):
+    example_id = callback_data.example_id
+    example = await run_db(_load_example_detail, example_id)
 
     correct = next((a.text for a in example.answers if a.is_correct), "-")
     incorrect = [a.text for a in example.answers if not a.is_correct]
@@ -387,38 +576,170 @@ async def view_example_detail(callback: CallbackQuery, state: FSMContext):
     await callback.answer()
 
 
-@router.callback_query(lambda c: c.data == "back_to_list")
+@callbacks("back_to_list")
 async def back_to_list(callback: CallbackQuery, state: FSMContext):
+    data = await state.get_data()
+    request = data.get("example_list_page")
     await state.set_state(ExampleListFSM.browsing)
-    await show_example_page(callback.message, state, 1, edit=True)
+    await show_example_page(
+        callback.message, state,
+        ExamplePageCallback.unpack(request) if request else ExamplePageCallback(page=1), edit=True,
+    )
     await callback.answer()
 
 
+@router.message(Command("import_examples"))
+async def start_example_import(message: Message, state: FSMContext, role: str | None = None):
+    if not is_editor(role):
+        await message.delete()
+        return
+    await state.set_state(ExampleImportFSM.waiting_for_file)
+    await message.answer(
+        "📥 Sende eine CSV- oder JSONL-Datei mit den Spalten:\n"
+        "sentence, correct_answer, incorrect_answers, explanation, category, levels\n\n"
+        "Mehrere falsche Antworten oder Niveaus werden mit | getrennt, z. B. an|für und B1|B2."
+    )
+
+
+@router.message(ExampleImportFSM.waiting_for_file, F.document)
+async def handle_import_file(message: Message, state: FSMContext):
+    document = message.document
+    fmt = _file_format(document.file_name)
+    if fmt is None:
+        await message.answer("⚠️ Bitte sende eine .csv- oder .jsonl-Datei.")
+        return
+    if document.file_size and document.file_size > MAX_IMPORT_FILE_SIZE:
+        await message.answer("⚠️ Die Datei ist zu groß (maximal 20 MB).")
+        return
+
+    await message.answer("⏳ Die Datei wird importiert...")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, f"import.{fmt}")
+        await message.bot.download(document, destination=path)
+        report = await run_db(_import_examples, path, fmt, message.from_user.id)
+    await state.clear()
+    example_events.added(report.examples)
+
+    lines = [
+        f"✅ {report.imported} Beispiel(e) importiert, {report.rejected} Zeile(n) übersprungen "
+        f"({report.rows_per_second:.0f} Zeilen/s)."
+    ]
+    lines += [f"Zeile {line}: {error}" for line, error in report.errors]
+    if report.rejected > len(report.errors):
+        lines.append(f"... und {report.rejected - len(report.errors)} weitere.")
+    await message.answer("\n".join(lines))
+
+
+@router.message(ExampleImportFSM.waiting_for_file)
+async def handle_import_without_file(message: Message):
+    await message.answer("📎 Bitte sende die Beispiele als Datei (CSV oder JSONL).")
+
+
+@router.message(Command("export_examples"))
+async def export_examples_command(message: Message, role: str | None = None, command: CommandObject | None = None):
+    if not is_editor(role):
+        await message.delete()
+        return
+
+    fmt = command.args.strip().lower() if command and command.args else "csv"
+    if fmt not in FORMATS:
+        await message.answer("❗️ Unbekanntes Format. Verwende /export_examples csv oder /export_examples jsonl.")
+        return
+
+    path = await run_db(_export_examples, fmt)
+    try:
+        await message.answer_document(FSInputFile(path, filename=f"examples.{fmt}"))
+    finally:
+        os.remove(path)
+
+
 @router.message(Command("add_access_codes"))
-async def start_add_codes(message: Message, state: FSMContext):
-    if not is_editor(message.from_user.id):
+async def start_add_codes(message: Message, state: FSMContext, role: str | None = None):
+    if not is_editor(role):
         await message.delete()
         return
     await state.set_state(AccessCodeAddFSM.waiting_for_codes)
-    await message.answer("🔐 Bitte gib die Zugangscodes durch Komma getrennt ein:")
+    await message.answer(
+        "🔐 Bitte gib die Zugangscodes durch Komma getrennt ein "
+        "oder sende eine Textdatei mit einem Code pro Zeile:"
+    )
+
+
+async def _store_codes(message: Message, state: FSMContext, codes: list[str]):
+    added_count, duplicate_count = await run_db(_add_access_codes, codes)
+    text = f"✅ {added_count} Zugangscode(s) wurden erfolgreich hinzugefügt."
+    if duplicate_count:
+        text += f"\n♻️ {duplicate_count} doppelte oder bereits vorhandene Code(s) wurden übersprungen."
+    await message.answer(text)
+    await state.clear()
+
+
+@router.message(AccessCodeAddFSM.waiting_for_codes, F.document)
+async def handle_add_codes_file(message: Message, state: FSMContext):
+    if message.document.file_size and message.document.file_size > MAX_IMPORT_FILE_SIZE:
+        await message.answer("⚠️ Die Datei ist zu groß (maximal 20 MB).")
+        return
+    content = await message.bot.download(message.document)
+    await _store_codes(message, state, parse_codes(content.read().decode("utf-8-sig", errors="replace")))
+
 
 @router.message(AccessCodeAddFSM.waiting_for_codes)
 async def handle_add_codes(message: Message, state: FSMContext):
-    codes_text = message.text
-    codes = [c.strip() for c in codes_text.split(",") if c.strip()]
+    await _store_codes(message, state, parse_codes(message.text or ""))
 
-    session = SessionLocal()
-    added_count = 0
-    for code in codes:
-        if not session.query(AccessCode).filter_by(code=code).first():
-            new_code = AccessCode(code=code, is_used=False, created_at=datetime.utcnow())
-            session.add(new_code)
-            added_count += 1
-
-    session.commit()
-    session.close()
-    await message.answer(f"✅ {added_count} Zugangscode(s) wurden erfolgreich hinzugefügt.")
+
+@router.message(Command("generate_access_codes"))
+async def generate_codes_command(message: Message, role: str | None = None, command: CommandObject | None = None):
+    if not is_editor(role):
+        await message.delete()
+        return
+
+    args = command.args.strip() if command and command.args else ""
+    if not args.isdigit() or not 1 <= int(args) <= MAX_GENERATED_CODES:
+        await message.answer(f"❗️ Gib die Anzahl an (1–{MAX_GENERATED_CODES}), z. B. /generate_access_codes 100")
+        return
+
+    codes = await run_db(_create_access_codes, int(args))
+    await message.answer_document(
+        BufferedInputFile("\n".join(codes).encode(), filename="access_codes.txt"),
+        caption=f"✅ {len(codes)} neue Zugangscode(s) wurden erstellt.",
+    )
+
+
+@router.message(Command("redeem_code"))
+async def start_code_redemption(message: Message, state: FSMContext, role: str | None = None,
+                                command: CommandObject | None = None):
+    if is_editor(role):
+        await message.answer("ℹ️ Du bist bereits Redakteur.")
+        return
+    if is_admin(role):
+        await message.answer("ℹ️ Als Administrator brauchst du keinen Zugangscode.")
+        return
+    # The code may come right with the command: /redeem_code ABCD2345EFGH
+    if command and command.args:
+        await _redeem_code(message, state, command.args.strip())
+        return
+    await state.set_state(AccessCodeFSM.waiting_for_code)
+    await message.answer("🔑 Bitte gib deinen Zugangscode ein:")
+
+
+@router.message(AccessCodeFSM.waiting_for_code, F.text)
+async def handle_access_code(message: Message, state: FSMContext):
+    await _redeem_code(message, state, message.text.strip())
+
+
+async def _redeem_code(message: Message, state: FSMContext, code: str):
+    user = message.from_user
+    redeemed = await run_db(_redeem_access_code, code, user.id, user.username or user.full_name)
     await state.clear()
+    if not redeemed:
+        await message.answer("❌ Dieser Zugangscode ist ungültig oder wurde bereits verwendet.")
+        return
+
+    role_cache.set_role(user.id, UserRole.EDITOR.value)
+    await message.answer("✅ Zugangscode akzeptiert. Du bist jetzt Redakteur.")
+    await _show_main_menu(message, state, UserRole.EDITOR.value)
+
 
 @router.message(F.text, ~F.text.startswith("/"))
 async def handle_unexpected_message(message: Message, state: FSMContext):
@@ -1,4 +1,5 @@
-from datetime import datetime
+import secrets
+from datetime import time as dt_time
 from enum import Enum
 
 from aiogram import Router, F
@@ -6,11 +7,22 @@ from aiogram.filters import Command
 from aiogram.types import Message, CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup
 from aiogram.fsm.state import State, StatesGroup
 from aiogram.fsm.context import FSMContext
-from app.db.session import SessionLocal
-from app.db.models import Example, Answer, Level, example_levels, UserCategoryStat, Category, UserSettings
-import random
+from app.db.session import SessionLocal, run_db
+from app.db.models import UserCategoryStat, Category, UserSettings
+from app.handlers.callbacks import CallbackIndex
+from app.keyboards.user import (
+    AnswerCallback, AnswerCountCallback, TrainCountCallback, TrainLevelCallback, TrainTimeCallback, answer_keyboard,
+)
+from app.services.example_index import example_index
+from app.services.reminders import reminder_scheduler
+from app.services.selector import example_selector
+from app.services.stats_recorder import stats_recorder
+from app.services.training import Question, load_round
 
 router = Router()
+# Every callback query of this router is routed by its data prefix
+callbacks = CallbackIndex()
+callbacks.attach(router)
 
 
 # === FSM States for training ===
@@ -31,98 +43,173 @@ class AnswerOptionsCount(Enum):
     FIVE = 5
 
 
+# === Blocking DB helpers (executed in the DB thread pool via run_db) ===
+def _get_user_settings(user_id: int):
+    session = SessionLocal()
+    try:
+        return session.query(UserSettings).filter_by(user_id=user_id).first()
+    finally:
+        session.close()
+
+
+def _load_round(example_ids: list[int], user_id: int) -> list[dict]:
+    session = SessionLocal()
+    try:
+        # Prefetch the whole round so answering needs no further reads
+        return [question.to_dict() for question in load_round(session, example_ids, user_id)]
+    finally:
+        session.close()
+
+
+async def _start_round(level_id: int, count: int, user_id: int) -> list[dict]:
+    selected_ids = await example_selector.select(user_id, level_id, count)
+    return await run_db(_load_round, selected_ids, user_id)
+
+
+def _round_data(questions: list[dict], level_id: int) -> dict:
+    return {
+        # Answer buttons carry the nonce, so buttons of older rounds are recognized as stale
+        "round_nonce": secrets.token_urlsafe(4),
+        "level_id": level_id,
+        "example_ids": [q["example_id"] for q in questions],
+        "questions": questions,
+        "current_index": 0,
+        "correct_count": 0,
+        "total_count": len(questions),
+    }
+
+
+def _load_category_stats(user_id: int) -> list[tuple[str, int, int]]:
+    session = SessionLocal()
+    try:
+        stats = session.query(UserCategoryStat).filter_by(user_id=user_id).all()
+        if not stats:
+            return []
+
+        # Prefetch category names in one query to avoid N+1
+        category_ids = [s.category_id for s in stats]
+        categories = session.query(Category).filter(Category.id.in_(category_ids)).all()
+        category_map = {c.id: c.name for c in categories}
+
+        return [
+            (category_map.get(s.category_id, f"ID {s.category_id}"), s.correct_attempts, s.total_attempts)
+            for s in stats
+        ]
+    finally:
+        # Always close the session
+        session.close()
+
+
+def _save_training_time(user_id: int, training_time):
+    session = SessionLocal()
+    try:
+        user_settings = session.query(UserSettings).filter_by(user_id=user_id).first()
+        if not user_settings:
+            if training_time is None:
+                return
+            user_settings = UserSettings(user_id=user_id, training_time=training_time)
+            session.add(user_settings)
+        else:
+            user_settings.training_time = training_time
+        session.commit()
+    finally:
+        session.close()
+
+
+def _save_answers_count(user_id: int, value: int):
+    session = SessionLocal()
+    try:
+        user_settings = session.query(UserSettings).filter_by(user_id=user_id).first()
+
+        if not user_settings:
+            user_settings = UserSettings(user_id=user_id, answers_count=value)
+            session.add(user_settings)
+        else:
+            user_settings.answers_count = value
+
+        session.commit()
+    finally:
+        session.close()
+
+
 @router.message(Command("start_training"))
 async def cmd_training(message: Message, state: FSMContext):
-    session = SessionLocal()
-    user_settings = session.query(UserSettings).filter_by(user_id=message.from_user.id).first()
+    user_settings = await run_db(_get_user_settings, message.from_user.id)
 
     if user_settings and user_settings.language_level:
         level_id = user_settings.language_level
         examples_count = user_settings.examples_count
 
         if examples_count:
-            example_ids = session.query(Example.id).join(example_levels).filter(example_levels.c.level_id == level_id).all()
-            selected_ids = random.sample([e[0] for e in example_ids], examples_count)
-            level = session.query(Level).filter(Level.id == level_id).first()
-            session.close()
+            questions = await _start_round(level_id, examples_count, message.from_user.id)
 
-            await state.update_data(example_ids=selected_ids, current_index=0, correct_count=0, total_count=len(selected_ids))
-            await message.answer(f"🎯 Niveau: {level.name}\n📊 Anzahl der Beispiele: {examples_count}\nLos geht's mit dem Training! ⬇️")
+            await state.update_data(**_round_data(questions, level_id))
+            await message.answer(f"🎯 Niveau: {example_index.level_name(level_id)}\n📊 Anzahl der Beispiele: {examples_count}\nLos geht's mit dem Training! ⬇️")
             await send_example(message, state)
         else:
             await state.update_data(level_id=level_id)
-            session.close()
             await ask_for_count(message, state)
     else:
-        session.close()
         await ask_for_level(message, state)
 
 async def ask_for_level(message: Message, state: FSMContext):
-    session = SessionLocal()
     level_buttons = []
     current_row = []
 
-    for level in session.query(Level).all():
-        count = session.query(Example).join(example_levels).filter(example_levels.c.level_id == level.id).count()
-        if count >= 5:
-            current_row.append(InlineKeyboardButton(text=level.name, callback_data=f"train_level_{level.id}"))
-            if len(current_row) == 2:
-                level_buttons.append(current_row)
-                current_row = []
+    for level_id, level_name in example_index.levels_with_at_least(5):
+        current_row.append(InlineKeyboardButton(text=level_name, callback_data=TrainLevelCallback(level_id=level_id).pack()))
+        if len(current_row) == 2:
+            level_buttons.append(current_row)
+            current_row = []
 
     if current_row:
         level_buttons.append(current_row)
 
     markup = InlineKeyboardMarkup(inline_keyboard=level_buttons)
-    session.close()
 
     await state.set_state(TrainingFSM.waiting_for_level)
     await message.answer("🧠 Für welches Niveau möchtest du trainieren?", reply_markup=markup)
 
 async def ask_for_count(message: Message, state: FSMContext):
-    session = SessionLocal()
     level_id = (await state.get_data()).get("level_id")
-    examples_count = session.query(Example).join(example_levels).filter(example_levels.c.level_id == level_id).count()
-    level = session.query(Level).filter(Level.id == level_id).first()
-    session.close()
+    examples_count = example_index.count(level_id)
+    level_name = example_index.level_name(level_id)
 
     row = []
     for n in [5, 10, 20]:
         if examples_count >= n:
-            row.append(InlineKeyboardButton(text=str(n), callback_data=f"train_count_{n}"))
+            row.append(InlineKeyboardButton(text=str(n), callback_data=TrainCountCallback(count=n).pack()))
 
     markup = InlineKeyboardMarkup(inline_keyboard=[row])
 
-    await message.answer(f"✅ Niveau gewählt: {level.name}\nWähle, wie viele Beispiele du trainieren möchtest:", reply_markup=markup)
-    await state.update_data(level_name=level.name)
+    await message.answer(f"✅ Niveau gewählt: {level_name}\nWähle, wie viele Beispiele du trainieren möchtest:", reply_markup=markup)
+    await state.update_data(level_name=level_name)
     await state.set_state(TrainingFSM.waiting_for_count)
 
-@router.callback_query(lambda c: c.data.startswith("train_level_"))
-async def handle_level_selection(callback: CallbackQuery, state: FSMContext):
-    level_id = int(callback.data.split("_")[2])
-    session = SessionLocal()
+@callbacks(TrainLevelCallback)
+async def handle_level_selection(callback: CallbackQuery, callback_data: TrainLevelCallback, state: FSMContext):
+    level_id = callback_data.level_id
 
-    level = session.query(Level).filter(Level.id == level_id).first()
-    examples_count = session.query(Example).join(example_levels).filter(example_levels.c.level_id == level_id).count()
-    user_settings = session.query(UserSettings).filter_by(user_id=callback.from_user.id).first()
-    session.close()
+    level_name = example_index.level_name(level_id)
+    examples_count = example_index.count(level_id)
+    user_settings = await run_db(_get_user_settings, callback.from_user.id)
 
     await state.update_data(level_id=level_id, total_available=examples_count)
-    await state.update_data(level_name=level.name)
+    await state.update_data(level_name=level_name)
 
     if user_settings and user_settings.examples_count:
-        await handle_count_selection_auto(callback, state, user_settings.examples_count, level.name)
+        await handle_count_selection_auto(callback, state, user_settings.examples_count, level_name)
     else:
         row = []
         for n in [5, 10, 20]:
             if examples_count >= n:
-                row.append(InlineKeyboardButton(text=str(n), callback_data=f"train_count_{n}"))
+                row.append(InlineKeyboardButton(text=str(n), callback_data=TrainCountCallback(count=n).pack()))
 
         markup = InlineKeyboardMarkup(inline_keyboard=[row])
 
         await callback.message.delete()
         await callback.message.answer(
-            f"✅ Niveau gewählt: {level.name}\nWähle, wie viele Beispiele du trainieren möchtest:",
+            f"✅ Niveau gewählt: {level_name}\nWähle, wie viele Beispiele du trainieren möchtest:",
             reply_markup=markup
         )
         await state.set_state(TrainingFSM.waiting_for_count)
@@ -131,29 +218,23 @@ async def handle_count_selection_auto(callback: CallbackQuery, state: FSMContext
     data = await state.get_data()
     level_id = data.get("level_id")
 
-    session = SessionLocal()
-    example_ids = session.query(Example.id).join(example_levels).filter(example_levels.c.level_id == level_id).all()
-    selected_ids = random.sample([e[0] for e in example_ids], examples_count)
-    session.close()
+    questions = await _start_round(level_id, examples_count, callback.from_user.id)
 
-    await state.update_data(example_ids=selected_ids, current_index=0, correct_count=0, total_count=len(selected_ids))
+    await state.update_data(**_round_data(questions, level_id))
     await callback.message.delete()
     await callback.message.answer(f"🎯 Niveau: {level_name}\n📊 Anzahl der Beispiele: {examples_count}\nLos geht's mit dem Training! ⬇️")
     await send_example(callback, state)
 
-@router.callback_query(lambda c: c.data.startswith("train_count_"))
-async def handle_count_selection(callback: CallbackQuery, state: FSMContext):
-    count = int(callback.data.split("_")[2])
+@callbacks(TrainCountCallback)
+async def handle_count_selection(callback: CallbackQuery, callback_data: TrainCountCallback, state: FSMContext):
+    count = callback_data.count
     data = await state.get_data()
     level_id = data.get("level_id")
     level_name = data.get("level_name")
 
-    session = SessionLocal()
-    example_ids = session.query(Example.id).join(example_levels).filter(example_levels.c.level_id == level_id).all()
-    selected_ids = random.sample([e[0] for e in example_ids], count)
-    session.close()
+    questions = await _start_round(level_id, count, callback.from_user.id)
 
-    await state.update_data(example_ids=selected_ids, current_index=0, correct_count=0, total_count=len(selected_ids))
+    await state.update_data(**_round_data(questions, level_id))
     await callback.message.delete()
     await callback.message.answer(
         f"🎯 Niveau: {level_name}\n📊 Anzahl der Beispiele: {count}\nLos geht's mit dem Training! ⬇️")
@@ -178,72 +259,45 @@ async def send_example(event, state: FSMContext):
         await state.clear()
         return
 
-    example_id = example_ids[current_index]
-    session = SessionLocal()
-    example = session.query(Example).filter_by(id=example_id).first()
-    correct_answer = session.query(Answer).filter_by(example_id=example.id, is_correct=True).first()
-    incorrect_answers = session.query(Answer).filter_by(example_id=example.id, is_correct=False).all()
-
-    user_settings = session.query(UserSettings).filter_by(user_id=event.from_user.id).first()
-    answer_count = user_settings.answers_count if user_settings and user_settings.answers_count else 3
-
-    sentence = example.sentence
-    category_id = example.category_id
-    correct_text = correct_answer.text
-    incorrect_sample = [
-        a.text for a in random.sample(incorrect_answers, min(answer_count - 1, len(incorrect_answers)))
-    ]
-
-    stat = session.query(UserCategoryStat).filter_by(user_id=event.from_user.id, category_id=category_id).first()
-    if not stat:
-        stat = UserCategoryStat(user_id=event.from_user.id, category_id=category_id, correct_attempts=0, total_attempts=0)
-        session.add(stat)
-    stat.total_attempts += 1
-    session.commit()
-    session.close()
-
-    options = [correct_text] + incorrect_sample
-    random.shuffle(options)
+    question = Question.from_dict(data["questions"][current_index])
+    stats_recorder.record_attempt(event.from_user.id, question.category_id)
+    options = question.pick_options()
 
-    buttons = [[InlineKeyboardButton(text=opt, callback_data=f"train_answer_{opt}")] for opt in options]
-    markup = InlineKeyboardMarkup(inline_keyboard=buttons)
+    markup = answer_keyboard(options, data.get("round_nonce", ""), current_index)
 
-    filled_sentence = sentence.replace("[x]", "____")
-    await state.update_data(correct_answer=correct_text, current_example_id=example_id)
+    filled_sentence = question.sentence.replace("[x]", "____")
+    # Only the position of the correct option is kept; the answer text stays in the question
+    await state.update_data(correct_option=options.index(question.correct_answer))
     sender = event.message if isinstance(event, CallbackQuery) else event
     await sender.answer(f"{current_index + 1}/{len(example_ids)}. 📝 {filled_sentence}", reply_markup=markup)
 
 
 
-@router.callback_query(lambda c: c.data.startswith("train_answer_"))
-async def handle_answer(callback: CallbackQuery, state: FSMContext):
-    selected = callback.data.replace("train_answer_", "")
+@callbacks(AnswerCallback)
+async def handle_answer(callback: CallbackQuery, callback_data: AnswerCallback, state: FSMContext):
     data = await state.get_data()
-
-    correct = data.get("correct_answer")
     current_index = data.get("current_index")
-    example_id = data.get("current_example_id")
-    # print(f"handle_answer selected = {selected}, correct = {correct}")
 
-    session = SessionLocal()
-    example = session.query(Example).filter_by(id=example_id).first()
-    category_id = example.category_id
-
-    if selected == correct:
-        response = f"✅ <b>Richtig!</b> {selected}"
-        stat = session.query(UserCategoryStat).filter_by(user_id=callback.from_user.id, category_id=category_id).first()
-        # print(f"handle_answer: stat = {stat}")
-        # print(f"handle_answer: user_id  ={callback.from_user.id}, category_id = {category_id}")
+    # Buttons of an earlier question or round, or a second click on the same one. The
+    # dispatcher's event isolation runs a chat's updates one at a time, FSM commit included,
+    # so a second click always sees the index advanced by the first
+    if callback_data.nonce != data.get("round_nonce") or callback_data.question != current_index:
+        await callback.answer("Diese Frage ist bereits beantwortet.")
+        return
+
+    question = Question.from_dict(data["questions"][current_index])
+    is_correct = callback_data.option == data.get("correct_option")
+    box, due_at = example_selector.record_answer(callback.from_user.id, question.example_id, data.get("level_id"), is_correct)
+    stats_recorder.record_answer(callback.from_user.id, question.example_id, is_correct, box=box, due_at=due_at)
+    if is_correct:
+        stats_recorder.record_correct(callback.from_user.id, question.category_id)
+        response = f"✅ <b>Richtig!</b> {question.correct_answer}"
         correct_count = data.get("correct_count", 0) + 1
         await state.update_data(correct_count=correct_count)
-        if stat:
-            stat.correct_attempts += 1
-            session.commit()
     else:
-        response = f"❌ Falsch. Richtige Antwort: <b>{correct}</b>"
+        response = f"❌ Falsch. Richtige Antwort: <b>{question.correct_answer}</b>"
 
-    explanation = example.explanation or "-"
-    session.close()
+    explanation = question.explanation or "-"
 
     await callback.message.edit_reply_markup()
     await callback.message.answer(f"{response}\n\n🧾 Erklärung: {explanation}", parse_mode="HTML")
@@ -275,63 +329,54 @@ async def handle_answer(callback: CallbackQuery, state: FSMContext):
 
 @router.message(Command("my_statistics"))
 async def cmd_statistics(message: Message):
+    # Write buffered increments first so the user sees up-to-date numbers
+    await stats_recorder.flush()
+
     # Fetch per-category stats for the user
-    session = SessionLocal()
-    try:
-        stats = session.query(UserCategoryStat).filter_by(user_id=message.from_user.id).all()
-        print(f"cmd_statistics: user_id = {message.from_user.id}")
+    stats = await run_db(_load_category_stats, message.from_user.id)
+    print(f"cmd_statistics: user_id = {message.from_user.id}")
 
-        if not stats:
-            await message.answer("📊 Du hast noch keine Trainingsstatistiken.")
-            return
+    if not stats:
+        await message.answer("📊 Du hast noch keine Trainingsstatistiken.")
+        return
 
-        # Prefetch category names in one query to avoid N+1
-        category_ids = [s.category_id for s in stats]
-        categories = session.query(Category).filter(Category.id.in_(category_ids)).all()
-        category_map = {c.id: c.name for c in categories}
+    result_lines = []
+    total_correct = 0
+    total_attempts = 0
 
-        result_lines = []
-        total_correct = 0
-        total_attempts = 0
-
-        # Build per-category rows and accumulate totals
-        for stat in stats:
-            name = category_map.get(stat.category_id, f"ID {stat.category_id}")
-            percent = round((stat.correct_attempts / stat.total_attempts) * 100) if stat.total_attempts else 0
-            result_lines.append(
-                f"🏷️ <b>{name}</b> — <b>{percent}%</b> ({stat.correct_attempts}/{stat.total_attempts})"
-            )
-            total_correct += stat.correct_attempts
-            total_attempts += stat.total_attempts
-
-        # Compute overall (global) statistics
-        overall_percent = round((total_correct / total_attempts) * 100) if total_attempts else 0
-        overall_line = f"\n\n🧮 <b>Gesamt</b> — <b>{overall_percent}%</b> ({total_correct}/{total_attempts})"
-
-        final_text = (
-            "📊 Deine Statistik nach Kategorien (richtige Antworten):\n\n"
-            + "\n".join(result_lines)
-            + overall_line
+    # Build per-category rows and accumulate totals
+    for name, correct_attempts, attempts in stats:
+        percent = round((correct_attempts / attempts) * 100) if attempts else 0
+        result_lines.append(
+            f"🏷️ <b>{name}</b> — <b>{percent}%</b> ({correct_attempts}/{attempts})"
         )
+        total_correct += correct_attempts
+        total_attempts += attempts
 
-        await message.answer(final_text, parse_mode="HTML")
+    # Compute overall (global) statistics
+    overall_percent = round((total_correct / total_attempts) * 100) if total_attempts else 0
+    overall_line = f"\n\n🧮 <b>Gesamt</b> — <b>{overall_percent}%</b> ({total_correct}/{total_attempts})"
 
-    finally:
-        # Always close the session
-        session.close()
+    final_text = (
+        "📊 Deine Statistik nach Kategorien (richtige Antworten):\n\n"
+        + "\n".join(result_lines)
+        + overall_line
+    )
+
+    await message.answer(final_text, parse_mode="HTML")
 
 
 @router.message(Command("bot_settings"))
 async def cmd_bot_settings(message: Message):
     markup = InlineKeyboardMarkup(inline_keyboard=[
         [InlineKeyboardButton(text="🔢 Antwortanzahl", callback_data="setting_num_choices")],
-        # [InlineKeyboardButton(text="⏰ Trainingszeit", callback_data="setting_training_time")],
+        [InlineKeyboardButton(text="⏰ Trainingszeit", callback_data="setting_training_time")],
         # [ InlineKeyboardButton(text="⚙️ Einstellung 3", callback_data="setting_3")]
     ])
     await message.answer("🛠️ Wähle deine Einstellungen:", reply_markup=markup)
 
 
-@router.callback_query(lambda c: c.data == "setting_training_time")
+@callbacks("setting_training_time")
 async def handle_training_time_selection(callback: CallbackQuery, state: FSMContext):
     await state.set_state(SettingsFSM.waiting_for_time_selection)
     time_buttons = []
@@ -344,7 +389,8 @@ async def handle_training_time_selection(callback: CallbackQuery, state: FSMCont
 
     row = []
     for idx, time_str in enumerate(times):
-        row.append(InlineKeyboardButton(text=time_str, callback_data=f"train_time_{time_str}"))
+        hours, minutes = map(int, time_str.split(":"))
+        row.append(InlineKeyboardButton(text=time_str, callback_data=TrainTimeCallback(minute=hours * 60 + minutes).pack()))
         if (idx + 1) % 4 == 0:
             time_buttons.append(row)
             row = []
@@ -352,67 +398,47 @@ async def handle_training_time_selection(callback: CallbackQuery, state: FSMCont
         time_buttons.append(row)
 
     time_buttons.append([
-        InlineKeyboardButton(text="🛑 Tägliche Erinnerung deaktivieren", callback_data="train_time_none")
+        InlineKeyboardButton(text="🛑 Tägliche Erinnerung deaktivieren", callback_data=TrainTimeCallback(minute=None).pack())
     ])
 
     markup = InlineKeyboardMarkup(inline_keyboard=time_buttons)
     await callback.message.edit_text("⏰ Wähle deine tägliche Trainingszeit:", reply_markup=markup)
 
 
-@router.callback_query(lambda c: c.data.startswith("train_time_"))
-async def handle_selected_time(callback: CallbackQuery, state: FSMContext):
-    time_value = callback.data.replace("train_time_", "")
-    session = SessionLocal()
-    user_settings = session.query(UserSettings).filter_by(user_id=callback.from_user.id).first()
-
-    if time_value == "none":
-        if user_settings:
-            user_settings.training_time = None
-            session.commit()
+@callbacks(TrainTimeCallback)
+async def handle_selected_time(callback: CallbackQuery, callback_data: TrainTimeCallback, state: FSMContext):
+    if callback_data.minute is None:
+        await run_db(_save_training_time, callback.from_user.id, None)
         await callback.message.edit_text("🛑 Die tägliche Erinnerung wurde deaktiviert.\n\n🔁 Starte dein Training mit /start_training")
     else:
-        parsed_time = datetime.strptime(time_value, "%H:%M").time()
-        if not user_settings:
-            user_settings = UserSettings(user_id=callback.from_user.id, training_time=parsed_time)
-            session.add(user_settings)
-        else:
-            user_settings.training_time = parsed_time
-        session.commit()
-        await callback.message.edit_text(f"✅ Tägliche Trainingszeit: {time_value} Uhr\n\n🔁 Starte dein Training mit /start_training")
+        parsed_time = dt_time(callback_data.minute // 60, callback_data.minute % 60)
+        await run_db(_save_training_time, callback.from_user.id, parsed_time)
+        reminder_scheduler.notify(parsed_time)
+        await callback.message.edit_text(f"✅ Tägliche Trainingszeit: {parsed_time:%H:%M} Uhr\n\n🔁 Starte dein Training mit /start_training")
 
-    session.close()
     await state.clear()
 
 
-@router.callback_query(lambda c: c.data == "setting_num_choices")
+@callbacks("setting_num_choices")
 async def handle_setting_num_choices(callback: CallbackQuery):
-    buttons = [InlineKeyboardButton(text=str(opt.value), callback_data=f"num_opt_{opt.value}") for opt in
+    buttons = [InlineKeyboardButton(text=str(opt.value), callback_data=AnswerCountCallback(value=opt.value).pack()) for opt in
                AnswerOptionsCount]
     markup = InlineKeyboardMarkup(inline_keyboard=[buttons])
     await callback.message.edit_text("🔢 Wähle, wie viele Antwortoptionen du möchtest:", reply_markup=markup)
 
 
-@router.callback_query(lambda c: c.data.startswith("num_opt_"))
-async def set_user_answer_option(callback: CallbackQuery):
-    value = int(callback.data.split("_")[-1])
-    session = SessionLocal()
-    user_settings = session.query(UserSettings).filter_by(user_id=callback.from_user.id).first()
-
-    if not user_settings:
-        user_settings = UserSettings(user_id=callback.from_user.id, answers_count=value)
-        session.add(user_settings)
-    else:
-        user_settings.answers_count = value
-
-    session.commit()
-    session.close()
+@callbacks(AnswerCountCallback)
+async def set_user_answer_option(callback: CallbackQuery, callback_data: AnswerCountCallback):
+    value = callback_data.value
+    await run_db(_save_answers_count, callback.from_user.id, value)
 
     await callback.message.edit_text(
         f"✅ Ab jetzt bekommst du {value} Antwortoptionen in deinen Trainings.\n\n🔁 Starte dein Training mit /start_training"
     )
 
 
-@router.callback_query(lambda c: c.data.startswith("setting_") and c.data != "setting_num_choices")
+# Registered after the index, which skips settings it has no route for
+@router.callback_query(lambda c: c.data.startswith("setting_"))
 async def handle_settings_stub(callback: CallbackQuery):
     await callback.answer("⚙️ Diese Einstellung ist noch nicht verfügbar.", show_alert=True)
 
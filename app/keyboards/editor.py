@@ -1,5 +1,30 @@
+from aiogram.filters.callback_data import CallbackData
 from aiogram.types import ReplyKeyboardMarkup, KeyboardButton, InlineKeyboardMarkup, InlineKeyboardButton
 
+from app.db.enums import CATEGORY_NAMES, LEVEL_NAMES
+
+
+class CategoryCallback(CallbackData, prefix="ec"):
+    category_id: int
+
+
+class LevelToggleCallback(CallbackData, prefix="el"):
+    level_id: int
+
+
+class ExamplePageCallback(CallbackData, prefix="ep"):
+    page: int
+    # The page starts right after / right before this example id; neither means the first page
+    after: int | None = None
+    before: int | None = None
+    category_id: int | None = None
+    level_id: int | None = None
+
+
+class ExampleViewCallback(CallbackData, prefix="ev"):
+    example_id: int
+
+
 
 def editor_main_menu():
     return ReplyKeyboardMarkup(
@@ -14,14 +39,8 @@ def category_keyboard(selected: list[str] = None):
     if selected is None:
         selected = []
 
-    all_categories = [
-        "Präpositionen", "Verben mit Präposition",
-        "Konjunktionaladverbien", "Redewendungen",
-        "Grammatik", "Wortschatz", "Sonstiges"
-    ]
-
     keyboard = []
-    for cat in all_categories:
+    for cat in CATEGORY_NAMES:
         prefix = "✅ " if cat in selected else ""
         keyboard.append([
             InlineKeyboardButton(
@@ -40,9 +59,8 @@ def level_keyboard(selected: list[str] = None):
     if selected is None:
         selected = []
 
-    all_levels = ["A2", "B1", "B2", "C1", "C2"]
     keyboard = []
-    for level in all_levels:
+    for level in LEVEL_NAMES:
         prefix = "✅ " if level in selected else ""
         keyboard.append([
             InlineKeyboardButton(
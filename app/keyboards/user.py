@@ -1,4 +1,5 @@
-from aiogram.types import ReplyKeyboardMarkup, KeyboardButton
+from aiogram.filters.callback_data import CallbackData
+from aiogram.types import ReplyKeyboardMarkup, KeyboardButton, InlineKeyboardMarkup, InlineKeyboardButton
 
 def user_main_menu():
     return ReplyKeyboardMarkup(
@@ -7,4 +8,38 @@ def user_main_menu():
             [KeyboardButton(text="📊 Statistik"), KeyboardButton(text="⚙️ Einstellungen")]
         ],
         resize_keyboard=True
-    )
\ No newline at end of file
+    )
+
+
+class TrainLevelCallback(CallbackData, prefix="tl"):
+    level_id: int
+
+
+class TrainCountCallback(CallbackData, prefix="tc"):
+    count: int
+
+
+class TrainTimeCallback(CallbackData, prefix="tt"):
+    minute: int | None  # minute of the day, None turns the reminder off
+
+
+class AnswerCountCallback(CallbackData, prefix="ac"):
+    value: int
+
+
+class AnswerCallback(CallbackData, prefix="ta"):
+    """
+    Answer button of a training question, e.g. "ta:Xk3f9A:4:1" — a dozen bytes whatever the answer text.
+    """
+    nonce: str      # identifies the training round
+    question: int   # index of the question in the round
+    option: int     # index of the option on the keyboard
+
+
+def answer_keyboard(options: list[str], nonce: str, question: int) -> InlineKeyboardMarkup:
+    return InlineKeyboardMarkup(inline_keyboard=[
+        [InlineKeyboardButton(
+            text=text, callback_data=AnswerCallback(nonce=nonce, question=question, option=index).pack()
+        )]
+        for index, text in enumerate(options)
+    ])
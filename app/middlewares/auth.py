@@ -0,0 +1,46 @@
+from typing import Any, Awaitable, Callable
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+
+from app.services.role_cache import RoleCache, role_cache
+from app.services.user_registry import UserRegistry, user_registry
+
+
+class RegisterUserMiddleware(BaseMiddleware):
+    """
+    Ensures a User row exists for the sender of any update.
+    """
+
+    def __init__(self, registry: UserRegistry = user_registry):
+        self._registry = registry
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        user = data.get("event_from_user")
+        if user and not user.is_bot:
+            await self._registry.ensure(user.id, user.username or user.full_name)
+        return await handler(event, data)
+
+
+class RoleMiddleware(BaseMiddleware):
+    """
+    Injects the sender's role (or None for unknown users) into handler data as `role`.
+    """
+
+    def __init__(self, cache: RoleCache = role_cache):
+        self._cache = cache
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        user = data.get("event_from_user")
+        data["role"] = await self._cache.get_role(user.id) if user else None
+        return await handler(event, data)
@@ -0,0 +1,41 @@
+from typing import Any, Awaitable, Callable
+
+from aiogram import BaseMiddleware
+from aiogram.fsm.context import FSMContext
+from aiogram.types import TelegramObject
+
+from app.fsm.buffered import BufferedFSMContext, FSMMetrics, fsm_metrics
+
+
+class BufferedStateMiddleware(BaseMiddleware):
+    """
+    Replaces the `state` handler argument with a BufferedFSMContext and commits it
+    once the update is handled, so a handler's FSM changes cost a single write.
+
+    Must run inside aiogram's FSM middleware, i.e. be registered as an outer
+    update middleware after the Dispatcher is created.
+    """
+
+    def __init__(self, metrics: FSMMetrics = fsm_metrics):
+        self._metrics = metrics
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        context = data.get("state")
+        if not isinstance(context, FSMContext) or isinstance(context, BufferedFSMContext):
+            return await handler(event, data)
+
+        # The FSM middleware has already read the raw state, so reuse it instead of asking again
+        buffered = BufferedFSMContext(context.storage, context.key, data.get("raw_state"))
+        data["state"] = buffered
+        try:
+            return await handler(event, data)
+        finally:
+            # Handlers may fail after changing state; keep the same semantics as direct writes
+            await buffered.commit()
+            # +1 for the raw state read done by the FSM middleware
+            self._metrics.record(buffered.storage_calls + 1)
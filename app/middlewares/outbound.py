@@ -0,0 +1,153 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import Response, TelegramMethod
+from aiogram.methods.base import TelegramType
+
+from app.config import SEND_CHAT_BURST, SEND_CHAT_RATE, SEND_GLOBAL_RATE, SEND_MAX_RETRIES
+
+logger = logging.getLogger(__name__)
+
+# === Send priorities: lower is served first ===
+INTERACTIVE = 0
+BROADCAST = 1
+
+_priority: ContextVar[int] = ContextVar("send_priority", default=INTERACTIVE)
+
+# Telegram's message limits count new messages only; edits, deletes, chat actions and
+# callback answers are not paced, so an answer click does not wait behind its own edits
+_MESSAGE_PREFIXES = ("send", "copy", "forward")
+_UNPACED_METHODS = {"sendChatAction"}
+
+
+def _is_paced(method: TelegramMethod) -> bool:
+    name = method.__api_method__
+    return name.startswith(_MESSAGE_PREFIXES) and name not in _UNPACED_METHODS
+
+
+@contextmanager
+def send_priority(priority: int):
+    """
+    Sends made inside the block (and tasks started from it) queue with this priority.
+    """
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class OutboundRateLimiter(BaseRequestMiddleware):
+    """
+    Paces the Bot API calls that post new messages (send*, copy*, forward*) to stay within
+    Telegram's limits; other calls only wait out flood-control pauses.
+
+    Each chat has a GCRA bucket (`chat_rate` per second, bursts of `chat_burst`), which
+    reserves send slots in call order, so messages to one chat keep their order.
+    All chats then share a global token bucket whose waiters are served by priority,
+    so answers to users overtake broadcasts. A 429 pauses the chat (or everything, for
+    calls without a chat) for `retry_after` seconds and the call is retried.
+    """
+
+    def __init__(self, global_rate: float = SEND_GLOBAL_RATE, chat_rate: float = SEND_CHAT_RATE,
+                 chat_burst: int = SEND_CHAT_BURST, max_retries: int = SEND_MAX_RETRIES,
+                 max_chats: int = 100000):
+        self._global_rate = global_rate
+        self._chat_interval = 1 / chat_rate
+        self._chat_burst = chat_burst
+        self._max_retries = max_retries
+        self._max_chats = max_chats
+        # chat_id -> theoretical arrival time of the chat's next message
+        self._chat_tat: dict[int | str, float] = {}
+        self._tokens = float(max(1, round(global_rate)))
+        self._capacity = self._tokens
+        self._refilled_at = time.monotonic()
+        self._paused_until = 0.0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._granter: asyncio.Task | None = None
+        self.retries = 0
+
+    async def __call__(self, make_request: NextRequestMiddlewareType[TelegramType], bot: Bot,
+                       method: TelegramMethod[TelegramType]) -> Response[TelegramType]:
+        chat_id = getattr(method, "chat_id", None)
+        paced = chat_id is not None and _is_paced(method)
+        attempt = 0
+        while True:
+            if paced:
+                await self._acquire(chat_id)
+            elif self._paused_until > time.monotonic():
+                await asyncio.sleep(self._paused_until - time.monotonic())
+            try:
+                return await make_request(bot, method)
+            except TelegramRetryAfter as error:
+                attempt += 1
+                if attempt > self._max_retries:
+                    raise
+                self.retries += 1
+                logger.warning("Flood control on %s, retrying in %s s", type(method).__name__, error.retry_after)
+                self._pause(chat_id, error.retry_after)
+                if chat_id is not None and not paced:
+                    # The chat's pause only delays its paced calls
+                    await asyncio.sleep(error.retry_after)
+
+    def _pause(self, chat_id, seconds: float):
+        resume_at = time.monotonic() + seconds
+        if chat_id is None:
+            self._paused_until = max(self._paused_until, resume_at)
+        else:
+            # The retried call gets the first slot after the pause
+            self._chat_tat[chat_id] = max(self._chat_tat.get(chat_id, 0.0),
+                                          resume_at + (self._chat_burst - 1) * self._chat_interval)
+
+    async def _acquire(self, chat_id):
+        delay = self._reserve_chat_slot(chat_id, time.monotonic())
+        if delay > 0:
+            await asyncio.sleep(delay)
+        await self._acquire_global(_priority.get())
+
+    def _reserve_chat_slot(self, chat_id, now: float) -> float:
+        if len(self._chat_tat) > self._max_chats:
+            self._chat_tat = {chat: tat for chat, tat in self._chat_tat.items() if tat > now}
+        tat = max(self._chat_tat.get(chat_id, now), now)
+        allowed_at = tat - (self._chat_burst - 1) * self._chat_interval
+        self._chat_tat[chat_id] = tat + self._chat_interval
+        return max(0.0, allowed_at - now)
+
+    def _refill(self, now: float):
+        self._tokens = min(self._capacity, self._tokens + (now - self._refilled_at) * self._global_rate)
+        self._refilled_at = now
+
+    async def _acquire_global(self, priority: int):
+        now = time.monotonic()
+        self._refill(now)
+        if not self._waiters and self._tokens >= 1 and now >= self._paused_until:
+            self._tokens -= 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        if self._granter is None or self._granter.done():
+            self._granter = asyncio.create_task(self._grant())
+        await future
+
+    async def _grant(self):
+        while self._waiters:
+            now = time.monotonic()
+            self._refill(now)
+            wait = max(self._paused_until - now, (1 - self._tokens) / self._global_rate)
+            if wait > 0:
+                await asyncio.sleep(wait)
+                continue
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                continue
+            self._tokens -= 1
+            future.set_result(None)
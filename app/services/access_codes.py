@@ -0,0 +1,114 @@
+import re
+import secrets
+
+from datetime import datetime
+
+from sqlalchemy import false, update
+from sqlalchemy.orm import Session
+
+from app.config import IMPORT_BATCH_SIZE
+from app.db.enums import UserRole
+from app.db.models import AccessCode, User
+from app.db.session import dialect_insert, insert_many
+
+# 32 symbols without the look-alikes 0/O and 1/I; 256 is a multiple of 32,
+# so mapping random bytes onto it keeps every symbol equally likely
+CODE_ALPHABET = "ABCDEFGHJKLMNPQRSTUVWXYZ23456789"
+# 12 symbols of 5 bits each: 60 bits per code
+CODE_LENGTH = 12
+
+_CODE_SEPARATORS = re.compile(r"[\s,;]+")
+_BYTE_TO_SYMBOL = bytes((CODE_ALPHABET * (256 // len(CODE_ALPHABET))).encode())
+
+
+def parse_codes(text: str) -> list[str]:
+    """
+    Splits pasted or uploaded text into codes; commas, semicolons and whitespace all separate.
+    """
+    return [code for code in _CODE_SEPARATORS.split(text) if code]
+
+
+def generate_codes(count: int, length: int = CODE_LENGTH) -> list[str]:
+    """
+    Returns `count` random codes from one call to the OS random source.
+    """
+    symbols = secrets.token_bytes(count * length).translate(_BYTE_TO_SYMBOL).decode()
+    return [symbols[i:i + length] for i in range(0, count * length, length)]
+
+
+def _insert_codes(session: Session, codes: list[str], chunk_size: int) -> list[str]:
+    """
+    Inserts distinct codes with one INSERT ... ON CONFLICT DO NOTHING per chunk against
+    the unique code column; RETURNING yields exactly the codes that were new, also
+    when another import runs at the same time. The caller commits.
+    """
+    table = AccessCode.__table__
+    stmt = (
+        dialect_insert(session, table)
+        .on_conflict_do_nothing(index_elements=[table.c.code])
+        .returning(table.c.code)
+    )
+    return insert_many(session, stmt, [{"code": code, "is_used": False} for code in codes], chunk_size)
+
+
+def add_access_codes(session: Session, codes: list[str], chunk_size: int = IMPORT_BATCH_SIZE) -> tuple[int, int]:
+    """
+    Inserts the codes that do not exist yet and returns (added, duplicates), where
+    duplicates counts both repeats within `codes` and codes already in the database.
+    """
+    try:
+        added = len(_insert_codes(session, list(dict.fromkeys(codes)), chunk_size))
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    return added, len(codes) - added
+
+
+def create_access_codes(session: Session, count: int, chunk_size: int = IMPORT_BATCH_SIZE) -> list[str]:
+    """
+    Generates and stores `count` new codes; returns them.
+    """
+    created = []
+    try:
+        while len(created) < count:
+            # A collision with an existing code is just skipped and replaced in the next round
+            codes = list(dict.fromkeys(generate_codes(count - len(created))))
+            created.extend(_insert_codes(session, codes, chunk_size))
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    return created
+
+
+def redeem_access_code(session: Session, code: str, user_id: int, username: str | None = None) -> bool:
+    """
+    Claims an unused code for the user and makes a plain user an editor; False if
+    the code does not exist or is already used.
+
+    The claim is a single conditional UPDATE (no read-then-write), so when several
+    users send the same code at once the database lets exactly one of them win.
+    """
+    try:
+        # The user row comes first: used_by references it. Only plain users are
+        # promoted; an admin who redeems a code keeps the admin role
+        stmt = dialect_insert(session, User)
+        session.execute(stmt.on_conflict_do_update(
+            index_elements=[User.id], set_={"role": stmt.excluded.role}, where=User.role == UserRole.USER.value,
+        ).values(id=user_id, username=username, role=UserRole.EDITOR.value, created_at=datetime.utcnow()))
+
+        claimed = session.execute(
+            update(AccessCode)
+            .where(AccessCode.code == code, AccessCode.is_used == false())
+            .values(is_used=True, used_by=user_id)
+        ).rowcount
+        if claimed != 1:
+            # Also undoes the role change
+            session.rollback()
+            return False
+        session.commit()
+        return True
+    except Exception:
+        session.rollback()
+        raise
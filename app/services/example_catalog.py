@@ -0,0 +1,91 @@
+import time
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session
+
+from app.db.models import Example, example_levels
+
+
+class ExampleCatalog:
+    """
+    Editor view of the examples, ordered by (sentence, id).
+
+    Pages are fetched with keyset (seek) pagination: a page starts right after or
+    right before an anchor example, found through the (sentence, id) index, so
+    page 500 costs the same as page 1. Totals per filter are cached and bumped
+    on insert instead of being counted on every page flip.
+    """
+
+    def __init__(self, ttl: float = 60):
+        self._ttl = ttl
+        # (category_id, level_id) -> (total, counted at)
+        self._counts: dict[tuple[int | None, int | None], tuple[int, float]] = {}
+
+    @staticmethod
+    def _filtered(session: Session, category_id: int | None, level_id: int | None):
+        query = session.query(Example.id, Example.sentence)
+        if level_id is not None:
+            query = query.join(example_levels, example_levels.c.example_id == Example.id).filter(
+                example_levels.c.level_id == level_id
+            )
+        if category_id is not None:
+            query = query.filter(Example.category_id == category_id)
+        return query
+
+    def page(self, session: Session, limit: int, category_id: int | None = None, level_id: int | None = None,
+             after: int | None = None, before: int | None = None):
+        """
+        Returns (rows, has_previous, has_next); rows have `id` and `sentence`.
+        """
+        anchor_id = after if after is not None else before
+        anchor = None
+        if anchor_id is not None:
+            sentence = session.query(Example.sentence).filter(Example.id == anchor_id).scalar()
+            if sentence is not None:
+                anchor = tuple_(sentence, anchor_id)
+
+        query = self._filtered(session, category_id, level_id)
+        key = tuple_(Example.sentence, Example.id)
+        if anchor is not None and before is not None:
+            rows = (
+                query.filter(key < anchor)
+                .order_by(Example.sentence.desc(), Example.id.desc())
+                .limit(limit + 1)
+                .all()
+            )
+            has_previous = len(rows) > limit
+            return list(reversed(rows[:limit])), has_previous, True
+
+        if anchor is not None:
+            query = query.filter(key > anchor)
+        rows = query.order_by(Example.sentence, Example.id).limit(limit + 1).all()
+        return rows[:limit], anchor is not None, len(rows) > limit
+
+    def count(self, session: Session, category_id: int | None = None, level_id: int | None = None) -> int:
+        key = (category_id, level_id)
+        cached = self._counts.get(key)
+        if cached is not None and time.monotonic() - cached[1] < self._ttl:
+            return cached[0]
+        total = self._filtered(session, category_id, level_id).order_by(None).count()
+        self._counts[key] = (total, time.monotonic())
+        return total
+
+    def on_insert(self, category_id: int | None, level_ids: list[int]):
+        """
+        Counts a newly saved example in every cached total whose filter it matches.
+        """
+        for (cached_category, cached_level), (total, counted_at) in list(self._counts.items()):
+            if cached_category is not None and cached_category != category_id:
+                continue
+            if cached_level is not None and cached_level not in level_ids:
+                continue
+            self._counts[(cached_category, cached_level)] = (total + 1, counted_at)
+
+    def invalidate(self):
+        """
+        Forgets every cached total, e.g. after a bulk import.
+        """
+        self._counts.clear()
+
+
+example_catalog = ExampleCatalog()
@@ -0,0 +1,44 @@
+from typing import Callable
+
+from app.services.example_catalog import ExampleCatalog, example_catalog
+from app.services.example_index import ExampleIndex, example_index
+
+# (example_id, category_id, level_ids) of a newly stored example
+NewExample = tuple[int, int | None, list[int]]
+
+
+class ExampleEvents:
+    """
+    Keeps the in-process example caches (training index, list totals) in step with
+    the examples editors save or import.
+
+    The process that stored the examples applies them right away. With several
+    worker processes it also hands them to `broadcast`, which delivers them to every
+    other worker, where apply() adds them; no worker has to poll the database for them.
+    """
+
+    def __init__(self, index: ExampleIndex = example_index, catalog: ExampleCatalog = example_catalog):
+        self._index = index
+        self._catalog = catalog
+        self._broadcast: Callable[[list[NewExample]], None] | None = None
+
+    def broadcast_to(self, send: Callable[[list[NewExample]], None]):
+        self._broadcast = send
+
+    def added(self, examples: list[NewExample]):
+        """
+        Called after the examples were committed.
+        """
+        if not examples:
+            return
+        self.apply(examples)
+        if self._broadcast is not None:
+            self._broadcast(examples)
+
+    def apply(self, examples: list[NewExample]):
+        for example_id, category_id, level_ids in examples:
+            self._index.add(example_id, level_ids)
+            self._catalog.on_insert(category_id, level_ids)
+
+
+example_events = ExampleEvents()
@@ -0,0 +1,85 @@
+import random
+from array import array
+from bisect import bisect_left
+
+from sqlalchemy.orm import Session
+
+from app.db.models import Level, example_levels
+from app.db.session import SessionLocal
+
+
+class ExampleIndex:
+    """
+    Process-level index of example ids per language level.
+
+    Built once at startup and updated in place when an editor saves or imports
+    examples, so training menus and round sampling never have to query the
+    example_levels join. With several worker processes every process has its own
+    index; new examples reach the others through app.services.example_events.
+    """
+
+    def __init__(self):
+        self._by_level: dict[int, array] = {}
+        self._level_names: dict[int, str] = {}
+        # level_id -> length of the sorted prefix of its ids that came from load()
+        self._loaded: dict[int, int] = {}
+
+    def load(self, session: Session):
+        level_names = {level_id: name for level_id, name in session.query(Level.id, Level.name).all()}
+        by_level = {level_id: array("i") for level_id in level_names}
+        links = session.query(example_levels.c.level_id, example_levels.c.example_id).order_by(
+            example_levels.c.example_id
+        )
+        for level_id, example_id in links:
+            by_level.setdefault(level_id, array("i")).append(example_id)
+
+        # Swap in complete structures so readers never see a half-built index
+        self._loaded = {level_id: len(ids) for level_id, ids in by_level.items()}
+        self._level_names = level_names
+        self._by_level = by_level
+
+    def add(self, example_id: int, level_ids: list[int]):
+        """
+        Adds a new example. One that load() already read is skipped: a worker restarted
+        after an example was saved reads it from the database and then from its inbox.
+        """
+        for level_id in level_ids:
+            ids = self._by_level.setdefault(level_id, array("i"))
+            loaded = self._loaded.get(level_id, 0)
+            position = bisect_left(ids, example_id, 0, loaded)
+            if position < loaded and ids[position] == example_id:
+                continue
+            ids.append(example_id)
+
+    def count(self, level_id: int) -> int:
+        ids = self._by_level.get(level_id)
+        return len(ids) if ids is not None else 0
+
+    def ids(self, level_id: int) -> array:
+        return self._by_level.get(level_id, array("i"))
+
+    def level_name(self, level_id: int) -> str | None:
+        return self._level_names.get(level_id)
+
+    def levels_with_at_least(self, min_count: int) -> list[tuple[int, str]]:
+        return [
+            (level_id, name) for level_id, name in self._level_names.items()
+            if self.count(level_id) >= min_count
+        ]
+
+    def sample(self, level_id: int, count: int) -> list[int]:
+        """
+        Picks `count` distinct example ids of a level; random.sample only touches O(count) items.
+        """
+        return random.sample(self._by_level.get(level_id, array("i")), count)
+
+
+example_index = ExampleIndex()
+
+
+def build_example_index():
+    session = SessionLocal()
+    try:
+        example_index.load(session)
+    finally:
+        session.close()
@@ -0,0 +1,35 @@
+# Rules every example must satisfy, whether added step by step or imported from a file.
+# Each check returns the message to show the editor, or None when the value is fine.
+from app.db.enums import LEVEL_NAMES
+
+GAP_MARKER = "[x]"
+MIN_INCORRECT_ANSWERS = 2
+MAX_LEVELS = 2
+
+
+def sentence_error(sentence: str) -> str | None:
+    if GAP_MARKER not in sentence:
+        return "⚠️ Bitte markiere die Lücke mit [x]. Versuche es erneut."
+    return None
+
+
+def incorrect_answers_error(incorrect_answers: list[str]) -> str | None:
+    if len(incorrect_answers) < MIN_INCORRECT_ANSWERS:
+        return "Bitte gib mindestens zwei falsche Antworten ein."
+    return None
+
+
+def levels_error(level_names: list[str]) -> str | None:
+    """
+    One level, or two neighbouring ones in LEVEL_NAMES order (A2 < B1 < ...). Level ids
+    do not follow that order in databases that had levels before they were seeded.
+    """
+    if not level_names:
+        return "❗️Bitte wähle mindestens ein Sprachniveau aus."
+    if len(level_names) > MAX_LEVELS:
+        return "❗️Maximal zwei Niveaus erlaubt."
+    if len(level_names) == 2:
+        positions = [LEVEL_NAMES.index(name) for name in level_names if name in LEVEL_NAMES]
+        if len(positions) != 2 or abs(positions[0] - positions[1]) != 1:
+            return "❗️Die gewählten Niveaus müssen aufeinanderfolgend sein."
+    return None
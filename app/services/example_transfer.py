@@ -0,0 +1,266 @@
+import csv
+import json
+import time
+from dataclasses import dataclass, field
+from typing import IO, Iterator
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.config import IMPORT_BATCH_SIZE
+from app.db.models import Answer, Category, Example, Level, example_levels
+from app.db.session import insert_many
+from app.services.example_rules import incorrect_answers_error, levels_error, sentence_error
+
+# === File layout shared by import and export ===
+# CSV cells holding several values (incorrect answers, levels) separate them with "|";
+# JSONL lines may use lists instead
+FIELDS = ["sentence", "correct_answer", "incorrect_answers", "explanation", "category", "levels"]
+FORMATS = ("csv", "jsonl")
+LIST_SEPARATOR = "|"
+# Invalid rows listed back to the editor; the rest are only counted
+MAX_REPORTED_ERRORS = 20
+
+
+@dataclass(slots=True)
+class ImportReport:
+    imported: int = 0
+    rejected: int = 0
+    errors: list[tuple[int, str]] = field(default_factory=list)
+    seconds: float = 0.0
+    # (example_id, category_id, level_ids) of the imported examples, for the in-process caches
+    examples: list[tuple[int, int, list[int]]] = field(default_factory=list)
+
+    @property
+    def rows_per_second(self) -> float:
+        return (self.imported + self.rejected) / self.seconds if self.seconds else 0.0
+
+    def reject(self, line: int, message: str):
+        self.rejected += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, message))
+
+
+def _split(value) -> list[str]:
+    if value is None:
+        return []
+    if isinstance(value, list):
+        items = value
+    else:
+        items = str(value).split(LIST_SEPARATOR)
+    return [str(item).strip() for item in items if str(item).strip()]
+
+
+def read_rows(stream: IO[str], fmt: str) -> Iterator[tuple[int, dict | None]]:
+    """
+    Yields (line number, raw row) one at a time; the row is None when the line cannot be parsed.
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+    elif fmt == "jsonl":
+        for line_number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = None
+            yield line_number, row if isinstance(row, dict) else None
+    else:
+        raise ValueError(f"Unknown format: {fmt}")
+
+
+class ExampleImporter:
+    """
+    Streams example rows from a CSV/JSONL file into the database.
+
+    Rows are validated one by one with the same rules as the /add_example dialog;
+    invalid rows are skipped and reported by line number. Valid rows are inserted
+    `batch_size` at a time, one transaction per batch, as three executemany INSERTs
+    (examples, answers, example levels) instead of one ORM unit of work per example.
+    """
+
+    def __init__(self, session: Session, user_id: int | None = None, batch_size: int = IMPORT_BATCH_SIZE):
+        self._session = session
+        self._user_id = user_id
+        self._batch_size = batch_size
+        # Names are matched case-insensitively
+        self._categories = {name.lower(): category_id for category_id, name in session.query(Category.id, Category.name)}
+        self._levels = {name.lower(): (level_id, name) for level_id, name in session.query(Level.id, Level.name)}
+
+    def validate(self, row: dict) -> tuple[dict | None, str | None]:
+        """
+        Returns the normalized row, or the reason it is rejected.
+        """
+        sentence = str(row.get("sentence") or "").strip()
+        error = sentence_error(sentence)
+        if error:
+            return None, error
+
+        correct_answer = str(row.get("correct_answer") or "").strip()
+        if not correct_answer:
+            return None, "Die richtige Antwort fehlt."
+
+        incorrect_answers = _split(row.get("incorrect_answers"))
+        error = incorrect_answers_error(incorrect_answers)
+        if error:
+            return None, error
+
+        # Required, as in the dialog: training statistics are kept per category
+        category_name = str(row.get("category") or "").strip()
+        if not category_name:
+            return None, "Die Kategorie fehlt."
+        category_id = self._categories.get(category_name.lower())
+        if category_id is None:
+            return None, f"Unbekannte Kategorie: {category_name}"
+
+        level_ids, level_names = [], []
+        for name in _split(row.get("levels")):
+            level = self._levels.get(name.lower())
+            if level is None:
+                return None, f"Unbekanntes Niveau: {name}"
+            level_ids.append(level[0])
+            level_names.append(level[1])
+        error = levels_error(level_names)
+        if error:
+            return None, error
+
+        return {
+            "sentence": sentence,
+            "correct_answer": correct_answer,
+            "incorrect_answers": incorrect_answers,
+            "explanation": str(row.get("explanation") or "").strip() or None,
+            "category_id": category_id,
+            "level_ids": level_ids,
+        }, None
+
+    def run(self, stream: IO[str], fmt: str) -> ImportReport:
+        report = ImportReport()
+        started = time.perf_counter()
+        batch = []
+        for line, row in read_rows(stream, fmt):
+            if row is None:
+                report.reject(line, "Zeile kann nicht gelesen werden.")
+                continue
+            example, error = self.validate(row)
+            if error:
+                report.reject(line, error)
+                continue
+            batch.append(example)
+            if len(batch) >= self._batch_size:
+                report.imported += self._insert(batch, report)
+                batch = []
+        if batch:
+            report.imported += self._insert(batch, report)
+        report.seconds = time.perf_counter() - started
+        return report
+
+    def _insert(self, batch: list[dict], report: ImportReport) -> int:
+        session = self._session
+        examples, answers_table = Example.__table__, Answer.__table__
+        try:
+            sqlite = session.get_bind().dialect.name == "sqlite"
+            # SQLite has no insert sentinel, so ordered RETURNING would insert row by row.
+            # Its rowids are handed out in VALUES order, so sorting the ids restores the mapping
+            example_ids = insert_many(
+                session,
+                insert(examples).returning(examples.c.id, sort_by_parameter_order=not sqlite),
+                [
+                    {
+                        "sentence": row["sentence"],
+                        "explanation": row["explanation"],
+                        "category_id": row["category_id"],
+                        "created_by": self._user_id,
+                    }
+                    for row in batch
+                ],
+            )
+            if sqlite:
+                example_ids.sort()
+
+            answers, links = [], []
+            for example_id, row in zip(example_ids, batch):
+                answers.append({"example_id": example_id, "text": row["correct_answer"], "is_correct": True})
+                answers.extend(
+                    {"example_id": example_id, "text": text, "is_correct": False}
+                    for text in row["incorrect_answers"]
+                )
+                links.extend({"example_id": example_id, "level_id": level_id} for level_id in row["level_ids"])
+            insert_many(session, insert(answers_table), answers)
+            insert_many(session, insert(example_levels), links)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        report.examples.extend(
+            (example_id, row["category_id"], row["level_ids"]) for example_id, row in zip(example_ids, batch)
+        )
+        return len(batch)
+
+
+def export_examples(session: Session, stream: IO[str], fmt: str, batch_size: int = IMPORT_BATCH_SIZE) -> int:
+    """
+    Writes every example to the stream in the import format and returns the number written.
+
+    Examples are read `batch_size` at a time by id (keyset), with the answers and
+    levels of each batch fetched in one IN query each, so memory stays flat and
+    no ORM objects are built.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format: {fmt}")
+    categories = dict(session.query(Category.id, Category.name).all())
+    level_names = dict(session.query(Level.id, Level.name).all())
+    writer = None
+    if fmt == "csv":
+        writer = csv.DictWriter(stream, fieldnames=FIELDS)
+        writer.writeheader()
+
+    written, last_id = 0, 0
+    while True:
+        examples = (
+            session.query(Example.id, Example.sentence, Example.explanation, Example.category_id)
+            .filter(Example.id > last_id)
+            .order_by(Example.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not examples:
+            return written
+        example_ids = [example.id for example in examples]
+        last_id = example_ids[-1]
+
+        correct, incorrect = {}, {}
+        for example_id, text, is_correct in (
+            session.query(Answer.example_id, Answer.text, Answer.is_correct)
+            .filter(Answer.example_id.in_(example_ids))
+            .order_by(Answer.id)
+        ):
+            if is_correct:
+                correct.setdefault(example_id, text)
+            else:
+                incorrect.setdefault(example_id, []).append(text)
+        levels = {}
+        for example_id, level_id in (
+            session.query(example_levels.c.example_id, example_levels.c.level_id)
+            .filter(example_levels.c.example_id.in_(example_ids))
+            .order_by(example_levels.c.level_id)
+        ):
+            levels.setdefault(example_id, []).append(level_names[level_id])
+
+        for example in examples:
+            row = {
+                "sentence": example.sentence,
+                "correct_answer": correct.get(example.id, ""),
+                "incorrect_answers": incorrect.get(example.id, []),
+                "explanation": example.explanation or "",
+                "category": categories.get(example.category_id, ""),
+                "levels": levels.get(example.id, []),
+            }
+            if writer is not None:
+                writer.writerow({**row, "incorrect_answers": LIST_SEPARATOR.join(row["incorrect_answers"]),
+                                 "levels": LIST_SEPARATOR.join(row["levels"])})
+            else:
+                stream.write(json.dumps(row, ensure_ascii=False) + "\n")
+        written += len(examples)
@@ -0,0 +1,178 @@
+import asyncio
+import heapq
+import logging
+import time
+from typing import Callable
+from datetime import datetime, timedelta, time as dt_time
+from zoneinfo import ZoneInfo
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramAPIError, TelegramForbiddenError
+
+from app.config import REMINDER_BATCH_SIZE, REMINDER_REFRESH_INTERVAL, REMINDER_TIMEZONE
+from app.db.models import UserSettings
+from app.db.session import SessionLocal, run_db
+from app.middlewares.outbound import BROADCAST, send_priority
+
+logger = logging.getLogger(__name__)
+
+REMINDER_TEXT = "⏰ Zeit für dein tägliches Training!\n\n🔁 Starte dein Training mit /start_training"
+
+
+def _minute_of_day(value: dt_time) -> int:
+    return value.hour * 60 + value.minute
+
+
+class ReminderScheduler:
+    """
+    Sends the daily training reminder at every user's UserSettings.training_time.
+
+    Only the distinct reminder minutes (at most 1440) are kept in memory, in a heap
+    ordered by their next firing time. When a minute fires, its users are read with
+    an equality lookup on the training_time index and messaged in batches through
+    the rate-limited bot session with broadcast priority, so nothing ever scans
+    user_settings and interactive answers stay fast during a reminder burst.
+    """
+
+    def __init__(self, session_factory=SessionLocal, timezone: str = REMINDER_TIMEZONE,
+                 refresh_interval: float = REMINDER_REFRESH_INTERVAL, batch_size: int = REMINDER_BATCH_SIZE):
+        self._session_factory = session_factory
+        self._tz = ZoneInfo(timezone)
+        self._refresh_interval = refresh_interval
+        self._batch_size = batch_size
+        self._heap: list[tuple[float, int]] = []
+        self._scheduled: set[int] = set()
+        self._changed = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._bot: Bot | None = None
+        self._forward: Callable[[dt_time], None] | None = None
+        self.sent = 0
+
+    def _load_minutes(self) -> set[int]:
+        session = self._session_factory()
+        try:
+            rows = (
+                session.query(UserSettings.training_time)
+                .filter(UserSettings.training_time.isnot(None))
+                .distinct()
+                .all()
+            )
+            return {_minute_of_day(training_time) for training_time, in rows}
+        finally:
+            session.close()
+
+    def _load_users(self, minute: int) -> list[int]:
+        session = self._session_factory()
+        try:
+            training_time = dt_time(minute // 60, minute % 60)
+            rows = session.query(UserSettings.user_id).filter(UserSettings.training_time == training_time).all()
+            return [user_id for user_id, in rows]
+        finally:
+            session.close()
+
+    def next_fire(self, minute: int, now: float) -> float:
+        """
+        Unix time of the next occurrence of the minute of day in the reminder timezone.
+        """
+        today = datetime.fromtimestamp(now, self._tz).date()
+        for day in (today, today + timedelta(days=1)):
+            local = datetime.combine(day, dt_time(minute // 60, minute % 60), tzinfo=self._tz)
+            if local.timestamp() > now:
+                return local.timestamp()
+        return now + 24 * 3600
+
+    def _schedule(self, minute: int, now: float):
+        if minute not in self._scheduled:
+            self._scheduled.add(minute)
+            heapq.heappush(self._heap, (self.next_fire(minute, now), minute))
+
+    async def refresh(self):
+        minutes = await run_db(self._load_minutes)
+        now = time.time()
+        self._heap = []
+        self._scheduled = set()
+        for minute in minutes:
+            self._schedule(minute, now)
+        self._changed.set()
+
+    def forward_to(self, send: Callable[[dt_time], None]):
+        """
+        For processes that do not run the scheduler: notify() hands new times to `send`,
+        which passes them on to the process that does.
+        """
+        self._forward = send
+
+    def notify(self, training_time: dt_time | None):
+        """
+        Called after a user changed the reminder time; removed times drop out when they fire empty.
+        """
+        if training_time is None:
+            return
+        if self._forward is not None:
+            self._forward(training_time)
+            return
+        self._schedule(_minute_of_day(training_time), time.time())
+        self._changed.set()
+
+    async def start(self, bot: Bot):
+        if self._task is None:
+            self._bot = bot
+            await self.refresh()
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        refreshed_at = time.time()
+        while True:
+            now = time.time()
+            if now - refreshed_at >= self._refresh_interval:
+                # Picks up times changed by other processes
+                await self.refresh()
+                refreshed_at = now
+            timeout = self._refresh_interval - (now - refreshed_at)
+            if self._heap:
+                timeout = min(timeout, self._heap[0][0] - now)
+            if timeout > 0:
+                self._changed.clear()
+                try:
+                    await asyncio.wait_for(self._changed.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            _, minute = heapq.heappop(self._heap)
+            self._scheduled.discard(minute)
+            try:
+                if await self.fire(minute):
+                    self._schedule(minute, time.time())
+            except Exception:
+                logger.exception("Failed to send reminders for minute %s", minute)
+                self._schedule(minute, time.time())
+
+    async def fire(self, minute: int) -> int:
+        """
+        Sends the reminder to every user of the minute; returns how many users it has.
+        """
+        user_ids = await run_db(self._load_users, minute)
+        with send_priority(BROADCAST):
+            for start in range(0, len(user_ids), self._batch_size):
+                batch = user_ids[start:start + self._batch_size]
+                await asyncio.gather(*(self._send(user_id) for user_id in batch))
+        return len(user_ids)
+
+    async def _send(self, user_id: int):
+        try:
+            await self._bot.send_message(user_id, REMINDER_TEXT)
+            self.sent += 1
+        except TelegramForbiddenError:
+            # The user blocked the bot
+            pass
+        except TelegramAPIError:
+            logger.warning("Failed to send a reminder to %s", user_id, exc_info=True)
+
+
+reminder_scheduler = ReminderScheduler()
@@ -0,0 +1,47 @@
+import time
+
+from app.config import ROLE_CACHE_TTL
+from app.db.models import User
+from app.db.session import SessionLocal, run_db
+
+
+class RoleCache:
+    """
+    TTL cache of user roles. Code that changes a role calls set_role/invalidate,
+    the TTL only covers edits made directly in the database.
+    """
+
+    def __init__(self, session_factory=SessionLocal, ttl: float = ROLE_CACHE_TTL):
+        self._session_factory = session_factory
+        self._ttl = ttl
+        # user_id -> (role or None for unknown users, expiry on the monotonic clock)
+        self._entries: dict[int, tuple[str | None, float]] = {}
+
+    def _load_role(self, user_id: int) -> str | None:
+        session = self._session_factory()
+        try:
+            row = session.query(User.role).filter(User.id == user_id).first()
+            return row.role if row else None
+        finally:
+            session.close()
+
+    async def get_role(self, user_id: int) -> str | None:
+        entry = self._entries.get(user_id)
+        if entry is not None and entry[1] > time.monotonic():
+            return entry[0]
+
+        role = await run_db(self._load_role, user_id)
+        self._entries[user_id] = (role, time.monotonic() + self._ttl)
+        return role
+
+    def set_role(self, user_id: int, role: str | None):
+        self._entries[user_id] = (role, time.monotonic() + self._ttl)
+
+    def invalidate(self, user_id: int = None):
+        if user_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(user_id, None)
+
+
+role_cache = RoleCache()
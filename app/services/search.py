@@ -0,0 +1,133 @@
+import re
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from app.db.models import Answer, Example
+
+# === SQLite full-text index: one row per example, rowid = examples.id ===
+# remove_diacritics lets "uber" find "über"; answers holds all answer texts of the example
+_FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE examples_fts USING fts5(
+        sentence, explanation, answers, tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER examples_fts_insert AFTER INSERT ON examples BEGIN
+        INSERT INTO examples_fts(rowid, sentence, explanation, answers)
+        VALUES (NEW.id, NEW.sentence, NEW.explanation,
+                (SELECT group_concat(text, ' ') FROM answers WHERE example_id = NEW.id));
+    END
+    """,
+    """
+    CREATE TRIGGER examples_fts_update AFTER UPDATE OF sentence, explanation ON examples BEGIN
+        UPDATE examples_fts SET sentence = NEW.sentence, explanation = NEW.explanation WHERE rowid = NEW.id;
+    END
+    """,
+    """
+    CREATE TRIGGER examples_fts_delete AFTER DELETE ON examples BEGIN
+        DELETE FROM examples_fts WHERE rowid = OLD.id;
+    END
+    """,
+    """
+    CREATE TRIGGER answers_fts_insert AFTER INSERT ON answers BEGIN
+        UPDATE examples_fts
+        SET answers = (SELECT group_concat(text, ' ') FROM answers WHERE example_id = NEW.example_id)
+        WHERE rowid = NEW.example_id;
+    END
+    """,
+    """
+    CREATE TRIGGER answers_fts_update AFTER UPDATE OF text, example_id ON answers BEGIN
+        UPDATE examples_fts
+        SET answers = (SELECT group_concat(text, ' ') FROM answers WHERE example_id = OLD.example_id)
+        WHERE rowid = OLD.example_id;
+        UPDATE examples_fts
+        SET answers = (SELECT group_concat(text, ' ') FROM answers WHERE example_id = NEW.example_id)
+        WHERE rowid = NEW.example_id;
+    END
+    """,
+    """
+    CREATE TRIGGER answers_fts_delete AFTER DELETE ON answers BEGIN
+        UPDATE examples_fts
+        SET answers = (SELECT group_concat(text, ' ') FROM answers WHERE example_id = OLD.example_id)
+        WHERE rowid = OLD.example_id;
+    END
+    """,
+]
+
+_FTS_BACKFILL = """
+    INSERT INTO examples_fts(rowid, sentence, explanation, answers)
+    SELECT e.id, e.sentence, e.explanation,
+           (SELECT group_concat(a.text, ' ') FROM answers a WHERE a.example_id = e.id)
+    FROM examples e
+"""
+
+_WORD = re.compile(r"\w+")
+
+
+def create_search_index(connection: Connection):
+    """
+    Creates the FTS5 table and its triggers and indexes the existing examples.
+    SQLite only; does nothing if the table already exists or on other databases.
+    """
+    if connection.dialect.name != "sqlite":
+        return
+    exists = connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'examples_fts'")
+    ).first()
+    if exists:
+        return
+    for statement in _FTS_DDL:
+        connection.execute(text(statement))
+    connection.execute(text(_FTS_BACKFILL))
+
+
+def ensure_search_index(engine: Engine):
+    with engine.begin() as connection:
+        create_search_index(connection)
+
+
+def fts_query(query: str) -> str | None:
+    """
+    Turns free user input into an FTS5 query: every word must match, the last one as a prefix.
+    """
+    words = _WORD.findall(query)
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+def search_examples(session: Session, query: str, limit: int = 10) -> list[tuple[int, str]]:
+    """
+    Best matches first, as (example id, sentence).
+    """
+    if session.get_bind().dialect.name != "sqlite":
+        # Without FTS5: substring match on sentences and answers
+        pattern = f"%{query.strip()}%"
+        return (
+            session.query(Example.id, Example.sentence)
+            .outerjoin(Answer, Answer.example_id == Example.id)
+            .filter(Example.sentence.ilike(pattern) | Answer.text.ilike(pattern))
+            .distinct()
+            .order_by(Example.sentence, Example.id)
+            .limit(limit)
+            .all()
+        )
+
+    match = fts_query(query)
+    if match is None:
+        return []
+    rows = session.execute(
+        text(
+            "SELECT e.id, e.sentence FROM examples_fts "
+            "JOIN examples e ON e.id = examples_fts.rowid "
+            # The sentence counts more than the explanation and the answers
+            "WHERE examples_fts MATCH :match ORDER BY bm25(examples_fts, 10.0, 2.0, 5.0) LIMIT :limit"
+        ),
+        {"match": match, "limit": limit},
+    ).all()
+    return [(example_id, sentence) for example_id, sentence in rows]
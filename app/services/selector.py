@@ -0,0 +1,267 @@
+import heapq
+import random
+import time
+from array import array
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from app.config import EXAMPLE_SELECTOR
+from app.db.models import UserExampleStat, example_levels
+from app.db.session import SessionLocal, run_db
+from app.services.example_index import ExampleIndex, example_index
+from app.services.stats_recorder import stats_recorder
+
+# === Leitner boxes: a wrong answer sends an example back to box 1 ===
+MAX_BOX = 5
+# Seconds until an example in the given box is due again
+BOX_INTERVALS = {
+    1: 0,
+    2: 24 * 3600,
+    3: 3 * 24 * 3600,
+    4: 7 * 24 * 3600,
+    5: 21 * 24 * 3600,
+}
+
+
+def _to_timestamp(value: datetime | None) -> float:
+    return value.replace(tzinfo=timezone.utc).timestamp() if value else 0.0
+
+
+def _to_datetime(timestamp: float) -> datetime:
+    return datetime.fromtimestamp(timestamp, timezone.utc).replace(tzinfo=None)
+
+
+class ExampleSelector:
+    """
+    Chooses the examples of a training round and learns from the answers.
+    """
+
+    async def select(self, user_id: int, level_id: int, count: int) -> list[int]:
+        raise NotImplementedError
+
+    def record_answer(self, user_id: int, example_id: int, level_id: int | None, is_correct: bool):
+        """
+        Returns the (box, due_at) schedule to persist for the example, or (None, None).
+        """
+        return None, None
+
+
+class RandomSelector(ExampleSelector):
+    def __init__(self, index: ExampleIndex = example_index):
+        self._index = index
+
+    async def select(self, user_id: int, level_id: int, count: int) -> list[int]:
+        return self._index.sample(level_id, min(count, self._index.count(level_id)))
+
+
+class _UserQueue:
+    """
+    Repetition state of one user: Leitner box and due time per seen example,
+    plus a due-time heap per level. Heap entries carry a version and are
+    skipped once a newer answer has rescheduled the example.
+    """
+
+    def __init__(self):
+        self.box: dict[int, int] = {}
+        self.due: dict[int, float] = {}
+        self.version: dict[int, int] = {}
+        self.levels: dict[int, set[int]] = {}
+        # Number of seen examples per level
+        self.seen_per_level: dict[int, int] = {}
+        self.heaps: dict[int, list[tuple[float, int, int]]] = {}
+        # level_id -> (unseen ids, position of each id, level size it was built for);
+        # only built once a level is mostly seen and random probing gets expensive
+        self.unseen_pools: dict[int, tuple[list[int], dict[int, int], int]] = {}
+
+    def schedule(self, example_id: int, level_id: int, box: int, due: float):
+        version = self.version.get(example_id, 0) + 1
+        self.box[example_id] = box
+        self.due[example_id] = due
+        self.version[example_id] = version
+        levels = self.levels.setdefault(example_id, set())
+        if level_id not in levels:
+            levels.add(level_id)
+            self.seen_per_level[level_id] = self.seen_per_level.get(level_id, 0) + 1
+        for level in levels:
+            heapq.heappush(self.heaps.setdefault(level, []), (due, version, example_id))
+            self._drop_unseen(example_id, level)
+
+    def add_level(self, example_id: int, level_id: int):
+        levels = self.levels[example_id]
+        if level_id not in levels:
+            levels.add(level_id)
+            self.seen_per_level[level_id] = self.seen_per_level.get(level_id, 0) + 1
+            heapq.heappush(self.heaps.setdefault(level_id, []),
+                           (self.due[example_id], self.version[example_id], example_id))
+            self._drop_unseen(example_id, level_id)
+
+    def unseen_pool(self, level_id: int, level_ids: array) -> list[int]:
+        pool = self.unseen_pools.get(level_id)
+        if pool is None or pool[2] != len(level_ids):
+            ids = [example_id for example_id in level_ids if example_id not in self.box]
+            pool = (ids, {example_id: pos for pos, example_id in enumerate(ids)}, len(level_ids))
+            self.unseen_pools[level_id] = pool
+        return pool[0]
+
+    def _drop_unseen(self, example_id: int, level_id: int):
+        pool = self.unseen_pools.get(level_id)
+        if pool is None:
+            return
+        ids, positions, _ = pool
+        pos = positions.pop(example_id, None)
+        if pos is not None:
+            # Swap-remove keeps the pool dense in O(1)
+            last = ids.pop()
+            if pos < len(ids):
+                ids[pos] = last
+                positions[last] = pos
+
+    def pop_valid(self, level_id: int):
+        heap = self.heaps.get(level_id)
+        while heap:
+            entry = heapq.heappop(heap)
+            if self.version.get(entry[2]) == entry[1]:
+                return entry
+        return None
+
+    def push(self, level_id: int, entry: tuple[float, int, int]):
+        heapq.heappush(self.heaps[level_id], entry)
+
+
+class LeitnerSelector(ExampleSelector):
+    """
+    Spaced repetition: due examples (including everything answered wrong) come first,
+    then examples the user has never seen, then the ones due soonest.
+
+    A user's history is read from UserExampleStat once and then kept in memory,
+    so choosing a round costs O(count * log n) without touching the database.
+    """
+
+    def __init__(self, index: ExampleIndex = example_index, session_factory=SessionLocal,
+                 max_users: int = 10000):
+        self._index = index
+        self._session_factory = session_factory
+        self._max_users = max_users
+        self._queues: OrderedDict[int, _UserQueue] = OrderedDict()
+
+    def _load_rows(self, user_id: int):
+        session = self._session_factory()
+        try:
+            return (
+                session.query(UserExampleStat.example_id, example_levels.c.level_id,
+                              UserExampleStat.box, UserExampleStat.due_at)
+                .join(example_levels, example_levels.c.example_id == UserExampleStat.example_id)
+                .filter(UserExampleStat.user_id == user_id)
+                .all()
+            )
+        finally:
+            session.close()
+
+    async def _get_queue(self, user_id: int) -> _UserQueue:
+        queue = self._queues.get(user_id)
+        if queue is not None:
+            self._queues.move_to_end(user_id)
+            return queue
+
+        # Persist buffered answers first so the loaded history is complete
+        await stats_recorder.flush()
+        rows = await run_db(self._load_rows, user_id)
+
+        queue = _UserQueue()
+        for example_id, level_id, box, due_at in rows:
+            if example_id in queue.box:
+                queue.add_level(example_id, level_id)
+            else:
+                queue.schedule(example_id, level_id, box or 1, _to_timestamp(due_at))
+
+        self._queues[user_id] = queue
+        if len(self._queues) > self._max_users:
+            self._queues.popitem(last=False)
+        return queue
+
+    async def select(self, user_id: int, level_id: int, count: int) -> list[int]:
+        queue = await self._get_queue(user_id)
+        return self._select_from(queue, level_id, count, time.time())
+
+    def _select_from(self, queue: _UserQueue, level_id: int, count: int, now: float) -> list[int]:
+        count = min(count, self._index.count(level_id))
+        selected: list[int] = []
+        popped = []
+
+        # 1. Everything that is due, earliest first
+        while len(selected) < count:
+            entry = queue.pop_valid(level_id)
+            if entry is None:
+                break
+            popped.append(entry)
+            if entry[0] > now:
+                break
+            selected.append(entry[2])
+
+        # 2. Examples the user has never answered
+        if len(selected) < count:
+            selected.extend(self._pick_unseen(queue, level_id, count - len(selected)))
+
+        # 3. Not enough new material: repeat the examples that are due soonest
+        upcoming = [entry[2] for entry in popped if entry[0] > now]
+        while len(selected) < count:
+            if upcoming:
+                selected.append(upcoming.pop())
+                continue
+            entry = queue.pop_valid(level_id)
+            if entry is None:
+                break
+            popped.append(entry)
+            selected.append(entry[2])
+
+        # Popped entries stay scheduled until an answer replaces them
+        for entry in popped:
+            queue.push(level_id, entry)
+
+        random.shuffle(selected)
+        return selected
+
+    def _pick_unseen(self, queue: _UserQueue, level_id: int, needed: int) -> list[int]:
+        level_size = self._index.count(level_id)
+        unseen = level_size - queue.seen_per_level.get(level_id, 0)
+        if unseen <= 0:
+            return []
+        if unseen * 10 < level_size:
+            pool = queue.unseen_pool(level_id, self._index.ids(level_id))
+            return random.sample(pool, min(needed, len(pool)))
+        # Oversample in proportion to the share of unseen examples, doubling if that was not enough
+        sample_size = min(level_size, needed * level_size * 3 // (unseen * 2) + 8)
+        while True:
+            picked = []
+            for example_id in self._index.sample(level_id, sample_size):
+                if example_id in queue.box:
+                    # Seen under another level: make it reachable from this level's heap too
+                    queue.add_level(example_id, level_id)
+                    continue
+                picked.append(example_id)
+                if len(picked) == needed:
+                    return picked
+            if sample_size == level_size:
+                return picked
+            sample_size = min(level_size, sample_size * 2)
+
+    def record_answer(self, user_id: int, example_id: int, level_id: int | None, is_correct: bool):
+        queue = self._queues.get(user_id)
+        if queue is None or level_id is None:
+            return None, None
+
+        box = min(queue.box.get(example_id, 1) + 1, MAX_BOX) if is_correct else 1
+        due = time.time() + BOX_INTERVALS[box]
+        queue.schedule(example_id, level_id, box, due)
+        return box, _to_datetime(due)
+
+
+def create_selector(name: str = EXAMPLE_SELECTOR) -> ExampleSelector:
+    if name == "random":
+        return RandomSelector()
+    if name == "leitner":
+        return LeitnerSelector()
+    raise ValueError(f"Unknown example selector: {name}")
+
+
+example_selector = create_selector()
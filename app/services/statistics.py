@@ -0,0 +1,25 @@
+from sqlalchemy import Float, cast
+from sqlalchemy.orm import Session
+
+from app.db.models import Example, UserExampleStat
+
+
+def weakest_examples(session: Session, user_id: int, limit: int = 10, min_attempts: int = 1):
+    """
+    Returns the user's examples with the lowest share of correct answers,
+    most-attempted first among equals: rows of (example_id, sentence, correct_attempts, total_attempts).
+    """
+    accuracy = cast(UserExampleStat.correct_attempts, Float) / UserExampleStat.total_attempts
+    return (
+        session.query(
+            UserExampleStat.example_id,
+            Example.sentence,
+            UserExampleStat.correct_attempts,
+            UserExampleStat.total_attempts,
+        )
+        .join(Example, Example.id == UserExampleStat.example_id)
+        .filter(UserExampleStat.user_id == user_id, UserExampleStat.total_attempts >= min_attempts)
+        .order_by(accuracy, UserExampleStat.total_attempts.desc())
+        .limit(limit)
+        .all()
+    )
@@ -0,0 +1,208 @@
+import asyncio
+import logging
+from datetime import datetime
+
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+
+from app.config import STATS_FLUSH_INTERVAL, STATS_FLUSH_THRESHOLD, STATS_MAX_PENDING
+from app.db.models import UserCategoryStat, UserExampleStat
+from app.db.session import SessionLocal, run_db, dialect_insert
+
+logger = logging.getLogger(__name__)
+
+
+class StatsRecorder:
+    """
+    Write-behind buffer for per-category and per-example training statistics.
+
+    Handlers record increments in memory; they are written as bulk
+    INSERT ... ON CONFLICT DO UPDATE statements in one transaction per flush,
+    triggered by a timer, by the number of pending increments, or explicitly
+    (e.g. on shutdown).
+
+    A batch the database rejects (IntegrityError) is written again row by row and
+    the rejected rows are dropped; a batch that fails otherwise is kept for the next
+    flush, up to `max_pending` rows.
+    """
+
+    def __init__(self, session_factory=SessionLocal, flush_interval: float = STATS_FLUSH_INTERVAL,
+                 flush_threshold: int = STATS_FLUSH_THRESHOLD, max_pending: int = STATS_MAX_PENDING):
+        self._session_factory = session_factory
+        self._flush_interval = flush_interval
+        self._flush_threshold = flush_threshold
+        self._max_pending = max_pending
+        # (user_id, category_id) -> [correct_attempts, total_attempts]
+        self._pending: dict[tuple[int, int], list[int]] = {}
+        # (user_id, example_id) -> [correct_attempts, total_attempts, last_attempt_at, box, due_at]
+        self._pending_examples: dict[tuple[int, int], list] = {}
+        self._pending_count = 0
+        self._flush_lock = asyncio.Lock()
+        self._timer: asyncio.Task | None = None
+        self._threshold_flush: asyncio.Task | None = None
+
+    def record_attempt(self, user_id: int, category_id: int | None):
+        # Examples without a category have no category statistics
+        if category_id is not None:
+            self._add(user_id, category_id, correct=0, total=1)
+
+    def record_correct(self, user_id: int, category_id: int | None):
+        if category_id is not None:
+            self._add(user_id, category_id, correct=1, total=0)
+
+    def record_answer(self, user_id: int, example_id: int, is_correct: bool, box: int = None, due_at: datetime = None):
+        """
+        Logs one answer; box and due_at carry the repetition schedule chosen by the example selector.
+        """
+        self._add_example(user_id, example_id, int(is_correct), 1, datetime.utcnow(), box, due_at)
+
+    def _add(self, user_id: int, category_id: int, correct: int, total: int):
+        delta = self._pending.setdefault((user_id, category_id), [0, 0])
+        delta[0] += correct
+        delta[1] += total
+        self._on_pending()
+
+    def _add_example(self, user_id: int, example_id: int, correct: int, total: int, attempted_at: datetime,
+                     box: int = None, due_at: datetime = None):
+        delta = self._pending_examples.setdefault((user_id, example_id), [0, 0, attempted_at, None, None])
+        delta[0] += correct
+        delta[1] += total
+        if attempted_at >= delta[2]:
+            delta[2] = attempted_at
+            if box is not None:
+                delta[3], delta[4] = box, due_at
+        self._on_pending()
+
+    def _on_pending(self):
+        self._pending_count += 1
+        if self._pending_count >= self._flush_threshold and not self._threshold_flush:
+            self._threshold_flush = asyncio.get_running_loop().create_task(self._flush_on_threshold())
+
+    async def _flush_on_threshold(self):
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception("Failed to flush training statistics")
+        finally:
+            self._threshold_flush = None
+
+    async def flush(self):
+        async with self._flush_lock:
+            if not self._pending and not self._pending_examples:
+                return
+            pending, self._pending = self._pending, {}
+            pending_examples, self._pending_examples = self._pending_examples, {}
+            self._pending_count = 0
+            try:
+                try:
+                    await run_db(self._write, pending, pending_examples)
+                except IntegrityError:
+                    # Retrying the same batch would fail forever: isolate the rows the database rejects
+                    await run_db(self._write_rows, pending, pending_examples)
+            except Exception:
+                # Keep the increments so the next flush retries them
+                self._requeue(pending, pending_examples)
+                raise
+
+    def _requeue(self, pending: dict[tuple[int, int], list[int]], pending_examples: dict[tuple[int, int], list]):
+        dropped = 0
+        for (user_id, category_id), (correct, total) in pending.items():
+            if (user_id, category_id) in self._pending or self._pending_size() < self._max_pending:
+                self._add(user_id, category_id, correct, total)
+            else:
+                dropped += 1
+        for (user_id, example_id), (correct, total, attempted_at, box, due_at) in pending_examples.items():
+            if (user_id, example_id) in self._pending_examples or self._pending_size() < self._max_pending:
+                self._add_example(user_id, example_id, correct, total, attempted_at, box, due_at)
+            else:
+                dropped += 1
+        if dropped:
+            logger.warning("Dropped %s buffered statistics rows: %s rows are already pending", dropped,
+                           self._max_pending)
+
+    def _pending_size(self) -> int:
+        return len(self._pending) + len(self._pending_examples)
+
+    def _write_rows(self, pending: dict[tuple[int, int], list[int]], pending_examples: dict[tuple[int, int], list]):
+        """
+        Writes each row in its own transaction and drops the ones that raise IntegrityError.
+        Written and dropped rows are removed from the dicts, so after any other error
+        they hold exactly what is left to retry.
+        """
+        for rows, write in ((pending, lambda row: self._write(row, {})),
+                            (pending_examples, lambda row: self._write({}, row))):
+            for key in list(rows):
+                row = {key: rows[key]}
+                try:
+                    write(row)
+                except IntegrityError:
+                    logger.exception("Dropped training statistics rejected by the database: %s", row)
+                del rows[key]
+
+    def _write(self, pending: dict[tuple[int, int], list[int]], pending_examples: dict[tuple[int, int], list]):
+        session = self._session_factory()
+        try:
+            if pending:
+                stmt = dialect_insert(session, UserCategoryStat)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[UserCategoryStat.user_id, UserCategoryStat.category_id],
+                    set_={
+                        "correct_attempts": UserCategoryStat.correct_attempts + stmt.excluded.correct_attempts,
+                        "total_attempts": UserCategoryStat.total_attempts + stmt.excluded.total_attempts,
+                    },
+                )
+                session.execute(stmt, [
+                    {"user_id": user_id, "category_id": category_id,
+                     "correct_attempts": correct, "total_attempts": total}
+                    for (user_id, category_id), (correct, total) in pending.items()
+                ])
+
+            if pending_examples:
+                stmt = dialect_insert(session, UserExampleStat)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[UserExampleStat.user_id, UserExampleStat.example_id],
+                    set_={
+                        "correct_attempts": UserExampleStat.correct_attempts + stmt.excluded.correct_attempts,
+                        "total_attempts": UserExampleStat.total_attempts + stmt.excluded.total_attempts,
+                        "last_attempt_at": stmt.excluded.last_attempt_at,
+                        "box": func.coalesce(stmt.excluded.box, UserExampleStat.box),
+                        "due_at": func.coalesce(stmt.excluded.due_at, UserExampleStat.due_at),
+                    },
+                )
+                session.execute(stmt, [
+                    {"user_id": user_id, "example_id": example_id, "correct_attempts": correct,
+                     "total_attempts": total, "last_attempt_at": attempted_at, "box": box, "due_at": due_at}
+                    for (user_id, example_id), (correct, total, attempted_at, box, due_at) in pending_examples.items()
+                ])
+
+            session.commit()
+        finally:
+            session.close()
+
+    async def start(self):
+        if self._timer is None:
+            self._timer = asyncio.create_task(self._run_timer())
+
+    async def _run_timer(self):
+        while True:
+            await asyncio.sleep(self._flush_interval)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Failed to flush training statistics")
+
+    async def close(self):
+        """
+        Stops the timer and writes everything still buffered. A failure is logged
+        rather than raised, so the shutdown handlers registered after this one still run.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception("Failed to flush training statistics on shutdown")
+
+
+stats_recorder = StatsRecorder()
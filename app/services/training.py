@@ -0,0 +1,90 @@
+import random
+from dataclasses import dataclass, asdict
+
+from sqlalchemy.orm import Session
+
+from app.db.models import Example, Answer, UserSettings
+
+# Number of answer options shown when the user has not chosen one in the settings
+DEFAULT_ANSWERS_COUNT = 3
+
+
+@dataclass(frozen=True, slots=True)
+class Question:
+    example_id: int
+    sentence: str
+    explanation: str | None
+    category_id: int | None
+    correct_answer: str
+    incorrect_answers: tuple[str, ...]
+    answers_count: int = DEFAULT_ANSWERS_COUNT
+
+    def pick_options(self) -> list[str]:
+        """
+        Returns the correct answer plus a random sample of incorrect ones, shuffled.
+        """
+        sample_size = min(self.answers_count - 1, len(self.incorrect_answers))
+        options = [self.correct_answer, *random.sample(self.incorrect_answers, sample_size)]
+        random.shuffle(options)
+        return options
+
+    def to_dict(self) -> dict:
+        """
+        Plain representation for FSM storage.
+        """
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Question":
+        return cls(**{**data, "incorrect_answers": tuple(data["incorrect_answers"])})
+
+
+def _question_rows(session: Session, example_ids: list[int], user_id: int):
+    return (
+        session.query(
+            Example.id,
+            Example.sentence,
+            Example.explanation,
+            Example.category_id,
+            Answer.text,
+            Answer.is_correct,
+            UserSettings.answers_count,
+        )
+        .join(Answer, Answer.example_id == Example.id)
+        .outerjoin(UserSettings, UserSettings.user_id == user_id)
+        .filter(Example.id.in_(example_ids))
+        .all()
+    )
+
+
+def _build_questions(rows) -> dict[int, Question]:
+    grouped: dict[int, list] = {}
+    for row in rows:
+        grouped.setdefault(row[0], []).append(row)
+
+    questions = {}
+    for example_id, example_rows in grouped.items():
+        _, sentence, explanation, category_id, _, _, answers_count = example_rows[0]
+        correct = next((row.text for row in example_rows if row.is_correct), None)
+        if correct is None:
+            # An example without a correct answer cannot be asked
+            continue
+        questions[example_id] = Question(
+            example_id=example_id,
+            sentence=sentence,
+            explanation=explanation,
+            category_id=category_id,
+            correct_answer=correct,
+            incorrect_answers=tuple(row.text for row in example_rows if not row.is_correct),
+            answers_count=answers_count or DEFAULT_ANSWERS_COUNT,
+        )
+    return questions
+
+
+def load_round(session: Session, example_ids: list[int], user_id: int) -> list[Question]:
+    """
+    Loads every question of a training round in one batched query, keeping the order of example_ids.
+    Ids that no longer exist are skipped.
+    """
+    questions = _build_questions(_question_rows(session, example_ids, user_id))
+    return [questions[example_id] for example_id in example_ids if example_id in questions]
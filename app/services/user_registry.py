@@ -0,0 +1,105 @@
+import asyncio
+
+from sqlalchemy.orm import Session
+
+from app.db.enums import UserRole
+from app.db.models import User
+from app.db.session import SessionLocal, run_db, dialect_insert
+from app.services.role_cache import RoleCache, role_cache
+
+
+class UserRegistry:
+    """
+    Makes sure every Telegram user has a User row while touching the database
+    only once per new user.
+
+    Ids known to exist are kept in an in-process set (about 60 bytes per user,
+    so a plain set is fine well into hundreds of thousands of users). Unknown
+    users that arrive within `batch_window` seconds are inserted together with
+    one INSERT ... ON CONFLICT DO NOTHING.
+    """
+
+    def __init__(self, session_factory=SessionLocal, cache: RoleCache = role_cache,
+                 batch_window: float = 0.05, max_batch: int = 500):
+        self._session_factory = session_factory
+        self._cache = cache
+        self._batch_window = batch_window
+        self._max_batch = max_batch
+        self._known: set[int] = set()
+        # user_id -> username of users waiting for the next insert
+        self._pending: dict[int, str] = {}
+        self._batch: asyncio.Future | None = None
+        self._timer: asyncio.TimerHandle | None = None
+
+    def load(self, session: Session):
+        self._known = {user_id for (user_id,) in session.query(User.id)}
+
+    def is_known(self, user_id: int) -> bool:
+        return user_id in self._known
+
+    async def ensure(self, user_id: int, username: str):
+        if user_id in self._known:
+            return
+
+        loop = asyncio.get_running_loop()
+        self._pending.setdefault(user_id, username)
+        if self._batch is None:
+            self._batch = loop.create_future()
+            self._timer = loop.call_later(self._batch_window, self._flush)
+        batch = self._batch
+        if len(self._pending) >= self._max_batch:
+            self._timer.cancel()
+            self._flush()
+
+        await asyncio.shield(batch)
+
+    def _flush(self):
+        pending, batch = self._pending, self._batch
+        self._pending, self._batch, self._timer = {}, None, None
+        asyncio.get_running_loop().create_task(self._insert_batch(pending, batch))
+
+    async def _insert_batch(self, pending: dict[int, str], batch: asyncio.Future):
+        try:
+            inserted = await run_db(self._insert, pending)
+        except Exception as e:
+            batch.set_exception(e)
+            # Failed users stay unknown, so their next update retries the insert
+            batch.exception()
+            return
+
+        self._known.update(pending)
+        for user_id in pending:
+            if user_id in inserted:
+                self._cache.set_role(user_id, UserRole.USER.value)
+            else:
+                self._cache.invalidate(user_id)
+        batch.set_result(None)
+
+    def _insert(self, pending: dict[int, str]) -> set[int]:
+        session = self._session_factory()
+        try:
+            stmt = (
+                dialect_insert(session, User)
+                .on_conflict_do_nothing(index_elements=[User.id])
+                .returning(User.id)
+            )
+            result = session.execute(stmt, [
+                {"id": user_id, "username": username, "role": UserRole.USER.value}
+                for user_id, username in pending.items()
+            ])
+            inserted = {user_id for (user_id,) in result}
+            session.commit()
+            return inserted
+        finally:
+            session.close()
+
+
+user_registry = UserRegistry()
+
+
+def load_known_users():
+    session = SessionLocal()
+    try:
+        user_registry.load(session)
+    finally:
+        session.close()
@@ -0,0 +1,284 @@
+import asyncio
+import logging
+import multiprocessing
+import signal
+import threading
+import time
+from typing import Any, Callable
+
+from aiogram import Bot, Dispatcher
+from aiogram.exceptions import TelegramNetworkError
+from aiogram.types import Update
+
+logger = logging.getLogger(__name__)
+
+# Seconds a stopping worker gets to finish the updates already queued for it
+SHUTDOWN_TIMEOUT = 10
+
+# Inbox items are (chat_id, dispatched_at, update), or (CONTROL, command, argument)
+# sent by another worker; shard 0 runs the reminders and accepts REMINDER_TIME,
+# every shard accepts EXAMPLES_ADDED
+CONTROL = "control"
+REMINDER_TIME = "reminder_time"
+EXAMPLES_ADDED = "examples_added"
+
+
+def update_chat_id(update: dict[str, Any]) -> int | None:
+    """
+    Chat an update belongs to, read from the raw JSON without building aiogram models.
+    """
+    for key, value in update.items():
+        if key == "update_id" or not isinstance(value, dict):
+            continue
+        chat = value.get("chat") or (value.get("message") or {}).get("chat")
+        if chat:
+            return chat["id"]
+        sender = value.get("from") or value.get("user")
+        if sender:
+            return sender["id"]
+    return None
+
+
+def update_payload(update: Update) -> dict[str, Any]:
+    """
+    Raw JSON form of a polled update, as Telegram sends it to a webhook ("from", not "from_user").
+    """
+    return update.model_dump(mode="json", exclude_none=True, by_alias=True)
+
+
+async def create_worker(shard: int) -> tuple[Dispatcher, Bot]:
+    """
+    Default worker setup: the bot's own dispatcher with handlers and in-process caches.
+    """
+    from app.bot import bot, dp
+    from app.startup import load_caches, setup_dispatcher
+
+    await load_caches()
+    setup_dispatcher(dp, reminders=shard == 0)
+    return dp, bot
+
+
+class ShardWorker:
+    """
+    Runs inside a worker process: feeds the updates of its inbox to the dispatcher.
+
+    Updates of different chats are handled concurrently; updates of one chat
+    strictly one after another, in the order they were dispatched.
+    """
+
+    def __init__(self, shard: int, dispatcher: Dispatcher, bot: Bot, report=None,
+                 controls: dict[str, Callable[[Any], None]] | None = None):
+        self.shard = shard
+        self._dispatcher = dispatcher
+        self._bot = bot
+        self._report = report
+        self._controls = controls or {}
+        self._tails: dict[int, asyncio.Task] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self.handled = 0
+
+    async def run(self, inbox):
+        loop = asyncio.get_running_loop()
+        stopped = loop.create_future()
+
+        def read_inbox():
+            # A blocking reader thread, so the event loop never waits on the pipe
+            while True:
+                item = inbox.get()
+                if item is None:
+                    loop.call_soon_threadsafe(stopped.set_result, None)
+                    return
+                if item[0] == CONTROL:
+                    loop.call_soon_threadsafe(self.control, item[1], item[2])
+                else:
+                    loop.call_soon_threadsafe(self.accept, *item)
+
+        workflow_data = {"dispatcher": self._dispatcher, "bot": self._bot, **self._dispatcher.workflow_data}
+        await self._dispatcher.emit_startup(**workflow_data)
+        threading.Thread(target=read_inbox, name=f"shard-{self.shard}-inbox", daemon=True).start()
+        try:
+            await stopped
+            if self._tasks:
+                await asyncio.wait(set(self._tasks), timeout=SHUTDOWN_TIMEOUT)
+        finally:
+            await self._dispatcher.emit_shutdown(**workflow_data)
+            await self._bot.session.close()
+
+    def control(self, command: str, argument: Any):
+        handler = self._controls.get(command)
+        if handler is None:
+            logger.warning("Shard %s ignores unknown control command %s", self.shard, command)
+            return
+        handler(argument)
+
+    def accept(self, chat_id: int | None, dispatched_at: float, update: dict[str, Any]):
+        previous = self._tails.get(chat_id) if chat_id is not None else None
+        task = asyncio.create_task(self._handle(previous, chat_id, dispatched_at, update))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        if chat_id is not None:
+            self._tails[chat_id] = task
+            task.add_done_callback(lambda done: self._release(chat_id, done))
+
+    def _release(self, chat_id: int, task: asyncio.Task):
+        if self._tails.get(chat_id) is task:
+            del self._tails[chat_id]
+
+    async def _handle(self, previous: asyncio.Task | None, chat_id: int | None,
+                      dispatched_at: float, update: dict[str, Any]):
+        if previous is not None:
+            await asyncio.wait([previous])
+        try:
+            await self._dispatcher.feed_raw_update(self._bot, update)
+        except Exception:
+            logger.exception("Shard %s failed to handle update %s", self.shard, update.get("update_id"))
+        self.handled += 1
+        if self._report is not None:
+            self._report.put((self.shard, chat_id, update["update_id"], dispatched_at, time.monotonic()))
+
+
+def link_reminders(shard: int, primary_inbox, scheduler=None) -> dict[str, Callable[[Any], None]]:
+    """
+    Reminder times chosen in any shard reach the scheduler of shard 0 through its inbox;
+    returns the control commands the shard accepts.
+    """
+    if scheduler is None:
+        from app.services.reminders import reminder_scheduler as scheduler
+    if shard == 0:
+        return {REMINDER_TIME: scheduler.notify}
+    scheduler.forward_to(lambda training_time: primary_inbox.put((CONTROL, REMINDER_TIME, training_time)))
+    return {}
+
+
+def link_examples(shard: int, inboxes: list, events=None) -> dict[str, Callable[[Any], None]]:
+    """
+    Examples saved or imported in any shard reach the example caches of every other
+    shard through their inboxes; returns the control commands the shard accepts.
+    """
+    if events is None:
+        from app.services.example_events import example_events as events
+    others = [inbox for other, inbox in enumerate(inboxes) if other != shard]
+    if not others:
+        return {}
+
+    def broadcast(examples):
+        for inbox in others:
+            inbox.put((CONTROL, EXAMPLES_ADDED, examples))
+
+    events.broadcast_to(broadcast)
+    return {EXAMPLES_ADDED: events.apply}
+
+
+def _worker_main(shard: int, inbox, factory, report, inboxes):
+    # Ctrl+C reaches the whole process group; workers stop only when the supervisor says so
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    async def serve():
+        dispatcher, bot = await factory(shard)
+        controls = {**link_reminders(shard, inboxes[0]), **link_examples(shard, inboxes)}
+        await ShardWorker(shard, dispatcher, bot, report, controls).run(inbox)
+
+    asyncio.run(serve())
+
+
+class ShardSupervisor:
+    """
+    Owns N worker processes and routes every update to worker `chat_id % N`,
+    so all FSM state and per-user caches of a chat live in exactly one process.
+
+    A worker that dies is restarted on the same inbox, so updates queued for it are not lost.
+    """
+
+    def __init__(self, workers: int, factory=create_worker, report=None):
+        self._context = multiprocessing.get_context("spawn")
+        self._factory = factory
+        self._report = report
+        self._inboxes = [self._context.Queue() for _ in range(workers)]
+        self._processes: list = [None] * workers
+        self.dispatched = [0] * workers
+        self._stopping = False
+
+    @property
+    def workers(self) -> int:
+        return len(self._inboxes)
+
+    def start(self):
+        for shard in range(self.workers):
+            self._spawn(shard)
+
+    def _spawn(self, shard: int):
+        process = self._context.Process(
+            target=_worker_main,
+            args=(shard, self._inboxes[shard], self._factory, self._report, self._inboxes),
+            name=f"shard-{shard}",
+        )
+        process.start()
+        self._processes[shard] = process
+
+    def dispatch(self, update: dict[str, Any]) -> int:
+        chat_id = update_chat_id(update)
+        shard = (chat_id if chat_id is not None else update["update_id"]) % self.workers
+        self._inboxes[shard].put((chat_id, time.monotonic(), update))
+        self.dispatched[shard] += 1
+        return shard
+
+    def alive(self) -> list[bool]:
+        return [process is not None and process.is_alive() for process in self._processes]
+
+    async def watch(self, interval: float = 1.0):
+        while not self._stopping:
+            for shard, process in enumerate(self._processes):
+                if process is not None and not process.is_alive() and not self._stopping:
+                    logger.error("Shard %s exited with code %s, restarting", shard, process.exitcode)
+                    self._spawn(shard)
+            await asyncio.sleep(interval)
+
+    def stop(self, timeout: float = SHUTDOWN_TIMEOUT + 5):
+        """
+        Lets every worker drain its inbox and shut down; blocks until they are gone.
+        """
+        self._stopping = True
+        for inbox in self._inboxes:
+            inbox.put(None)
+        for process in self._processes:
+            if process is not None:
+                process.join(timeout)
+                if process.is_alive():
+                    process.terminate()
+                    process.join()
+
+
+async def poll_into(bot: Bot, supervisor: ShardSupervisor, allowed_updates: list[str]):
+    """
+    Long polling front end: fetches updates and hands them to the shard workers.
+    """
+    await bot.delete_webhook()
+    offset = None
+    while True:
+        try:
+            updates = await bot.get_updates(offset=offset, timeout=30, allowed_updates=allowed_updates)
+        except TelegramNetworkError:
+            logger.warning("Polling failed, retrying", exc_info=True)
+            await asyncio.sleep(1)
+            continue
+        for update in updates:
+            supervisor.dispatch(update_payload(update))
+            offset = update.update_id + 1
+
+
+async def run_sharded_polling(workers: int):
+    from app.bot import bot, dp
+    from app.startup import prepare_database, setup_dispatcher
+
+    await prepare_database()
+    # Only used to know which update types the handlers need
+    setup_dispatcher(dp, reminders=False)
+    supervisor = ShardSupervisor(workers)
+    supervisor.start()
+    watcher = asyncio.create_task(supervisor.watch())
+    try:
+        await poll_into(bot, supervisor, dp.resolve_used_update_types())
+    finally:
+        watcher.cancel()
+        await bot.session.close()
+        await asyncio.get_running_loop().run_in_executor(None, supervisor.stop)
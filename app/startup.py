@@ -0,0 +1,44 @@
+from aiogram import Dispatcher
+
+from app.db.migrations import migrate
+from app.db.session import engine, run_db
+from app.middlewares.auth import RegisterUserMiddleware, RoleMiddleware
+from app.middlewares.fsm import BufferedStateMiddleware
+from app.services.example_index import build_example_index
+from app.services.reminders import reminder_scheduler
+from app.services.stats_recorder import stats_recorder
+from app.services.user_registry import load_known_users
+
+
+async def prepare_database():
+    """
+    Brings the schema and reference data up to date. Runs once, before any worker starts.
+    """
+    await run_db(migrate, engine)
+
+
+async def load_caches():
+    """
+    Fills the in-process caches; every worker process needs its own copy.
+    """
+    await run_db(build_example_index)
+    await run_db(load_known_users)
+
+
+def setup_dispatcher(dp: Dispatcher, reminders: bool = True):
+    from app.handlers import editor, user
+    # Registration runs first so the role lookup already sees new users
+    dp.update.outer_middleware(RegisterUserMiddleware())
+    dp.update.outer_middleware(RoleMiddleware())
+    # One FSM read and at most one write per update, whatever the handler does
+    dp.update.outer_middleware(BufferedStateMiddleware())
+    # Buffered training statistics are flushed periodically and once more on shutdown
+    dp.startup.register(stats_recorder.start)
+    dp.shutdown.register(stats_recorder.close)
+    # The FSM storage needs no hook of its own: the Dispatcher closes it on shutdown
+    if reminders:
+        # Exactly one process may send the daily reminders
+        dp.startup.register(reminder_scheduler.start)
+        dp.shutdown.register(reminder_scheduler.close)
+    dp.include_router(editor.router)
+    dp.include_router(user.router)
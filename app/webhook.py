@@ -0,0 +1,113 @@
+import asyncio
+import secrets
+
+from aiogram import Bot, Dispatcher
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+from aiohttp import web
+
+from app.config import BOT_WORKERS, WEB_HOST, WEB_PORT, WEBHOOK_BASE_URL, WEBHOOK_PATH, WEBHOOK_SECRET
+from app.fsm.buffered import fsm_metrics
+from app.sharding import SHUTDOWN_TIMEOUT, ShardSupervisor
+
+
+class DrainingRequestHandler(SimpleRequestHandler):
+    """
+    Answers Telegram immediately and handles the update in the background;
+    on shutdown waits for those background updates before the bot session is closed.
+    """
+
+    async def close(self):
+        pending = self._background_feed_update_tasks
+        if pending:
+            await asyncio.wait(set(pending), timeout=SHUTDOWN_TIMEOUT)
+        await super().close()
+
+
+def build_app(dispatcher: Dispatcher, bot: Bot, secret: str | None, path: str = WEBHOOK_PATH, handle_in_background: bool = True) -> web.Application:
+    app = web.Application()
+
+    async def healthz(request: web.Request) -> web.Response:
+        return web.json_response({"status": "ok", "fsm": fsm_metrics.snapshot()})
+
+    app.router.add_get("/healthz", healthz)
+    # Registered before the dispatcher hooks, so pending updates are drained before statistics are flushed
+    DrainingRequestHandler(
+        dispatcher=dispatcher, bot=bot, secret_token=secret, handle_in_background=handle_in_background,
+    ).register(app, path=path)
+    setup_application(app, dispatcher, bot=bot)
+    return app
+
+
+def build_front_app(supervisor: ShardSupervisor, secret: str | None, path: str = WEBHOOK_PATH) -> web.Application:
+    """
+    Webhook front end of the sharded mode: checks the secret and hands the raw update
+    to the worker owning its chat, without handling it in this process.
+    """
+    app = web.Application()
+
+    async def receive(request: web.Request) -> web.Response:
+        token = request.headers.get("X-Telegram-Bot-Api-Secret-Token", "")
+        if secret and not secrets.compare_digest(token, secret):
+            return web.Response(status=401, text="Unauthorized")
+        supervisor.dispatch(await request.json())
+        return web.json_response({})
+
+    async def healthz(request: web.Request) -> web.Response:
+        alive = supervisor.alive()
+        return web.json_response(
+            {"status": "ok" if all(alive) else "degraded", "workers": alive, "dispatched": supervisor.dispatched},
+            status=200 if all(alive) else 503,
+        )
+
+    async def on_startup(app: web.Application):
+        supervisor.start()
+        app["watcher"] = asyncio.create_task(supervisor.watch())
+
+    async def on_shutdown(app: web.Application):
+        app["watcher"].cancel()
+        # Runs after the server stopped accepting requests, so nothing is dispatched any more
+        await asyncio.get_running_loop().run_in_executor(None, supervisor.stop)
+
+    app.router.add_post(path, receive)
+    app.router.add_get("/healthz", healthz)
+    app.on_startup.append(on_startup)
+    app.on_shutdown.append(on_shutdown)
+    return app
+
+
+async def _register_webhook(bot: Bot, dp: Dispatcher, secret: str, workers: int):
+    await bot.set_webhook(
+        f"{WEBHOOK_BASE_URL.rstrip('/')}{WEBHOOK_PATH}",
+        secret_token=secret,
+        allowed_updates=dp.resolve_used_update_types(),
+        max_connections=max(40, workers * 10),
+    )
+
+
+async def _create_app(secret: str, workers: int) -> web.Application:
+    from app.bot import bot, dp
+    from app.startup import load_caches, prepare_database, setup_dispatcher
+
+    await prepare_database()
+    # In the sharded mode shard 0 sends the reminders
+    setup_dispatcher(dp, reminders=workers == 1)
+    await _register_webhook(bot, dp, secret, workers)
+    if workers > 1:
+        # This process only routes; the dispatcher above just told Telegram which update types to send
+        await bot.session.close()
+        return build_front_app(ShardSupervisor(workers), secret)
+    await load_caches()
+    return build_app(dp, bot, secret)
+
+
+def run_webhook(workers: int = BOT_WORKERS):
+    """
+    Serves updates over a webhook. With several workers this process receives the
+    requests and shards them by chat id across worker processes (see app.sharding).
+    """
+    if not WEBHOOK_BASE_URL:
+        raise RuntimeError("WEBHOOK_BASE_URL must be set in webhook mode")
+
+    secret = WEBHOOK_SECRET or secrets.token_urlsafe(32)
+    web.run_app(_create_app(secret, workers), host=WEB_HOST, port=WEB_PORT,
+                shutdown_timeout=SHUTDOWN_TIMEOUT, print=None)
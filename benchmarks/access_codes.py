@@ -0,0 +1,68 @@
+"""
+Access-code ingestion: one SELECT per code vs. chunked INSERT ... ON CONFLICT DO NOTHING.
+
+Both paths add --codes codes (a tenth of them repeated, a tenth already stored)
+to a fresh temporary database. Also reports how fast codes are generated.
+
+Usage: python -m benchmarks.access_codes [--codes 50000] [--chunk-size 1000]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.models import AccessCode, Base
+from app.services.access_codes import add_access_codes, generate_codes
+
+
+def add_one_by_one(session, codes: list[str]) -> int:
+    # The previous /add_access_codes path
+    added_count = 0
+    for code in codes:
+        if not session.query(AccessCode).filter_by(code=code).first():
+            session.add(AccessCode(code=code, is_used=False, created_at=datetime.utcnow()))
+            added_count += 1
+    session.commit()
+    return added_count
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--codes", type=int, default=50000)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    codes = generate_codes(args.codes)
+    seconds = time.perf_counter() - started
+    print(f"generate  {args.codes:7d} codes  {seconds:7.3f} s  {args.codes / seconds:11.0f} codes/s")
+
+    stored = codes[:args.codes // 10]
+    pasted = codes + random.sample(codes, args.codes // 10)
+    random.shuffle(pasted)
+
+    with tempfile.TemporaryDirectory() as directory:
+        for label, add in (
+            ("per-code", add_one_by_one),
+            ("chunked", lambda session, batch: add_access_codes(session, batch, args.chunk_size)[0]),
+        ):
+            engine = create_engine(f"sqlite:///{os.path.join(directory, label)}.sqlite3")
+            Base.metadata.create_all(engine)
+            session = sessionmaker(bind=engine)()
+            add_access_codes(session, stored)
+
+            started = time.perf_counter()
+            added = add(session, pasted)
+            seconds = time.perf_counter() - started
+            print(f"{label:9} {added:7d} added  {seconds:7.2f} s  {len(pasted) / seconds:11.0f} codes/s")
+            session.close()
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Answer-handling cost of statistics: per-answer commits vs. the write-behind recorder.
+
+"before" replays the old path (commit UserCategoryStat.total_attempts when a
+question is shown, commit correct_attempts on a right answer). "after" records
+the same events plus the per-example attempt on a StatsRecorder and lets its
+threshold flushes write them in bulk. Reported latency is what the handler
+awaits per answer; wall time includes all flushes.
+
+Usage: python -m benchmarks.answer_latency [--answers 5000] [--users 200]
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.models import Base, UserCategoryStat
+from app.db.session import run_db
+from app.services.stats_recorder import StatsRecorder
+
+
+def commit_attempt(session_factory, user_id: int, category_id: int, is_correct: bool):
+    session = session_factory()
+    try:
+        stat = session.query(UserCategoryStat).filter_by(user_id=user_id, category_id=category_id).first()
+        if not stat:
+            stat = UserCategoryStat(user_id=user_id, category_id=category_id, correct_attempts=0, total_attempts=0)
+            session.add(stat)
+        stat.total_attempts += 1
+        session.commit()
+        if is_correct:
+            stat.correct_attempts += 1
+            session.commit()
+    finally:
+        session.close()
+
+
+def report(label: str, latencies: list[float], wall: float):
+    latencies.sort()
+    p50 = statistics.median(latencies) * 1e6
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1e6
+    print(f"{label:8} p50 {p50:9.1f} µs   p99 {p99:9.1f} µs   wall {wall:6.2f} s")
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--answers", type=int, default=5000)
+    parser.add_argument("--users", type=int, default=200)
+    args = parser.parse_args()
+
+    events = [
+        (random.randint(1, args.users), random.randint(1, 7), random.randint(1, 2000), random.random() < 0.6)
+        for _ in range(args.answers)
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.sqlite3')}",
+                               connect_args={"check_same_thread": False})
+        Base.metadata.create_all(bind=engine)
+        session_factory = sessionmaker(bind=engine, autoflush=False)
+
+        latencies = []
+        started = time.perf_counter()
+        for user_id, category_id, _, is_correct in events:
+            t = time.perf_counter()
+            await run_db(commit_attempt, session_factory, user_id, category_id, is_correct)
+            latencies.append(time.perf_counter() - t)
+        report("before", latencies, time.perf_counter() - started)
+
+        recorder = StatsRecorder(session_factory, flush_threshold=500)
+        latencies = []
+        started = time.perf_counter()
+        for user_id, category_id, example_id, is_correct in events:
+            t = time.perf_counter()
+            recorder.record_attempt(user_id, category_id)
+            recorder.record_answer(user_id, example_id, is_correct)
+            if is_correct:
+                recorder.record_correct(user_id, category_id)
+            latencies.append(time.perf_counter() - t)
+            await asyncio.sleep(0)
+        await recorder.close()
+        report("after", latencies, time.perf_counter() - started)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
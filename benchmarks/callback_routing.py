@@ -0,0 +1,93 @@
+"""
+Callback routing cost versus the number of registered callback handlers.
+
+Compares handlers registered with `lambda c: c.data.startswith(...)` filters (tested
+one by one in registration order) against a CallbackIndex (one dict lookup on the
+data prefix plus typed payload parsing). Each update goes through the full
+Dispatcher.feed_update pipeline; handlers do nothing.
+
+Usage: python -m benchmarks.callback_routing [--handlers 10 50 200] [--updates 3000]
+"""
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime
+
+from aiogram import Bot, Dispatcher, Router
+from aiogram.filters.callback_data import CallbackData
+from aiogram.types import CallbackQuery, Chat, Message, Update, User
+
+from app.handlers.callbacks import CallbackIndex
+
+
+def _factory(index: int) -> type[CallbackData]:
+    return type(f"Route{index}", (CallbackData,), {"__annotations__": {"value": int}}, prefix=f"r{index}")
+
+
+def _noop():
+    async def handler(callback: CallbackQuery):
+        return None
+    return handler
+
+
+def lambda_dispatcher(handlers: int) -> Dispatcher:
+    router = Router()
+    for index in range(handlers):
+        prefix = f"r{index}_"
+        router.callback_query.register(_noop(), lambda c, prefix=prefix: c.data.startswith(prefix))
+    dp = Dispatcher()
+    dp.include_router(router)
+    return dp
+
+
+def indexed_dispatcher(handlers: int) -> Dispatcher:
+    router = Router()
+    callbacks = CallbackIndex()
+    callbacks.attach(router)
+    for index in range(handlers):
+        callbacks(_factory(index))(_noop())
+    dp = Dispatcher()
+    dp.include_router(router)
+    return dp
+
+
+def make_updates(count: int, handlers: int, indexed: bool) -> list[Update]:
+    user = User(id=1, is_bot=False, first_name="Load")
+    message = Message(message_id=1, date=datetime.now(), chat=Chat(id=1, type="private"), text="x")
+    updates = []
+    for update_id in range(count):
+        target = random.randrange(handlers)
+        data = f"r{target}:{update_id}" if indexed else f"r{target}_{update_id}"
+        updates.append(Update(update_id=update_id, callback_query=CallbackQuery(
+            id=str(update_id), from_user=user, chat_instance="c", message=message, data=data,
+        )))
+    return updates
+
+
+async def measure(dp: Dispatcher, updates: list[Update]) -> float:
+    bot = Bot("42:TEST")
+    started = time.perf_counter()
+    for update in updates:
+        await dp.feed_update(bot, update)
+    elapsed = time.perf_counter() - started
+    await bot.session.close()
+    return elapsed / len(updates)
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--handlers", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--updates", type=int, default=3000)
+    args = parser.parse_args()
+
+    random.seed(1)
+    for handlers in args.handlers:
+        linear = await measure(lambda_dispatcher(handlers), make_updates(args.updates, handlers, indexed=False))
+        indexed = await measure(indexed_dispatcher(handlers), make_updates(args.updates, handlers, indexed=True))
+        print(f"{handlers:4d} handlers   lambda filters {linear * 1e6:8.1f} µs/update"
+              f"   prefix index {indexed * 1e6:8.1f} µs/update")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
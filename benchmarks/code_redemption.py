@@ -0,0 +1,75 @@
+"""
+Concurrent access-code redemption: throughput and double-redemption check.
+
+--users threads' worth of users race for --codes codes in a temporary database,
+each trying random codes until one claim succeeds or all are gone. Every
+successful claim is counted on the client side and compared with the rows.
+
+Usage: python -m benchmarks.code_redemption [--users 600] [--codes 100] [--threads 16]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.models import AccessCode, Base
+from app.services.access_codes import add_access_codes, generate_codes, redeem_access_code
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=600)
+    parser.add_argument("--codes", type=int, default=100)
+    parser.add_argument("--threads", type=int, default=16)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'codes.sqlite3')}",
+                               connect_args={"check_same_thread": False, "timeout": 60},
+                               pool_size=args.threads)
+        Base.metadata.create_all(engine)
+        session_factory = sessionmaker(bind=engine)
+        codes = generate_codes(args.codes)
+        session = session_factory()
+        add_access_codes(session, codes)
+        session.close()
+
+        attempts = Counter()
+
+        def claim(user_id: int) -> str | None:
+            session = session_factory()
+            try:
+                for code in random.sample(codes, len(codes)):
+                    attempts[user_id] += 1
+                    if redeem_access_code(session, code, user_id):
+                        return code
+                return None
+            finally:
+                session.close()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.threads) as pool:
+            claimed = [code for code in pool.map(claim, range(1, args.users + 1)) if code is not None]
+        seconds = time.perf_counter() - started
+
+        session = session_factory()
+        used = session.query(AccessCode).filter(AccessCode.is_used.is_(True)).count()
+        session.close()
+        engine.dispose()
+
+    double = len(claimed) - len(set(claimed))
+    total = sum(attempts.values())
+    print(f"{total} claim attempts by {args.users} users on {args.threads} threads in {seconds:.2f} s "
+          f"({total / seconds:.0f} claims/s)")
+    print(f"successful claims {len(claimed)}, codes marked used {used}, codes {args.codes}, "
+          f"double redemptions {double}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Cold start: process launch to the first handled update, with and without versioned migrations.
+
+Every boot is a fresh Python process with DATABASE_URL pointing at a throwaway
+SQLite file. It bootstraps the database, fills the caches, builds the dispatcher
+and feeds one /start update through it; Bot API calls are answered locally. "create_all" is the previous bootstrap (create_all,
+search index check and seeding checks on every start), "migrate" is
+app.db.migrations. The first boot creates the database, the others are restarts.
+
+Usage: python -m benchmarks.cold_start [--restarts 5]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def legacy_bootstrap():
+    from app.db.enums import CATEGORY_NAMES, LEVEL_NAMES
+    from app.db.models import Base, Category, Level
+    from app.db.session import SessionLocal, engine
+    from app.services.search import ensure_search_index
+
+    Base.metadata.create_all(bind=engine)
+    ensure_search_index(engine)
+    session = SessionLocal()
+    try:
+        for model, names in ((Level, LEVEL_NAMES), (Category, CATEGORY_NAMES)):
+            for name in names:
+                if not session.query(model).filter_by(name=name).first():
+                    session.add(model(name=name))
+        session.commit()
+    finally:
+        session.close()
+
+
+async def boot(mode: str, launched_at: float) -> dict:
+    from aiogram import Bot
+    from aiogram.client.session.base import BaseSession
+    from aiogram.methods import SendMessage
+    from aiogram.types import Chat, Message, Update
+
+    from app.bot import dp
+    from app.db.session import run_db
+    from app.startup import load_caches, prepare_database, setup_dispatcher
+    from benchmarks.sharding import make_update
+
+    class LocalSession(BaseSession):
+        async def make_request(self, bot, method, timeout=None):
+            if isinstance(method, SendMessage):
+                return Message(message_id=1, date=int(time.time()), text=method.text,
+                               chat=Chat(id=method.chat_id, type="private"))
+            return True
+
+        async def stream_content(self, *args, **kwargs):
+            raise NotImplementedError
+
+        async def close(self):
+            pass
+
+    imported_at = time.time()
+    if mode == "migrate":
+        await prepare_database()
+    else:
+        await run_db(legacy_bootstrap)
+    bootstrapped_at = time.time()
+    await load_caches()
+    setup_dispatcher(dp, reminders=False)
+
+    update = make_update(1, 4242)
+    update["message"]["text"] = "/start"
+    await dp.feed_update(Bot("42:TEST", session=LocalSession()), Update.model_validate(update))
+    handled_at = time.time()
+    return {
+        "imports": imported_at - launched_at,
+        "bootstrap": bootstrapped_at - imported_at,
+        "first_update": handled_at - launched_at,
+    }
+
+
+def launch(mode: str, directory: str) -> dict:
+    env = {**os.environ, "PYTHONPATH": str(ROOT), "BOT_TOKEN": "42:TEST", "FSM_STORAGE": "memory",
+           "DATABASE_URL": f"sqlite:///{os.path.join(directory, 'db.sqlite3')}"}
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.cold_start", "--child", mode, "--launched-at", repr(time.time())],
+        cwd=directory, env=env, check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--restarts", type=int, default=5)
+    parser.add_argument("--child")
+    parser.add_argument("--launched-at", type=float)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(asyncio.run(boot(args.child, args.launched_at))))
+        return
+
+    for mode in ("create_all", "migrate"):
+        with tempfile.TemporaryDirectory() as directory:
+            first = launch(mode, directory)
+            restarts = [launch(mode, directory) for _ in range(args.restarts)]
+        for label, runs in (("first boot", [first]), ("restart", restarts)):
+            print(f"{mode:10} {label:10}  bootstrap {statistics.median(r['bootstrap'] for r in runs) * 1000:7.1f} ms"
+                  f"   to first update {statistics.median(r['first_update'] for r in runs) * 1000:7.1f} ms"
+                  f"   (imports {statistics.median(r['imports'] for r in runs) * 1000:6.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Concurrent-update throughput: blocking ORM calls inside handlers vs. run_db.
+
+Simulates hundreds of trainees hitting /start_training at the same time. Every
+simulated update runs the same level join as cmd_training against a seeded
+SQLite file, either inline on the event loop (the old behaviour) or through
+the bounded DB thread pool. A ticker task measures how long the loop is stalled.
+
+Usage: python -m benchmarks.concurrent_updates [--trainees 300] [--examples 20000]
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.models import Base, Example, Level, example_levels
+from app.db.session import run_db
+
+
+def seed(session_factory, examples: int):
+    session = session_factory()
+    levels = [Level(name=name) for name in ("A2", "B1", "B2", "C1", "C2")]
+    session.add_all(levels)
+    session.flush()
+    session.bulk_save_objects([Example(sentence=f"Satz {i} [x]") for i in range(examples)])
+    session.flush()
+    session.execute(example_levels.insert(), [
+        {"example_id": i + 1, "level_id": levels[i % len(levels)].id} for i in range(examples)
+    ])
+    session.commit()
+    session.close()
+
+
+def sample_ids(session_factory, level_id: int, count: int) -> list[int]:
+    session = session_factory()
+    try:
+        example_ids = session.query(Example.id).join(example_levels).filter(example_levels.c.level_id == level_id).all()
+        return random.sample([e[0] for e in example_ids], count)
+    finally:
+        session.close()
+
+
+async def measure_lag(stop: asyncio.Event, lags: list[float]):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(0.001)
+        lags.append(time.perf_counter() - started - 0.001)
+
+
+async def run_scenario(session_factory, trainees: int, offload: bool):
+    async def update():
+        level_id = random.randint(1, 5)
+        if offload:
+            await run_db(sample_ids, session_factory, level_id, 10)
+        else:
+            sample_ids(session_factory, level_id, 10)
+        # Stands in for the Bot API round-trip that follows every query
+        await asyncio.sleep(0.005)
+
+    stop = asyncio.Event()
+    lags: list[float] = []
+    ticker = asyncio.create_task(measure_lag(stop, lags))
+    started = time.perf_counter()
+    await asyncio.gather(*(update() for _ in range(trainees)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await ticker
+    return trainees / elapsed, max(lags, default=0.0)
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--trainees", type=int, default=300)
+    parser.add_argument("--examples", type=int, default=20000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.sqlite3')}",
+                               connect_args={"check_same_thread": False})
+        Base.metadata.create_all(bind=engine)
+        session_factory = sessionmaker(bind=engine, autoflush=False)
+        seed(session_factory, args.examples)
+
+        print(f"{args.trainees} simultaneous trainees, {args.examples} examples")
+        for label, offload in (("inline (before)", False), ("run_db (after)", True)):
+            throughput, max_lag = await run_scenario(session_factory, args.trainees, offload)
+            print(f"{label:16} {throughput:8.1f} updates/s   max loop stall {max_lag * 1000:7.1f} ms")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,115 @@
+"""
+Bulk example import and export throughput.
+
+Writes a --rows CSV file of synthetic examples, then imports it into a fresh
+temporary database twice: "per-row" saves each example through the ORM in its
+own transaction, like the /add_example dialog (only the first --per-row rows,
+it is slow), "batched" streams the file through ExampleImporter. Finally the
+imported examples are exported back to CSV.
+
+Usage: python -m benchmarks.example_import [--rows 100000] [--per-row 2000] [--batch-size 1000]
+"""
+import argparse
+import csv
+import io
+import os
+import random
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.models import Answer, Base, Category, Example, Level
+from app.services.example_transfer import FIELDS, ExampleImporter, export_examples
+
+LEVELS = ["A2", "B1", "B2", "C1", "C2"]
+CATEGORIES = ["Präpositionen", "Verben mit Präposition", "Konjunktionaladverbien"]
+WORDS = ["auf", "an", "für", "über", "von", "mit", "zu", "bei", "nach", "aus"]
+
+
+def write_file(path: str, rows: int):
+    with open(path, "w", encoding="utf-8", newline="") as stream:
+        writer = csv.DictWriter(stream, fieldnames=FIELDS)
+        writer.writeheader()
+        for i in range(rows):
+            correct, *incorrect = random.sample(WORDS, 4)
+            level = random.randint(0, len(LEVELS) - 2)
+            writer.writerow({
+                "sentence": f"Satz Nummer {i} wartet [x] die Antwort.",
+                "correct_answer": correct,
+                "incorrect_answers": "|".join(incorrect),
+                "explanation": f"Erklärung {i}",
+                "category": random.choice(CATEGORIES),
+                "levels": "|".join(LEVELS[level:level + random.randint(1, 2)]),
+            })
+
+
+def fresh_database(directory: str, name: str):
+    engine = create_engine(f"sqlite:///{os.path.join(directory, name)}")
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine)
+    session = session_factory()
+    session.add_all([Level(name=name) for name in LEVELS] + [Category(name=name) for name in CATEGORIES])
+    session.commit()
+    session.close()
+    return engine, session_factory
+
+
+def import_per_row(session_factory, path: str, limit: int) -> tuple[int, float]:
+    session = session_factory()
+    importer = ExampleImporter(session)
+    levels = {level.id: level for level in session.query(Level)}
+    started = time.perf_counter()
+    imported = 0
+    with open(path, encoding="utf-8", newline="") as stream:
+        for _, row in zip(range(limit), csv.DictReader(stream)):
+            data, _ = importer.validate(row)
+            example = Example(sentence=data["sentence"], explanation=data["explanation"],
+                              category_id=data["category_id"])
+            session.add(example)
+            session.flush()
+            example.levels.extend(levels[level_id] for level_id in data["level_ids"])
+            session.add_all([
+                Answer(example_id=example.id, text=data["correct_answer"], is_correct=True),
+                *[Answer(example_id=example.id, text=text, is_correct=False) for text in data["incorrect_answers"]],
+            ])
+            session.commit()
+            imported += 1
+    session.close()
+    return imported, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--per-row", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "examples.csv")
+        write_file(path, args.rows)
+        print(f"{args.rows} rows, {os.path.getsize(path) / 1e6:.1f} MB")
+
+        engine, session_factory = fresh_database(directory, "per_row.sqlite3")
+        imported, seconds = import_per_row(session_factory, path, args.per_row)
+        print(f"per-row   {imported:7d} rows  {seconds:7.2f} s  {imported / seconds:9.0f} rows/s")
+        engine.dispose()
+
+        engine, session_factory = fresh_database(directory, "batched.sqlite3")
+        session = session_factory()
+        with open(path, encoding="utf-8", newline="") as stream:
+            report = ExampleImporter(session, batch_size=args.batch_size).run(stream, "csv")
+        print(f"batched   {report.imported:7d} rows  {report.seconds:7.2f} s  {report.rows_per_second:9.0f} rows/s")
+
+        started = time.perf_counter()
+        exported = export_examples(session, io.StringIO(), "csv", batch_size=args.batch_size)
+        seconds = time.perf_counter() - started
+        print(f"export    {exported:7d} rows  {seconds:7.2f} s  {exported / seconds:9.0f} rows/s")
+        session.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+FSM storage latency: get_data / update_data on a realistic training state.
+
+The state mirrors a running round: 20 prefetched questions plus counters.
+Redis is measured against fakeredis (in-process), so it shows serialization
+and client overhead, not network latency.
+
+Usage: python -m benchmarks.fsm_storage [--ops 2000]
+"""
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from app.fsm.serialization import dumps, loads
+from app.fsm.sqlite_storage import SQLiteStorage
+
+
+def training_state() -> dict:
+    questions = [
+        {
+            "example_id": i,
+            "sentence": f"Ich freue mich [x] das Wochenende, Satz {i}.",
+            "explanation": "sich freuen auf + Akkusativ (Zukunft)",
+            "category_id": 2,
+            "correct_answer": "auf",
+            "incorrect_answers": ["über", "an", "für", "mit"],
+            "answers_count": 4,
+        }
+        for i in range(20)
+    ]
+    return {"level_id": 2, "example_ids": list(range(20)), "questions": questions,
+            "current_index": 0, "correct_count": 0, "total_count": 20}
+
+
+async def measure(storage, ops: int):
+    keys = [StorageKey(bot_id=1, chat_id=i, user_id=i) for i in range(100)]
+    for key in keys:
+        await storage.set_data(key, training_state())
+
+    get_times, update_times = [], []
+    for i in range(ops):
+        key = keys[i % len(keys)]
+        started = time.perf_counter()
+        await storage.get_data(key)
+        get_times.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        await storage.update_data(key, {"current_index": i % 20})
+        update_times.append(time.perf_counter() - started)
+    return statistics.median(get_times), statistics.median(update_times)
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ops", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"state size: {len(dumps(training_state()).encode())} bytes compact JSON")
+    with tempfile.TemporaryDirectory() as tmp:
+        storages = {"memory": MemoryStorage(), "sqlite": SQLiteStorage(f"{tmp}/fsm.sqlite3")}
+        try:
+            import fakeredis
+            from aiogram.fsm.storage.redis import RedisStorage
+            storages["redis(fake)"] = RedisStorage(fakeredis.FakeAsyncRedis(), json_dumps=dumps, json_loads=loads)
+        except ImportError:
+            print("redis/fakeredis not installed, skipping redis")
+
+        for name, storage in storages.items():
+            get_median, update_median = await measure(storage, args.ops)
+            print(f"{name:12} get_data {get_median * 1e6:8.1f} µs   update_data {update_median * 1e6:8.1f} µs")
+            await storage.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,146 @@
+"""
+The bot's hot queries at growing data sizes: bare SQLite vs. the tuned profile and indexes.
+
+For each --sizes N a temporary database gets N examples (4 answers each, one or
+two of 5 levels, 7 categories) and a user with --history answered examples.
+The queries are then timed twice: "bare" without the example_levels/answers
+indexes and with default pragmas, "tuned" after migration 6 (the indexes and
+ANALYZE) and with app.db.session.tune_sqlite. Each query is the production code path:
+
+  settings   _get_user_settings of /start_training (primary key lookup)
+  history    LeitnerSelector._load_rows: the user's answers joined to their levels
+  round      load_round: 20 questions with all answers (send_example reads these)
+  list page  ExampleCatalog.page of /list_examples filtered by a level
+  list count ExampleCatalog.count of the same filter (cached for a minute in the bot)
+
+Usage: python -m benchmarks.queries [--sizes 1000 100000 1000000] [--history 3000] [--repeat 20]
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, insert, text
+from sqlalchemy.orm import sessionmaker
+
+from app.db.enums import CATEGORY_NAMES, LEVEL_NAMES
+from app.db.migrations import _index_hot_queries, _seed_reference_data
+from app.db.models import Answer, Base, Example, UserExampleStat, UserSettings, User, example_levels
+from app.db.session import tune_sqlite
+from app.services.example_catalog import ExampleCatalog
+from app.services.example_index import ExampleIndex
+from app.services.selector import LeitnerSelector
+from app.services.training import load_round
+
+NEW_INDEXES = ["ix_example_levels_level_id_example_id", "ix_example_levels_example_id", "ix_answers_example_id"]
+USER_ID = 1
+CHUNK = 20000
+
+
+def build(path: str, size: int, history: int):
+    # Tables, indexes and reference data; the search index is left out, it only slows the build
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        _seed_reference_data(connection)
+    level_ids = list(range(1, len(LEVEL_NAMES) + 1))
+    with engine.begin() as connection:
+        connection.execute(insert(User.__table__), [{"id": USER_ID, "username": "bench", "role": "user"}])
+        connection.execute(insert(UserSettings.__table__), [{"user_id": USER_ID, "answers_count": 4}])
+        for start in range(1, size + 1, CHUNK):
+            ids = range(start, min(start + CHUNK, size + 1))
+            connection.execute(insert(Example.__table__), [
+                {"id": i, "sentence": f"Satz {random.random():.8f} [x] Ende", "explanation": "Erklärung",
+                 "category_id": random.randint(1, len(CATEGORY_NAMES))}
+                for i in ids
+            ])
+            connection.execute(insert(Answer.__table__), [
+                {"example_id": i, "text": word, "is_correct": n == 0}
+                for i in ids for n, word in enumerate(("auf", "an", "für", "über"))
+            ])
+            links = []
+            for i in ids:
+                level = random.randint(1, len(level_ids) - 1)
+                links.append({"example_id": i, "level_id": level})
+                if random.random() < 0.5:
+                    links.append({"example_id": i, "level_id": level + 1})
+            connection.execute(insert(example_levels), links)
+        now = datetime.utcnow()
+        connection.execute(insert(UserExampleStat.__table__), [
+            {"user_id": USER_ID, "example_id": i, "correct_attempts": 1, "total_attempts": 2,
+             "box": random.randint(1, 5), "due_at": now + timedelta(days=random.randint(-3, 30))}
+            for i in random.sample(range(1, size + 1), min(history, size))
+        ])
+    engine.dispose()
+
+
+def measure(label: str, engine, size: int, repeat: int):
+    session_factory = sessionmaker(bind=engine)
+    selector = LeitnerSelector(ExampleIndex(), session_factory)
+    catalog = ExampleCatalog(ttl=0)
+
+    def settings(session):
+        session.query(UserSettings).filter_by(user_id=USER_ID).first()
+
+    def history(session):
+        selector._load_rows(USER_ID)
+
+    def round_(session):
+        load_round(session, random.sample(range(1, size + 1), 20), USER_ID)
+
+    def list_page(session):
+        catalog.page(session, 10, level_id=2, after=random.randint(1, size))
+
+    def list_count(session):
+        # Cached for a minute in production
+        catalog.count(session, level_id=2)
+
+    session = session_factory()
+    for name, query in (("settings", settings), ("history", history), ("round", round_), ("list page", list_page),
+                        ("list count", list_count)):
+        query(session)  # warm the cache
+        timings = []
+        deadline = time.perf_counter() + 10
+        while len(timings) < repeat and time.perf_counter() < deadline:
+            started = time.perf_counter()
+            query(session)
+            timings.append(time.perf_counter() - started)
+        timings.sort()
+        print(f"{size:>8} {label:6} {name:10} median {statistics.median(timings) * 1000:9.2f} ms   "
+              f"max {timings[-1] * 1000:9.2f} ms   ({len(timings)} runs)")
+    session.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000, 1000000])
+    parser.add_argument("--history", type=int, default=3000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "bench.sqlite3")
+            started = time.perf_counter()
+            build(path, size, args.history)
+            print(f"{size:>8} examples built in {time.perf_counter() - started:.1f} s")
+
+            engine = create_engine(f"sqlite:///{path}")
+            with engine.begin() as connection:
+                for name in NEW_INDEXES:
+                    connection.execute(text(f"DROP INDEX {name}"))
+            measure("bare", engine, size, args.repeat)
+            engine.dispose()
+
+            engine = tune_sqlite(create_engine(f"sqlite:///{path}"))
+            with engine.begin() as connection:
+                _index_hot_queries(connection)
+            measure("tuned", engine, size, args.repeat)
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
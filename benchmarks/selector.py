@@ -0,0 +1,58 @@
+"""
+Round selection cost for a heavy user: LeitnerSelector vs. RandomSelector.
+
+Builds an in-memory level of --examples ids and a user queue with --attempts
+answered examples (a mix of due and not-yet-due), then times select() for a
+round of --count examples. The user's queue is loaded once, as in production.
+
+Usage: python -m benchmarks.selector [--examples 40000] [--attempts 30000] [--count 20]
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from app.services.example_index import ExampleIndex
+from app.services.selector import LeitnerSelector, RandomSelector, _UserQueue
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--examples", type=int, default=40000)
+    parser.add_argument("--attempts", type=int, default=30000)
+    parser.add_argument("--count", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+
+    index = ExampleIndex()
+    for example_id in range(1, args.examples + 1):
+        index.add(example_id, [1])
+
+    now = time.time()
+    queue = _UserQueue()
+    for example_id in random.sample(range(1, args.examples + 1), args.attempts):
+        box = random.randint(1, 5)
+        due = now - 60 if random.random() < 0.02 else now + random.randint(1, 30) * 86400
+        queue.schedule(example_id, 1, box, due)
+
+    leitner = LeitnerSelector(index)
+    leitner._queues[42] = queue
+    random_selector = RandomSelector(index)
+
+    for label, selector in (("random", random_selector), ("leitner", leitner)):
+        timings = []
+        for _ in range(args.rounds):
+            started = time.perf_counter()
+            selected = await selector.select(42, 1, args.count)
+            timings.append(time.perf_counter() - started)
+            # Answer the round so the due-queues keep changing
+            for example_id in selected:
+                selector.record_answer(42, example_id, 1, random.random() < 0.7)
+        timings.sort()
+        print(f"{label:8} median {statistics.median(timings) * 1e6:8.1f} µs   "
+              f"p99 {timings[int(len(timings) * 0.99) - 1] * 1e6:8.1f} µs")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
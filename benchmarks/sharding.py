@@ -0,0 +1,123 @@
+"""
+Sharded workers under synthetic load.
+
+Feeds generated message updates from many chats through ShardSupervisor at a fixed
+rate and reports, per worker count, the throughput and latency (dispatch to handler
+finished) of every worker. Each handler does a little CPU work, an FSM update and
+an await, roughly like a training answer; no Telegram or database calls are made.
+
+Usage: python -m benchmarks.sharding [--workers 1 2 4] [--updates 6000] [--rate 3000]
+       [--chats 500] [--cpu-ms 0.5] [--io-ms 2]
+"""
+import argparse
+import asyncio
+import multiprocessing
+import statistics
+import time
+from collections import defaultdict
+from functools import partial
+
+from aiogram import Bot, Dispatcher, Router
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.types import Message
+
+from app.sharding import ShardSupervisor
+
+
+async def create_bench_worker(shard: int, cpu_ms: float, io_ms: float):
+    dp = Dispatcher(storage=MemoryStorage())
+    router = Router()
+
+    @router.message()
+    async def handler(message: Message, state: FSMContext):
+        deadline = time.perf_counter() + cpu_ms / 1000
+        while time.perf_counter() < deadline:
+            pass
+        await state.update_data(last=message.message_id)
+        await asyncio.sleep(io_ms / 1000)
+
+    dp.include_router(router)
+    return dp, Bot("42:TEST")
+
+
+def make_update(update_id: int, chat_id: int) -> dict:
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": int(time.time()),
+            "chat": {"id": chat_id, "type": "private"},
+            "from": {"id": chat_id, "is_bot": False, "first_name": "Load"},
+            "text": "auf",
+        },
+    }
+
+
+def percentile(values: list[float], share: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * share))]
+
+
+def run(workers: int, args) -> None:
+    report = multiprocessing.get_context("spawn").Queue()
+    factory = partial(create_bench_worker, cpu_ms=args.cpu_ms, io_ms=args.io_ms)
+    supervisor = ShardSupervisor(workers, factory, report)
+    supervisor.start()
+    try:
+        # Warm-up: one update per shard, so process start-up is not measured
+        for shard in range(workers):
+            supervisor.dispatch(make_update(-1 - shard, shard))
+        for _ in range(workers):
+            report.get(timeout=60)
+
+        started = time.monotonic()
+        interval = 1 / args.rate
+        for update_id in range(args.updates):
+            target = started + update_id * interval
+            delay = target - time.monotonic()
+            if delay > 0.001:
+                time.sleep(delay)
+            supervisor.dispatch(make_update(update_id, update_id % args.chats))
+
+        results = [report.get(timeout=60) for _ in range(args.updates)]
+    finally:
+        supervisor.stop()
+
+    by_shard = defaultdict(list)
+    last_seen: dict[int, int] = {}
+    out_of_order = 0
+    for shard, chat_id, update_id, dispatched_at, finished_at in sorted(results, key=lambda row: row[4]):
+        by_shard[shard].append((dispatched_at, finished_at))
+        if last_seen.get(chat_id, -1) > update_id:
+            out_of_order += 1
+        last_seen[chat_id] = update_id
+
+    print(f"\n{workers} worker(s), offered {args.rate}/s, {args.updates} updates, out of order: {out_of_order}")
+    all_latencies = []
+    for shard in sorted(by_shard):
+        rows = by_shard[shard]
+        latencies = [(finished - dispatched) * 1000 for dispatched, finished in rows]
+        all_latencies.extend(latencies)
+        span = max(finished for _, finished in rows) - min(dispatched for dispatched, _ in rows)
+        print(f"  worker {shard}: {len(rows):6d} updates  {len(rows) / span:8.0f}/s"
+              f"  p50 {statistics.median(latencies):7.2f} ms  p99 {percentile(latencies, 0.99):7.2f} ms")
+    span = max(row[4] for row in results) - started
+    print(f"  total:    {args.updates / span:8.0f}/s  p99 {percentile(all_latencies, 0.99):7.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--updates", type=int, default=6000)
+    parser.add_argument("--rate", type=float, default=3000)
+    parser.add_argument("--chats", type=int, default=500)
+    parser.add_argument("--cpu-ms", type=float, default=0.5)
+    parser.add_argument("--io-ms", type=float, default=2)
+    args = parser.parse_args()
+    for workers in args.workers:
+        run(workers, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,28 +2,30 @@ from aiogram.exceptions import TelegramAPIError
 
 from app.bot import dp, bot
 import asyncio
-# from app.middlewares.auth import RegisterUserMiddleware
-from app.db.models import Base
-from app.db.session import engine
-from app.services.init_db import init_db
+from app.config import BOT_MODE, BOT_WORKERS
+from app.startup import load_caches, prepare_database, setup_dispatcher
 
 async def main():
     print("🚀 Bot is starting...")
-    Base.metadata.create_all(bind=engine)
-    await init_db()
-    from app.handlers import editor, user
-    # dp.update.middleware(RegisterUserMiddleware())
-    dp.include_router(editor.router)
-    dp.include_router(user.router)
+    await prepare_database()
+    await load_caches()
+    setup_dispatcher(dp)
     print("✅ Bot is up and running!")
     await dp.start_polling(bot)
 
 if __name__ == '__main__':
     try:
-        asyncio.run(main())
+        if BOT_MODE == "webhook":
+            from app.webhook import run_webhook
+            run_webhook()
+        elif BOT_WORKERS > 1:
+            from app.sharding import run_sharded_polling
+            asyncio.run(run_sharded_polling(BOT_WORKERS))
+        else:
+            asyncio.run(main())
     except (KeyboardInterrupt, SystemExit):
         print("👋 Bot stopped.")
     except asyncio.CancelledError:
         print("🛑 Polling was cancelled.")
     except TelegramAPIError as e:
-        print(f"❌ Telegram API error: {e}")
\ No newline at end of file
+        print(f"❌ Telegram API error: {e}")
@@ -0,0 +1,21 @@
+import os
+import shutil
+import tempfile
+
+import pytest
+
+# The bot's engine is created on import from DATABASE_URL: point it at a throwaway
+# database before any app module is imported, so tests never touch a real one
+_database_dir = tempfile.mkdtemp(prefix="sprachbausteine-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_database_dir, 'db.sqlite3')}"
+
+
+@pytest.fixture(scope="session", autouse=True)
+def bot_database():
+    from app.db.migrations import migrate
+    from app.db.session import engine
+
+    migrate(engine)
+    yield engine
+    engine.dispose()
+    shutil.rmtree(_database_dir, ignore_errors=True)
@@ -0,0 +1,46 @@
+import os
+import shutil
+import socket
+import subprocess
+import tempfile
+
+import pytest
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture(scope="session")
+def postgres_url():
+    """
+    An empty PostgreSQL database: TEST_POSTGRES_URL when set, otherwise a throwaway
+    server started with the initdb and pg_ctl found in POSTGRES_BIN or on PATH.
+    """
+    url = os.getenv("TEST_POSTGRES_URL")
+    if url:
+        yield url
+        return
+
+    pytest.importorskip("psycopg", reason="the PostgreSQL tests use the psycopg driver")
+    bin_dir = os.getenv("POSTGRES_BIN")
+    initdb, pg_ctl = shutil.which("initdb", path=bin_dir), shutil.which("pg_ctl", path=bin_dir)
+    if not initdb or not pg_ctl:
+        pytest.skip("set TEST_POSTGRES_URL, or put initdb and pg_ctl on PATH (or in POSTGRES_BIN)")
+    if os.geteuid() == 0:
+        pytest.skip("PostgreSQL does not run as root; set TEST_POSTGRES_URL instead")
+
+    data_dir = tempfile.mkdtemp(prefix="sprachbausteine-pg-")
+    port = _free_port()
+    try:
+        subprocess.run([initdb, "-D", data_dir, "-U", "bot", "--auth=trust", "-E", "UTF8", "--no-locale"],
+                       check=True, capture_output=True)
+        subprocess.run([pg_ctl, "-D", data_dir, "-w", "-l", os.path.join(data_dir, "server.log"),
+                        "-o", f"-p {port} -k {data_dir} -c listen_addresses=127.0.0.1", "start"],
+                       check=True, capture_output=True)
+        yield f"postgresql+psycopg://bot@127.0.0.1:{port}/postgres"
+    finally:
+        subprocess.run([pg_ctl, "-D", data_dir, "-m", "immediate", "stop"], capture_output=True)
+        shutil.rmtree(data_dir, ignore_errors=True)
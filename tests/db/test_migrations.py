@@ -0,0 +1,82 @@
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.orm import Session
+
+from app.db.enums import CATEGORY_NAMES, LEVEL_NAMES
+from app.db.migrations import LATEST_VERSION, MIGRATIONS, migrate, schema_version
+from app.db.models import Base
+from app.services.example_transfer import ExampleImporter
+
+# user_example_stats as it was before the review columns existed
+LEGACY_SCHEMA = [
+    "CREATE TABLE users (id INTEGER PRIMARY KEY, username VARCHAR, role VARCHAR, created_at DATETIME)",
+    "CREATE TABLE levels (id INTEGER PRIMARY KEY, name VARCHAR NOT NULL UNIQUE)",
+    "CREATE TABLE user_example_stats (user_id INTEGER, example_id INTEGER, correct_attempts INTEGER,"
+    " total_attempts INTEGER, PRIMARY KEY (user_id, example_id))",
+    "CREATE TABLE example_levels (example_id INTEGER, level_id INTEGER)",
+    "INSERT INTO levels (id, name) VALUES (7, 'B1')",
+    "INSERT INTO user_example_stats VALUES (1, 2, 3, 4)",
+]
+
+
+def _engine(tmp_path):
+    return create_engine(f"sqlite:///{tmp_path / 'migrations.sqlite3'}")
+
+
+def _names(engine, table):
+    with engine.connect() as connection:
+        return [name for name, in connection.execute(text(f"SELECT name FROM {table} ORDER BY id"))]
+
+
+def test_new_database_gets_schema_and_reference_data(tmp_path):
+    engine = _engine(tmp_path)
+
+    assert migrate(engine) == len(MIGRATIONS)
+
+    assert schema_version(engine) == LATEST_VERSION
+    assert set(Base.metadata.tables) <= set(inspect(engine).get_table_names())
+    assert "examples_fts" in inspect(engine).get_table_names()
+    assert _names(engine, "levels") == LEVEL_NAMES
+    assert _names(engine, "categories") == CATEGORY_NAMES
+    engine.dispose()
+
+
+def test_up_to_date_database_costs_one_query(tmp_path):
+    engine = _engine(tmp_path)
+    migrate(engine)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    assert migrate(engine) == 0
+
+    assert statements == ["SELECT version FROM schema_version"]
+    assert _names(engine, "levels") == LEVEL_NAMES
+    engine.dispose()
+
+
+def test_legacy_database_is_upgraded_in_place(tmp_path):
+    engine = _engine(tmp_path)
+    with engine.begin() as connection:
+        for statement in LEGACY_SCHEMA:
+            connection.execute(text(statement))
+
+    migrate(engine)
+
+    columns = {column["name"] for column in inspect(engine).get_columns("user_example_stats")}
+    assert {"last_attempt_at", "box", "due_at"} <= columns
+    indexes = {index["name"] for index in inspect(engine).get_indexes("user_example_stats")}
+    assert "ix_user_example_stats_user_attempts" in indexes
+    indexes = {index["name"] for index in inspect(engine).get_indexes("example_levels")}
+    assert {"ix_example_levels_level_id_example_id", "ix_example_levels_example_id"} <= indexes
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT correct_attempts, total_attempts FROM user_example_stats")).one() == (3, 4)
+    # The existing level keeps its id, the missing ones are added once
+    assert sorted(_names(engine, "levels")) == sorted(LEVEL_NAMES)
+    assert _names(engine, "levels")[0] == "B1"
+    # Neighbouring levels follow the level order, not the ids
+    with Session(engine) as session:
+        importer = ExampleImporter(session)
+        row = {"sentence": "Ich warte [x] dich.", "correct_answer": "auf", "incorrect_answers": "an|für",
+               "category": CATEGORY_NAMES[0]}
+        assert importer.validate({**row, "levels": "B1|B2"})[1] is None
+        assert importer.validate({**row, "levels": "b2|a2"})[1] == "❗️Die gewählten Niveaus müssen aufeinanderfolgend sein."
+    engine.dispose()
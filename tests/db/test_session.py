@@ -0,0 +1,37 @@
+import threading
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.db.session import run_db, tune_sqlite
+
+
+@pytest.mark.asyncio
+async def test_run_db_executes_in_db_thread_pool():
+    def current_thread_name(prefix):
+        return prefix + threading.current_thread().name
+
+    result = await run_db(current_thread_name, "thread:")
+
+    # The blocking call must not run on the event loop thread
+    assert result.startswith("thread:db")
+
+
+@pytest.mark.asyncio
+async def test_run_db_propagates_exceptions():
+    def failing_query():
+        raise ValueError("broken query")
+
+    with pytest.raises(ValueError, match="broken query"):
+        await run_db(failing_query)
+
+
+def test_tuned_sqlite_connections_use_the_profile(tmp_path):
+    engine = tune_sqlite(create_engine(f"sqlite:///{tmp_path / 'tuned.sqlite3'}"))
+    with engine.connect() as connection:
+        pragmas = {name: connection.execute(text(f"PRAGMA {name}")).scalar()
+                   for name in ("journal_mode", "synchronous", "busy_timeout")}
+    engine.dispose()
+
+    # synchronous=1 is NORMAL
+    assert pragmas == {"journal_mode": "wal", "synchronous": 1, "busy_timeout": 5000}
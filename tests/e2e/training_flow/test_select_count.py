@@ -4,6 +4,9 @@ from aiogram.types import CallbackQuery
 from aiogram.fsm.context import FSMContext
 
 from app.handlers.user import handle_count_selection
+from app.keyboards.user import TrainCountCallback
+from app.services.example_index import ExampleIndex
+from app.services.selector import RandomSelector
 
 
 @pytest.mark.asyncio
@@ -17,7 +20,7 @@ async def test_e2e_select_count(mock_session_local, mock_send_example):
 
     # Step 1: Mock CallbackQuery
     mock_callback = AsyncMock(spec=CallbackQuery)
-    mock_callback.data = "train_count_5"
+    mock_callback.data = TrainCountCallback(count=5).pack()
     mock_callback.from_user = MagicMock()
     mock_callback.from_user.id = 123456
     mock_callback.message = AsyncMock()
@@ -35,13 +38,17 @@ async def test_e2e_select_count(mock_session_local, mock_send_example):
     })
     mock_state.update_data = AsyncMock()
 
-    # Step 3: Mock session query to return 5 example IDs
-    mock_session = MagicMock()
-    mock_session.query.return_value.join.return_value.filter.return_value.all.return_value = [(1,), (2,), (3,), (4,), (5,)]
-    mock_session_local.return_value = mock_session
-
-    # Step 4: Call the handler
-    await handle_count_selection(callback=mock_callback, state=mock_state)
+    # Step 3: Level 1 has 5 examples in the index; the round loader gets a mock session
+    example_index = ExampleIndex()
+    for example_id in range(1, 6):
+        example_index.add(example_id, [1])
+    mock_session_local.return_value = MagicMock()
+
+    # Step 4: Call the handler with random selection over that index
+    with patch("app.handlers.user.example_selector", RandomSelector(example_index)):
+        await handle_count_selection(
+            callback=mock_callback, callback_data=TrainCountCallback.unpack(mock_callback.data), state=mock_state
+        )
 
     # Step 5: Assert the bot responded correctly
     mock_callback.message.answer.assert_called_once()
@@ -3,6 +3,7 @@ from unittest.mock import AsyncMock, MagicMock
 from aiogram.types import CallbackQuery
 from aiogram.fsm.context import FSMContext
 from app.handlers.user import handle_level_selection
+from app.keyboards.user import TrainLevelCallback
 
 
 @pytest.mark.asyncio
@@ -14,7 +15,7 @@ async def test_e2e_select_level():
 
     # Step 1: Mock CallbackQuery object
     mock_callback = AsyncMock(spec=CallbackQuery)
-    mock_callback.data = "train_level_1"  # Correct format for handler
+    mock_callback.data = TrainLevelCallback(level_id=1).pack()  # Correct format for handler
     mock_callback.from_user = MagicMock()
     mock_callback.from_user.id = 123456
     mock_callback.message = AsyncMock()
@@ -30,7 +31,9 @@ async def test_e2e_select_level():
     mock_state.set_state = AsyncMock()
 
     # Step 3: Call the level selection handler
-    await handle_level_selection(callback=mock_callback, state=mock_state)
+    await handle_level_selection(
+        callback=mock_callback, callback_data=TrainLevelCallback.unpack(mock_callback.data), state=mock_state
+    )
 
     # Step 4: Verify that bot asks for number of questions
     mock_callback.message.answer.assert_called()
@@ -0,0 +1,120 @@
+import asyncio
+import logging
+import sqlite3
+
+import pytest
+import pytest_asyncio
+from aiogram import Dispatcher
+from aiogram.fsm.state import State, StatesGroup
+from aiogram.fsm.storage.base import StorageKey
+
+from app.fsm.serialization import dumps, loads
+from app.fsm.sqlite_storage import SQLiteStorage
+from app.services.reminders import reminder_scheduler
+from app.startup import setup_dispatcher
+
+KEY = StorageKey(bot_id=1, chat_id=10, user_id=10)
+
+
+class DemoFSM(StatesGroup):
+    in_progress = State()
+
+
+@pytest_asyncio.fixture(params=["sqlite", "redis"])
+async def storage(request, tmp_path):
+    if request.param == "sqlite":
+        storage = SQLiteStorage(str(tmp_path / "fsm.sqlite3"))
+    else:
+        fakeredis = pytest.importorskip("fakeredis")
+        from aiogram.fsm.storage.redis import RedisStorage
+        storage = RedisStorage(fakeredis.FakeAsyncRedis(), json_dumps=dumps, json_loads=loads)
+    yield storage
+    await storage.close()
+
+
+@pytest.mark.asyncio
+async def test_state_and_data_round_trip(storage):
+    await storage.set_state(KEY, DemoFSM.in_progress)
+    await storage.set_data(KEY, {"example_ids": [1, 2], "level_name": "Präpositionen"})
+    data = await storage.update_data(KEY, {"current_index": 1})
+
+    assert await storage.get_state(KEY) == DemoFSM.in_progress.state
+    assert data == {"example_ids": [1, 2], "level_name": "Präpositionen", "current_index": 1}
+    assert await storage.get_data(KEY) == data
+
+    await storage.set_state(KEY, None)
+    await storage.set_data(KEY, {})
+    assert await storage.get_state(KEY) is None
+    assert await storage.get_data(KEY) == {}
+
+
+@pytest.mark.asyncio
+async def test_sqlite_storage_survives_restart(tmp_path):
+    path = str(tmp_path / "fsm.sqlite3")
+    storage = SQLiteStorage(path, flush_interval=60)
+    await storage.set_state(KEY, DemoFSM.in_progress)
+    await storage.update_data(KEY, {"current_index": 3})
+    # Pending writes are flushed on close
+    await storage.close()
+
+    storage = SQLiteStorage(path)
+    assert await storage.get_state(KEY) == DemoFSM.in_progress.state
+    assert await storage.get_data(KEY) == {"current_index": 3}
+    await storage.close()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_storage_keeps_changes_of_a_failed_write(tmp_path, caplog):
+    path = str(tmp_path / "fsm.sqlite3")
+    storage = SQLiteStorage(path, flush_interval=0.01)
+    write, failures = storage._write, []
+
+    def flaky_write(states, data):
+        if not failures:
+            failures.append(states)
+            raise sqlite3.OperationalError("disk I/O error")
+        write(states, data)
+
+    storage._write = flaky_write
+    await storage.update_data(KEY, {"current_index": 3})
+    with caplog.at_level(logging.ERROR, logger="app.fsm.sqlite_storage"):
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if failures and not storage._dirty_data and not storage._writing_data:
+                break
+    assert await storage.get_data(KEY) == {"current_index": 3}
+    await storage.close()
+
+    assert "Failed to write FSM states" in caplog.text
+    storage = SQLiteStorage(path)
+    assert await storage.get_data(KEY) == {"current_index": 3}
+    await storage.close()
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_shutdown_closes_sqlite_storage_once(tmp_path, monkeypatch):
+    from app.handlers import editor, user
+    storage = SQLiteStorage(str(tmp_path / "fsm.sqlite3"), flush_interval=60)
+    dp = Dispatcher(storage=storage)
+    setup_dispatcher(dp)
+    reminders = asyncio.create_task(asyncio.sleep(60))
+    monkeypatch.setattr(reminder_scheduler, "_task", reminders)
+    try:
+        await storage.set_state(KEY, DemoFSM.in_progress)
+        await dp.emit_shutdown()
+    finally:
+        # The routers are module-level and may only be attached to one dispatcher at a time
+        for router in (editor.router, user.router):
+            router._parent_router = None
+
+    # Every hook ran: the reminder scheduler after the storage, and the state reached disk
+    assert reminders.cancelling()
+    assert reminder_scheduler._task is None
+    await storage.close()
+    storage = SQLiteStorage(str(tmp_path / "fsm.sqlite3"))
+    assert await storage.get_state(KEY) == DemoFSM.in_progress.state
+    await storage.close()
+
+
+def test_serialization_is_compact():
+    assert dumps({"level_name": "Übung", "ids": [1, 2]}) == '{"level_name":"Übung","ids":[1,2]}'
@@ -0,0 +1,67 @@
+from datetime import datetime
+
+import pytest
+from aiogram import Bot, Dispatcher, Router
+from aiogram.filters.callback_data import CallbackData
+from aiogram.types import CallbackQuery, Chat, Message, Update, User
+
+from app.handlers.callbacks import CallbackIndex
+
+
+class PickCallback(CallbackData, prefix="pk"):
+    item: int
+
+
+def _callback_update(data: str) -> Update:
+    user = User(id=1, is_bot=False, first_name="Anna")
+    message = Message(message_id=1, date=datetime.now(), chat=Chat(id=1, type="private"), text="x")
+    return Update(update_id=1, callback_query=CallbackQuery(
+        id="1", from_user=user, chat_instance="c", message=message, data=data,
+    ))
+
+
+@pytest.fixture
+def routed():
+    calls = []
+    router = Router()
+    callbacks = CallbackIndex()
+    callbacks.attach(router)
+
+    @callbacks(PickCallback)
+    async def pick(callback: CallbackQuery, callback_data: PickCallback):
+        calls.append(("pick", callback_data.item))
+
+    @callbacks("done")
+    async def done(callback: CallbackQuery):
+        calls.append(("done", None))
+
+    @router.callback_query()
+    async def fallback(callback: CallbackQuery):
+        calls.append(("fallback", callback.data))
+
+    dp = Dispatcher()
+    dp.include_router(router)
+    return dp, callbacks, calls
+
+
+@pytest.mark.asyncio
+async def test_callbacks_are_routed_by_prefix(routed):
+    dp, callbacks, calls = routed
+    bot = Bot("42:TEST")
+    for data in ["pk:7", "done", "done:1", "pk:not-a-number", "unknown"]:
+        await dp.feed_update(bot, _callback_update(data))
+    await bot.session.close()
+
+    assert len(callbacks) == 2
+    assert calls == [
+        ("pick", 7), ("done", None),
+        # Unparsable or unknown data falls through to later handlers
+        ("fallback", "done:1"), ("fallback", "pk:not-a-number"), ("fallback", "unknown"),
+    ]
+
+
+def test_duplicate_prefix_is_rejected():
+    callbacks = CallbackIndex()
+    callbacks(PickCallback)(lambda callback: None)
+    with pytest.raises(ValueError):
+        callbacks("pk")(lambda callback: None)
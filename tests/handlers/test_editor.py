@@ -0,0 +1,23 @@
+import pytest
+from collections import OrderedDict
+from unittest.mock import AsyncMock, patch
+
+from app.db.enums import UserRole
+
+
+@pytest.mark.asyncio
+@patch("app.handlers.editor.MAX_TRACKED_CHATS", 2)
+@patch("app.handlers.editor._chat_commands", new_callable=OrderedDict)
+async def test_chat_command_menus_are_remembered_for_recent_chats_only(chat_commands):
+    from app.handlers.editor import _set_chat_commands
+
+    bot = AsyncMock()
+    for chat_id in (1, 2, 1, 3):
+        await _set_chat_commands(bot, chat_id, UserRole.USER.value)
+
+    # Chat 1 was used again, so chat 2 is the one that dropped out
+    assert list(chat_commands) == [1, 3]
+    assert bot.set_my_commands.await_count == 3
+    await _set_chat_commands(bot, 2, UserRole.USER.value)
+    await _set_chat_commands(bot, 3, UserRole.EDITOR.value)
+    assert bot.set_my_commands.await_count == 5
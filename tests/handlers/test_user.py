@@ -29,14 +29,17 @@ async def test_cmd_bot_settings():
     # Get the markup that was sent
     markup: InlineKeyboardMarkup = kwargs["reply_markup"]
 
-    # Verify that the markup is an inline keyboard with one button
+    # Verify that the markup is an inline keyboard with two buttons
     assert isinstance(markup, InlineKeyboardMarkup)
-    assert len(markup.inline_keyboard) == 1
+    assert len(markup.inline_keyboard) == 2
 
-    # Check the button’s text and callback data
+    # Check the buttons’ text and callback data
     button = markup.inline_keyboard[0][0]
     assert button.text == "🔢 Antwortanzahl"
     assert button.callback_data == "setting_num_choices"
+    button = markup.inline_keyboard[1][0]
+    assert button.text == "⏰ Trainingszeit"
+    assert button.callback_data == "setting_training_time"
 
 
 
@@ -112,4 +115,125 @@ async def test_cmd_statistics_with_stats(mock_session_local):
     # Check that category name and stats appear correctly
     assert "🏷️ <b>Vocabulary</b> — <b>80%</b> (8/10)" in text_sent
     assert "🧮 <b>Gesamt</b> — <b>80%</b> (8/10)" in text_sent
-    assert kwargs.get("parse_mode") == "HTML"
\ No newline at end of file
+    assert kwargs.get("parse_mode") == "HTML"
+
+def _training_state():
+    from app.services.training import Question
+    question = Question(
+        example_id=1, sentence="Ich warte [x] den Bus.", explanation="warten auf + Akk", category_id=None,
+        correct_answer="auf", incorrect_answers=("an", "für"), answers_count=3,
+    )
+    return {
+        "round_nonce": "n0nce", "level_id": None, "example_ids": [1, 1], "questions": [question.to_dict()] * 2,
+        "current_index": 0, "correct_count": 0, "total_count": 2,
+    }
+
+
+@pytest.mark.asyncio
+@patch("app.handlers.user.stats_recorder")
+async def test_answer_buttons_use_compact_callbacks_and_reject_replays(mock_stats_recorder):
+    from aiogram.fsm.context import FSMContext
+    from aiogram.fsm.storage.base import StorageKey
+    from aiogram.fsm.storage.memory import MemoryStorage
+    from app.handlers.user import handle_answer, send_example
+    from app.keyboards.user import AnswerCallback
+
+    state = FSMContext(MemoryStorage(), StorageKey(bot_id=1, chat_id=5, user_id=5))
+    await state.set_data(_training_state())
+    message = AsyncMock()
+    message.from_user.id = 5
+
+    await send_example(message, state)
+
+    markup = message.answer.call_args.kwargs["reply_markup"]
+    buttons = [row[0] for row in markup.inline_keyboard]
+    assert all(len(button.callback_data.encode()) <= 16 for button in buttons)
+    data = await state.get_data()
+    assert "correct_answer" not in data
+    assert buttons[data["correct_option"]].text == "auf"
+
+    callback = AsyncMock()
+    callback.from_user.id = 5
+    clicked = AnswerCallback.unpack(buttons[data["correct_option"]].callback_data)
+    await handle_answer(callback, clicked, state)
+
+    assert "Richtig" in callback.message.answer.call_args_list[0].args[0]
+    data = await state.get_data()
+    assert (data["current_index"], data["correct_count"]) == (1, 1)
+
+    # A second click on the same button, or a button of another round, changes nothing
+    callback.message.answer.reset_mock()
+    callback.answer.reset_mock()
+    await handle_answer(callback, clicked, state)
+    await handle_answer(callback, AnswerCallback(nonce="other", question=1, option=0), state)
+    callback.message.answer.assert_not_called()
+    assert callback.answer.await_count == 2
+    assert (await state.get_data())["current_index"] == 1
+
+
+@pytest.mark.asyncio
+@patch("app.handlers.user.example_selector")
+@patch("app.handlers.user.stats_recorder")
+async def test_concurrent_clicks_on_one_question_are_answered_once(mock_stats_recorder, mock_example_selector):
+    import asyncio
+    from aiogram import Bot, Dispatcher
+    from aiogram.client.session.base import BaseSession
+    from aiogram.fsm.storage.base import StorageKey
+    from aiogram.fsm.storage.memory import MemoryStorage, SimpleEventIsolation
+    from aiogram.methods import AnswerCallbackQuery, SendMessage
+    from aiogram.types import Chat, Update
+    from app.handlers import user
+    from app.keyboards.user import AnswerCallback
+    from app.middlewares.fsm import BufferedStateMiddleware
+
+    class SlowBotSession(BaseSession):
+        # Every Bot API call takes a moment, so both clicks are in flight at once
+        def __init__(self):
+            super().__init__()
+            self.calls = []
+
+        async def make_request(self, bot, method, timeout=None):
+            self.calls.append(method)
+            await asyncio.sleep(0.01)
+            if isinstance(method, SendMessage):
+                return Message(message_id=len(self.calls), date=0, chat=Chat(id=method.chat_id, type="private"),
+                               text=method.text)
+            return True
+
+        async def stream_content(self, *args, **kwargs):
+            yield b""
+
+        async def close(self):
+            pass
+
+    # Set up like app.bot.dp
+    storage = MemoryStorage()
+    dp = Dispatcher(storage=storage, events_isolation=SimpleEventIsolation())
+    dp.update.outer_middleware(BufferedStateMiddleware())
+    dp.include_router(user.router)
+    bot = Bot("42:TEST", session=SlowBotSession())
+    key = StorageKey(bot_id=bot.id, chat_id=6, user_id=6)
+    await storage.set_data(key=key, data={**_training_state(), "correct_option": 0})
+    mock_example_selector.record_answer.return_value = (1, None)
+
+    def click(update_id: int) -> Update:
+        return Update.model_validate({"update_id": update_id, "callback_query": {
+            "id": str(update_id), "from": {"id": 6, "is_bot": False, "first_name": "A"}, "chat_instance": "x",
+            "data": AnswerCallback(nonce="n0nce", question=0, option=0).pack(),
+            "message": {"message_id": 1, "date": 0, "chat": {"id": 6, "type": "private"}, "text": "1/2"},
+        }})
+
+    try:
+        await asyncio.gather(dp.feed_update(bot, click(1)), dp.feed_update(bot, click(2)))
+    finally:
+        # The router is module-level and may only be attached to one dispatcher at a time
+        user.router._parent_router = None
+
+    replies = [call.text for call in bot.session.calls if isinstance(call, SendMessage)]
+    assert sum("Richtig" in text for text in replies) == 1
+    assert [call.text for call in bot.session.calls if isinstance(call, AnswerCallbackQuery)] == [
+        "Diese Frage ist bereits beantwortet."
+    ]
+    assert mock_stats_recorder.record_correct.call_count == 1
+    assert mock_example_selector.record_answer.call_count == 1
+    assert (await storage.get_data(key=key))["current_index"] == 1
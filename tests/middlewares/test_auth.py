@@ -0,0 +1,74 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.db.enums import UserRole
+from app.middlewares.auth import RegisterUserMiddleware, RoleMiddleware
+from app.services.role_cache import RoleCache
+
+
+@pytest.mark.asyncio
+async def test_role_cache_queries_once_per_ttl():
+    cache = RoleCache(ttl=60)
+    with patch.object(cache, "_load_role", return_value=UserRole.EDITOR.value) as load_role:
+        assert await cache.get_role(1) == UserRole.EDITOR.value
+        assert await cache.get_role(1) == UserRole.EDITOR.value
+
+    load_role.assert_called_once_with(1)
+
+
+@pytest.mark.asyncio
+async def test_role_cache_invalidation_and_expiry():
+    cache = RoleCache(ttl=0)
+    with patch.object(cache, "_load_role", side_effect=[None, UserRole.USER.value]) as load_role:
+        assert await cache.get_role(1) is None
+        # Expired immediately: the next lookup goes back to the database
+        assert await cache.get_role(1) == UserRole.USER.value
+    assert load_role.call_count == 2
+
+    cache = RoleCache(ttl=60)
+    cache.set_role(2, UserRole.EDITOR.value)
+    with patch.object(cache, "_load_role", return_value=UserRole.USER.value):
+        assert await cache.get_role(2) == UserRole.EDITOR.value
+        cache.invalidate(2)
+        assert await cache.get_role(2) == UserRole.USER.value
+
+
+@pytest.mark.asyncio
+async def test_role_middleware_injects_role():
+    cache = RoleCache(ttl=60)
+    cache.set_role(5, UserRole.EDITOR.value)
+    handler = AsyncMock(return_value="handled")
+    data = {"event_from_user": SimpleNamespace(id=5)}
+
+    result = await RoleMiddleware(cache)(handler, object(), data)
+
+    assert result == "handled"
+    assert handler.call_args[0][1]["role"] == UserRole.EDITOR.value
+
+
+@pytest.mark.asyncio
+async def test_role_middleware_without_user():
+    handler = AsyncMock()
+    data = {}
+
+    await RoleMiddleware(RoleCache())(handler, object(), data)
+
+    assert data["role"] is None
+
+
+@pytest.mark.asyncio
+async def test_register_middleware_skips_bots():
+    registry = AsyncMock()
+    handler = AsyncMock()
+
+    await RegisterUserMiddleware(registry)(handler, object(), {
+        "event_from_user": SimpleNamespace(id=1, is_bot=True, username="bot", full_name="Bot")
+    })
+    await RegisterUserMiddleware(registry)(handler, object(), {
+        "event_from_user": SimpleNamespace(id=2, is_bot=False, username=None, full_name="Anna Muster")
+    })
+
+    registry.ensure.assert_awaited_once_with(2, "Anna Muster")
+    assert handler.await_count == 2
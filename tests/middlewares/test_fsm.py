@@ -0,0 +1,115 @@
+from datetime import datetime
+
+import pytest
+from aiogram import Bot, Dispatcher, Router
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.types import Chat, Message, Update, User
+
+from app.fsm.buffered import BufferedFSMContext, FSMMetrics
+from app.middlewares.fsm import BufferedStateMiddleware
+
+
+class CountingStorage(MemoryStorage):
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    async def get_state(self, key):
+        self.calls.append("get_state")
+        return await super().get_state(key)
+
+    async def set_state(self, key, state=None):
+        self.calls.append("set_state")
+        await super().set_state(key, state)
+
+    async def get_data(self, key):
+        self.calls.append("get_data")
+        return await super().get_data(key)
+
+    async def set_data(self, key, data):
+        self.calls.append("set_data")
+        await super().set_data(key, data)
+
+
+KEY = StorageKey(bot_id=42, chat_id=1, user_id=1)
+
+
+@pytest.mark.asyncio
+async def test_buffered_context_coalesces_writes():
+    storage = CountingStorage()
+    await storage.set_data(KEY, {"current_index": 0, "correct_count": 0})
+    storage.calls.clear()
+
+    context = BufferedFSMContext(storage, KEY)
+    data = await context.get_data()
+    await context.update_data(correct_count=data["correct_count"] + 1)
+    await context.update_data(current_index=data["current_index"] + 1)
+    assert await context.get_value("current_index") == 1
+    await context.set_state("Training:answer")
+    # Nothing has reached the storage yet apart from the initial read
+    assert storage.calls == ["get_data"]
+
+    await context.commit()
+
+    assert storage.calls == ["get_data", "set_state", "set_data"]
+    assert await storage.get_data(KEY) == {"current_index": 1, "correct_count": 1}
+    assert await storage.get_state(KEY) == "Training:answer"
+    assert context.storage_calls == 3
+
+
+@pytest.mark.asyncio
+async def test_buffered_context_clear_and_noop_commit():
+    storage = CountingStorage()
+    await storage.set_state(KEY, "Training:answer")
+    await storage.set_data(KEY, {"level_id": 3})
+    storage.calls.clear()
+
+    context = BufferedFSMContext(storage, KEY, "Training:answer")
+    assert await context.get_state() == "Training:answer"
+    await context.commit()
+    assert storage.calls == []
+
+    await context.clear()
+    assert await context.get_data() == {}
+    await context.commit()
+    assert storage.calls == ["set_state", "set_data"]
+    assert await storage.get_state(KEY) is None
+    assert await storage.get_data(KEY) == {}
+
+
+@pytest.mark.asyncio
+async def test_middleware_commits_once_per_update():
+    storage = CountingStorage()
+    metrics = FSMMetrics()
+    dp = Dispatcher(storage=storage)
+    dp.update.outer_middleware(BufferedStateMiddleware(metrics))
+    router = Router()
+    seen = {}
+
+    @router.message()
+    async def handler(message: Message, state: FSMContext):
+        seen["type"] = type(state)
+        await state.update_data(level_id=2)
+        await state.update_data(example_ids=[1, 2, 3])
+        data = await state.get_data()
+        await state.update_data(current_index=data["current_index"] + 1 if "current_index" in data else 0)
+
+    dp.include_router(router)
+    bot = Bot("42:TEST")
+    user = User(id=1, is_bot=False, first_name="Anna")
+    update = Update(update_id=1, message=Message(
+        message_id=1, date=datetime.now(), chat=Chat(id=1, type="private"), from_user=user, text="hi",
+    ))
+
+    await dp.feed_update(bot, update)
+    await bot.session.close()
+
+    assert seen["type"] is BufferedFSMContext
+    assert storage.calls == ["get_state", "get_data", "set_data"]
+    assert await storage.get_data(StorageKey(bot_id=42, chat_id=1, user_id=1)) == {
+        "level_id": 2, "example_ids": [1, 2, 3], "current_index": 0,
+    }
+    assert metrics.snapshot()["updates"] == 1
+    assert metrics.snapshot()["max_calls_per_update"] == 3
@@ -0,0 +1,164 @@
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+from aiogram import Bot
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from app.middlewares.outbound import BROADCAST, OutboundRateLimiter, send_priority
+
+
+class FakeBotAPI:
+    """
+    Minimal local Bot API: records sendMessage calls and answers 429 on demand;
+    any other method just succeeds.
+    """
+
+    def __init__(self):
+        self.sent: list[tuple[int, str, float]] = []
+        self.other_calls: list[str] = []
+        self.flood_responses = 0
+        app = web.Application()
+        app.router.add_post("/bot{token}/{method}", self.handle)
+        self.server = TestServer(app)
+
+    async def handle(self, request: web.Request) -> web.Response:
+        form = await request.post()
+        if self.flood_responses:
+            self.flood_responses -= 1
+            return web.json_response({
+                "ok": False, "error_code": 429, "description": "Too Many Requests: retry after 1",
+                "parameters": {"retry_after": 1},
+            })
+        if request.match_info["method"] != "sendMessage":
+            self.other_calls.append(request.match_info["method"])
+            return web.json_response({"ok": True, "result": True})
+        chat_id = int(form["chat_id"])
+        self.sent.append((chat_id, form["text"], time.monotonic()))
+        return web.json_response({"ok": True, "result": {
+            "message_id": len(self.sent), "date": 0, "chat": {"id": chat_id, "type": "private"}, "text": form["text"],
+        }})
+
+
+@pytest_asyncio.fixture
+async def api():
+    fake = FakeBotAPI()
+    await fake.server.start_server()
+    yield fake
+    await fake.server.close()
+
+
+def _bot(api: FakeBotAPI, limiter: OutboundRateLimiter) -> Bot:
+    session = AiohttpSession(api=TelegramAPIServer.from_base(str(api.server.make_url(""))))
+    session.middleware(limiter)
+    return Bot("42:TEST", session=session)
+
+
+@pytest.mark.asyncio
+async def test_retry_after_is_waited_out(api):
+    limiter = OutboundRateLimiter(global_rate=100, chat_rate=100, chat_burst=1)
+    bot = _bot(api, limiter)
+    api.flood_responses = 1
+    started = time.monotonic()
+
+    message = await bot.send_message(7, "Hallo")
+    await bot.session.close()
+
+    assert message.text == "Hallo"
+    assert limiter.retries == 1
+    assert time.monotonic() - started >= 1
+
+
+@pytest.mark.asyncio
+async def test_per_chat_rate_keeps_order_and_spares_other_chats(api):
+    limiter = OutboundRateLimiter(global_rate=1000, chat_rate=20, chat_burst=2)
+    bot = _bot(api, limiter)
+
+    await asyncio.gather(
+        *(bot.send_message(1, f"busy {i}") for i in range(6)),
+        *(bot.send_message(chat_id, "other") for chat_id in range(2, 6)),
+    )
+    await bot.session.close()
+
+    busy = [(text, at) for chat_id, text, at in api.sent if chat_id == 1]
+    assert [text for text, _ in busy] == [f"busy {i}" for i in range(6)]
+    # Two in a burst, then one every 50 ms
+    assert busy[-1][1] - busy[0][1] >= 0.18
+    other = [at for chat_id, _, at in api.sent if chat_id != 1]
+    assert max(other) - busy[0][1] < 0.1
+
+
+@pytest.mark.asyncio
+async def test_interactive_sends_overtake_broadcasts(api):
+    limiter = OutboundRateLimiter(global_rate=20, chat_rate=1000, chat_burst=10)
+    bot = _bot(api, limiter)
+
+    async def broadcast():
+        with send_priority(BROADCAST):
+            await asyncio.gather(*(bot.send_message(100 + i, "reminder") for i in range(30)))
+
+    broadcasts = asyncio.create_task(broadcast())
+    await asyncio.sleep(0.1)
+    await bot.send_message(1, "answer")
+    answered_at = time.monotonic()
+    await broadcasts
+    await bot.session.close()
+
+    texts = [text for _, text, _ in api.sent]
+    # The initial burst of 20 plus the few granted while it was on its way went out before it,
+    # the remaining queued broadcasts after it (the margin absorbs a busy test machine)
+    assert texts.index("answer") <= 25
+    assert texts[texts.index("answer") + 1:] == ["reminder"] * (30 - texts.index("answer"))
+    assert sum(1 for *_, at in api.sent if at > answered_at) >= 5
+
+
+@pytest.mark.asyncio
+@patch("app.handlers.user.example_selector")
+@patch("app.handlers.user.stats_recorder")
+async def test_answer_clicks_are_not_slowed_by_edits(mock_stats_recorder, mock_example_selector, api):
+    from aiogram.fsm.context import FSMContext
+    from aiogram.fsm.storage.base import StorageKey
+    from aiogram.fsm.storage.memory import MemoryStorage
+    from aiogram.types import CallbackQuery
+    from app.handlers.user import handle_answer
+    from app.keyboards.user import AnswerCallback
+    from app.services.training import Question
+
+    # One chat slot every 50 ms, bursts of 3: the real limits at 20x speed
+    limiter = OutboundRateLimiter(global_rate=1000, chat_rate=20, chat_burst=3)
+    bot = _bot(api, limiter)
+    mock_example_selector.record_answer.return_value = (1, None)
+    question = Question(
+        example_id=1, sentence="Ich warte [x] den Bus.", explanation=None, category_id=1,
+        correct_answer="auf", incorrect_answers=("an", "für"), answers_count=3,
+    )
+    state = FSMContext(MemoryStorage(), StorageKey(bot_id=42, chat_id=8, user_id=8))
+    await state.set_data({
+        "round_nonce": "p4ce", "level_id": 1, "example_ids": [1] * 10, "questions": [question.to_dict()] * 10,
+        "current_index": 0, "correct_count": 0, "total_count": 10, "correct_option": 0,
+    })
+
+    latencies = []
+    for index in range(8):
+        correct_option = (await state.get_data())["correct_option"]
+        callback = CallbackQuery.model_validate({
+            "id": str(index), "chat_instance": "x", "data": "a",
+            "from": {"id": 8, "is_bot": False, "first_name": "A"},
+            "message": {"message_id": index + 1, "date": 0, "chat": {"id": 8, "type": "private"}, "text": "?"},
+        }, context={"bot": bot})
+        started = time.monotonic()
+        await handle_answer(callback, AnswerCallback(nonce="p4ce", question=index, option=correct_option), state)
+        latencies.append(time.monotonic() - started)
+        # Two new messages per click, one click per two chat slots: within the per-chat rate
+        await asyncio.sleep(0.1 - latencies[-1])
+    await bot.session.close()
+
+    assert api.other_calls == ["editMessageReplyMarkup"] * 8
+    assert len(api.sent) == 16
+    # The next question arrives without waiting for a chat slot (the first click also opens the connection)
+    assert max(latencies[1:]) < 0.04
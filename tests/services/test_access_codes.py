@@ -0,0 +1,96 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+from app.db.enums import UserRole
+from app.db.models import AccessCode, User
+from app.services.access_codes import (
+    CODE_ALPHABET, CODE_LENGTH, add_access_codes, create_access_codes, generate_codes, parse_codes,
+    redeem_access_code,
+)
+
+
+def test_parse_codes_accepts_commas_and_lines():
+    assert parse_codes(" A1, B2;C3\nD4\r\n\n  E5 ") == ["A1", "B2", "C3", "D4", "E5"]
+    assert parse_codes(" , \n") == []
+
+
+def test_add_reports_exact_added_and_duplicate_counts(db_session):
+    assert add_access_codes(db_session, ["A", "B", "A", "C"], chunk_size=2) == (3, 1)
+    # Known codes and repeats within the paste both count as duplicates
+    assert add_access_codes(db_session, ["C", "D", "D", "A", "E"], chunk_size=2) == (2, 3)
+
+    codes = db_session.query(AccessCode).order_by(AccessCode.code).all()
+    assert [code.code for code in codes] == ["A", "B", "C", "D", "E"]
+    assert not any(code.is_used for code in codes)
+    assert all(code.created_at is not None for code in codes)
+
+
+def test_generated_codes_are_random_and_stored(db_session):
+    codes = generate_codes(2000)
+    assert len(set(codes)) == 2000
+    assert all(len(code) == CODE_LENGTH and set(code) <= set(CODE_ALPHABET) for code in codes)
+
+    created = create_access_codes(db_session, 50, chunk_size=20)
+    assert len(set(created)) == 50
+    assert db_session.query(AccessCode).filter(AccessCode.code.in_(created)).count() == 50
+
+
+def test_redeem_claims_a_code_once_and_promotes_the_user(db_session, session_factory):
+    add_access_codes(db_session, ["CODE1"])
+    db_session.add(User(id=1, username="anna", role=UserRole.USER.value))
+    db_session.commit()
+
+    assert redeem_access_code(db_session, "CODE1", 1) is True
+    assert redeem_access_code(db_session, "CODE1", 2, "ben") is False
+    assert redeem_access_code(db_session, "UNKNOWN", 2, "ben") is False
+
+    check = session_factory()
+    code = check.query(AccessCode).filter_by(code="CODE1").one()
+    assert (code.is_used, code.used_by) == (True, 1)
+    assert check.get(User, 1).role == UserRole.EDITOR.value
+    assert check.get(User, 2) is None
+    check.close()
+
+
+def test_redeeming_a_code_does_not_demote_an_admin(db_session, session_factory):
+    add_access_codes(db_session, ["CODE1"])
+    db_session.add(User(id=1, username="root", role=UserRole.ADMIN.value))
+    db_session.commit()
+
+    assert redeem_access_code(db_session, "CODE1", 1) is True
+
+    check = session_factory()
+    assert check.get(User, 1).role == UserRole.ADMIN.value
+    assert check.query(AccessCode).filter_by(code="CODE1").one().used_by == 1
+    check.close()
+
+
+def test_concurrent_claims_never_redeem_a_code_twice(session_factory):
+    session = session_factory()
+    codes = generate_codes(20)
+    add_access_codes(session, codes)
+    session.close()
+
+    def claim(user_id: int) -> tuple[int, str | None]:
+        claim_session = session_factory()
+        try:
+            # Every user races for every code, in a different order
+            for code in random.sample(codes, len(codes)):
+                if redeem_access_code(claim_session, code, user_id):
+                    return user_id, code
+            return user_id, None
+        finally:
+            claim_session.close()
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = dict(pool.map(claim, range(1, 101)))
+
+    winners = {user_id: code for user_id, code in results.items() if code is not None}
+    assert len(winners) == len(codes)
+    assert sorted(winners.values()) == sorted(codes)
+
+    session = session_factory()
+    used = dict(session.query(AccessCode.code, AccessCode.used_by).filter(AccessCode.is_used.is_(True)))
+    assert used == {code: user_id for user_id, code in winners.items()}
+    assert session.query(User).filter(User.role == UserRole.EDITOR.value).count() == len(codes)
+    session.close()
@@ -0,0 +1,85 @@
+from sqlalchemy import event, text
+
+from app.db.models import Category, Example, Level
+from app.services.example_catalog import ExampleCatalog
+
+
+def _seed(session):
+    b1, b2 = Level(name="B1"), Level(name="B2")
+    verbs, nouns = Category(name="Verben"), Category(name="Nomen")
+    # Duplicate sentences make the id part of the sort key matter
+    examples = [Example(sentence=f"Satz {i % 9:02d} [x]") for i in range(25)]
+    for i, example in enumerate(examples):
+        example.levels.append(b1 if i % 2 else b2)
+        example.category = verbs if i % 3 else nouns
+    session.add_all([b1, b2, verbs, nouns, *examples])
+    session.commit()
+    return b1.id, verbs.id
+
+
+def _walk_forward(catalog, session, **filters):
+    pages, after = [], None
+    while True:
+        rows, has_previous, has_next = catalog.page(session, 10, after=after, **filters)
+        pages.append([row.id for row in rows])
+        assert has_previous == (after is not None)
+        if not has_next:
+            return pages
+        after = rows[-1].id
+
+
+def test_keyset_pages_cover_everything_in_order(db_session):
+    _seed(db_session)
+    catalog = ExampleCatalog()
+    expected = [row.id for row in db_session.query(Example).order_by(Example.sentence, Example.id)]
+
+    pages = _walk_forward(catalog, db_session)
+
+    assert [len(page) for page in pages] == [10, 10, 5]
+    assert sum(pages, []) == expected
+
+    # Going back from the last page returns the previous one
+    rows, has_previous, has_next = catalog.page(db_session, 10, before=pages[2][0])
+    assert [row.id for row in rows] == pages[1]
+    assert has_previous and has_next
+    rows, has_previous, _ = catalog.page(db_session, 10, before=pages[1][0])
+    assert [row.id for row in rows] == pages[0]
+    assert not has_previous
+
+
+def test_filters_by_level_and_category(db_session):
+    b1_id, verbs_id = _seed(db_session)
+    catalog = ExampleCatalog()
+
+    by_level = sum(_walk_forward(catalog, db_session, level_id=b1_id), [])
+    by_category = sum(_walk_forward(catalog, db_session, category_id=verbs_id), [])
+
+    assert len(by_level) == 12 and all(db_session.get(Example, i).levels[0].id == b1_id for i in by_level)
+    assert len(by_category) == 16 and all(db_session.get(Example, i).category_id == verbs_id for i in by_category)
+
+
+def test_totals_are_cached_and_bumped_on_insert(db_engine, db_session):
+    b1_id, verbs_id = _seed(db_session)
+    catalog = ExampleCatalog(ttl=60)
+    assert catalog.count(db_session) == 25
+    assert catalog.count(db_session, level_id=b1_id) == 12
+    assert catalog.count(db_session, category_id=verbs_id) == 16
+
+    statements = []
+    event.listen(db_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    catalog.on_insert(verbs_id, [b1_id + 1])
+
+    assert catalog.count(db_session) == 26
+    assert catalog.count(db_session, level_id=b1_id) == 12
+    assert catalog.count(db_session, category_id=verbs_id) == 17
+    assert statements == []
+
+
+def test_seek_uses_the_sentence_index(db_session):
+    plan = db_session.execute(text(
+        "EXPLAIN QUERY PLAN SELECT id, sentence FROM examples "
+        "WHERE (sentence, id) > ('Satz', 5) ORDER BY sentence, id LIMIT 11"
+    )).all()
+    details = " ".join(row[-1] for row in plan)
+    assert "ix_examples_sentence_id" in details
+    assert "TEMP B-TREE" not in details
@@ -0,0 +1,60 @@
+from app.db.models import Example, Level
+from app.services.example_index import ExampleIndex
+
+
+def _seed(session):
+    a2, b1 = Level(name="A2"), Level(name="B1")
+    examples = [Example(sentence=f"Satz {i} [x]") for i in range(7)]
+    for i, example in enumerate(examples):
+        example.levels.append(a2 if i < 5 else b1)
+    session.add_all([a2, b1, *examples])
+    session.commit()
+    return a2.id, b1.id
+
+
+def test_load_counts_examples_per_level(db_session):
+    a2_id, b1_id = _seed(db_session)
+    index = ExampleIndex()
+    index.load(db_session)
+
+    assert index.count(a2_id) == 5
+    assert index.count(b1_id) == 2
+    assert index.level_name(b1_id) == "B1"
+    assert index.levels_with_at_least(5) == [(a2_id, "A2")]
+
+
+def test_add_updates_counts_and_sampling(db_session):
+    a2_id, b1_id = _seed(db_session)
+    index = ExampleIndex()
+    index.load(db_session)
+
+    for example_id in (100, 101, 102):
+        index.add(example_id, [b1_id])
+    sample = index.sample(b1_id, 5)
+
+    assert index.count(b1_id) == 5
+    assert len(set(sample)) == 5
+    assert {100, 101, 102} <= set(sample)
+    assert (b1_id, "B1") in index.levels_with_at_least(5)
+
+
+def test_unknown_level_is_empty():
+    index = ExampleIndex()
+
+    assert index.count(42) == 0
+    assert index.sample(42, 0) == []
+
+
+def test_add_skips_examples_the_index_already_loaded(db_session):
+    a2_id, b1_id = _seed(db_session)
+    index = ExampleIndex()
+    index.load(db_session)
+    loaded = list(index.ids(a2_id))
+
+    # A worker restarted after the save reads the example at startup and again from its inbox
+    index.add(loaded[2], [a2_id])
+    index.add(100, [a2_id, b1_id])
+    index.add(100, [42])
+
+    assert list(index.ids(a2_id)) == loaded + [100]
+    assert index.count(b1_id) == 3 and index.count(42) == 1
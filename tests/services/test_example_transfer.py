@@ -0,0 +1,84 @@
+import io
+import json
+
+from app.db.models import Answer, Category, Example, Level, example_levels
+from app.services.example_transfer import ExampleImporter, export_examples
+
+CSV = """sentence,correct_answer,incorrect_answers,explanation,category,levels
+Ich warte [x] den Bus.,auf,an|für,warten auf + Akk,Verben,B1
+Er interessiert sich [x] Musik.,für,an|auf|über,,verben,B1|B2
+Ohne Lücke.,auf,an|für,,Verben,B1
+Ich denke [x] dich.,an,auf,,Verben,B1
+Wir sprechen [x] das Wetter.,über,von|an,,Verben,A2|B2
+Sie träumt [x] Urlaub.,vom,von|an,,Nomen,B1
+Er freut sich [x] das Fest.,auf,über|an,,,C1
+Er freut sich [x] den Sommer.,auf,über|an,,Verben,C1
+"""
+
+
+def _seed(session):
+    session.add_all([Level(name=name) for name in ("A2", "B1", "B2", "C1")] + [Category(name="Verben")])
+    session.commit()
+
+
+def test_import_validates_rows_and_inserts_in_batches(db_session):
+    _seed(db_session)
+    report = ExampleImporter(db_session, batch_size=2).run(io.StringIO(CSV), "csv")
+
+    assert (report.imported, report.rejected) == (3, 5)
+    assert [line for line, _ in report.errors] == [4, 5, 6, 7, 8]
+    assert "[x]" in report.errors[0][1]
+    assert "zwei falsche" in report.errors[1][1]
+    assert "aufeinanderfolgend" in report.errors[2][1]
+    assert report.errors[3][1] == "Unbekannte Kategorie: Nomen"
+    assert report.errors[4][1] == "Die Kategorie fehlt."
+
+    examples = db_session.query(Example).order_by(Example.id).all()
+    assert [e.sentence for e in examples] == [
+        "Ich warte [x] den Bus.", "Er interessiert sich [x] Musik.", "Er freut sich [x] den Sommer.",
+    ]
+    assert all(e.category_id is not None for e in examples) and examples[0].explanation == "warten auf + Akk"
+    assert [level.name for level in examples[1].levels] == ["B1", "B2"]
+    assert sorted((a.text, a.is_correct) for a in examples[1].answers) == [
+        ("an", False), ("auf", False), ("für", True), ("über", False),
+    ]
+    assert db_session.query(Answer).count() == 3 + 4 + 3
+    assert db_session.query(example_levels).count() == 4
+    # Reported for the in-process caches
+    assert report.examples == [
+        (example.id, example.category_id, [level.id for level in example.levels]) for example in examples
+    ]
+
+
+def test_export_round_trips_through_import(db_session):
+    _seed(db_session)
+    ExampleImporter(db_session).run(io.StringIO(CSV), "csv")
+
+    exports = {}
+    for fmt in ("csv", "jsonl"):
+        exported = io.StringIO()
+        assert export_examples(db_session, exported, fmt, batch_size=2) == 3
+        exports[fmt] = exported.getvalue()
+    first = json.loads(exports["jsonl"].splitlines()[0])
+    assert first["incorrect_answers"] == ["an", "für"] and first["levels"] == ["B1"]
+
+    # An export is a valid import file
+    for fmt, content in exports.items():
+        report = ExampleImporter(db_session).run(io.StringIO(content), fmt)
+        assert (report.imported, report.rejected) == (3, 0)
+    assert db_session.query(Example).count() == 9
+
+
+def test_unreadable_jsonl_lines_are_reported(db_session):
+    _seed(db_session)
+    lines = [
+        json.dumps({"sentence": "Ich warte [x] dich.", "correct_answer": "auf",
+                    "incorrect_answers": ["an", "für"], "category": "Verben", "levels": ["B1"]}),
+        "{not json",
+        "",
+        "[1, 2]",
+    ]
+    report = ExampleImporter(db_session).run(io.StringIO("\n".join(lines)), "jsonl")
+
+    assert report.imported == 1
+    assert [line for line, _ in report.errors] == [2, 4]
@@ -0,0 +1,79 @@
+import asyncio
+import time
+from datetime import datetime, time as dt_time
+from unittest.mock import AsyncMock
+from zoneinfo import ZoneInfo
+
+import pytest
+from aiogram.exceptions import TelegramForbiddenError
+from aiogram.methods import SendMessage
+from sqlalchemy import text
+
+from app.db.models import User, UserSettings
+from app.services.reminders import ReminderScheduler
+
+
+def _add_users(db_session, times: dict[int, dt_time | None]):
+    for user_id, training_time in times.items():
+        db_session.add(User(id=user_id, username=f"user{user_id}"))
+        db_session.add(UserSettings(user_id=user_id, training_time=training_time))
+    db_session.commit()
+
+
+@pytest.mark.asyncio
+async def test_fire_sends_to_the_users_of_the_minute(session_factory, db_session):
+    _add_users(db_session, {1: dt_time(7, 0), 2: dt_time(7, 0), 3: dt_time(18, 30), 4: None, 5: dt_time(7, 0)})
+    bot = AsyncMock()
+    bot.send_message.side_effect = [None, TelegramForbiddenError(SendMessage(chat_id=2, text=""), "blocked"), None]
+    scheduler = ReminderScheduler(session_factory, batch_size=2)
+    scheduler._bot = bot
+
+    assert scheduler._load_minutes() == {7 * 60, 18 * 60 + 30}
+    assert await scheduler.fire(7 * 60) == 3
+
+    assert sorted(call.args[0] for call in bot.send_message.call_args_list) == [1, 2, 5]
+    assert scheduler.sent == 2
+
+
+def test_users_of_a_minute_come_from_the_index(db_session):
+    plan = db_session.execute(text(
+        "EXPLAIN QUERY PLAN SELECT user_id FROM user_settings WHERE training_time = '07:00:00.000000'"
+    )).all()
+    assert "ix_user_settings_training_time" in " ".join(row[-1] for row in plan)
+
+
+def test_next_fire_uses_the_reminder_timezone():
+    scheduler = ReminderScheduler(timezone="Europe/Berlin")
+    berlin = ZoneInfo("Europe/Berlin")
+    # 06:59 in Berlin on a winter and a summer day
+    for day in (datetime(2026, 1, 15, 6, 59, tzinfo=berlin), datetime(2026, 7, 15, 6, 59, tzinfo=berlin)):
+        fire_at = scheduler.next_fire(7 * 60, day.timestamp())
+        assert datetime.fromtimestamp(fire_at, berlin) == day.replace(minute=0, hour=7)
+        # Once the minute has passed, the reminder moves to the next day
+        assert scheduler.next_fire(7 * 60, fire_at) - fire_at == 24 * 3600
+
+
+class _SoonScheduler(ReminderScheduler):
+    # Every minute fires 50 ms from now instead of at its wall-clock time
+    def next_fire(self, minute: int, now: float) -> float:
+        return time.time() + 0.05
+
+
+@pytest.mark.asyncio
+async def test_scheduler_loop_fires_due_minutes_and_new_times(session_factory, db_session):
+    _add_users(db_session, {1: dt_time(9, 0)})
+    bot = AsyncMock()
+    scheduler = _SoonScheduler(session_factory)
+
+    await scheduler.start(bot)
+    await asyncio.sleep(0.03)
+    assert bot.send_message.await_count == 0
+    # A user picks a new time; the running loop wakes up for it
+    db_session.add(User(id=2, username="user2"))
+    db_session.add(UserSettings(user_id=2, training_time=dt_time(20, 0)))
+    db_session.commit()
+    scheduler.notify(dt_time(20, 0))
+    await asyncio.sleep(0.1)
+    await scheduler.close()
+
+    assert {call.args[0] for call in bot.send_message.call_args_list} == {1, 2}
@@ -0,0 +1,56 @@
+from app.db.models import Answer, Example
+from app.services.search import ensure_search_index, fts_query, search_examples
+
+
+def _example(sentence, explanation, correct, *incorrect):
+    example = Example(sentence=sentence, explanation=explanation)
+    example.answers = [Answer(text=correct, is_correct=True), *(Answer(text=t, is_correct=False) for t in incorrect)]
+    return example
+
+
+def test_existing_examples_are_indexed_and_new_ones_follow(db_engine, db_session):
+    db_session.add(_example("Ich freue mich [x] den Urlaub.", "sich freuen auf + Akk", "auf", "über", "an"))
+    db_session.commit()
+    ensure_search_index(db_engine)
+    ensure_search_index(db_engine)  # idempotent
+
+    assert [s for _, s in search_examples(db_session, "Urlaub")] == ["Ich freue mich [x] den Urlaub."]
+
+    # Triggers keep the index in sync with inserts, updates and deletes
+    later = _example("Er denkt oft [x] seine Kindheit.", "denken an + Akk", "an", "über", "auf")
+    db_session.add(later)
+    db_session.commit()
+    assert [example_id for example_id, _ in search_examples(db_session, "Kindheit")] == [later.id]
+    assert {s for _, s in search_examples(db_session, "über")} == {
+        "Ich freue mich [x] den Urlaub.", "Er denkt oft [x] seine Kindheit.",
+    }
+
+    later.sentence = "Er denkt oft [x] seine Jugend."
+    later.answers[0].text = "daran"
+    db_session.commit()
+    assert search_examples(db_session, "Kindheit") == []
+    assert [s for _, s in search_examples(db_session, "daran")] == ["Er denkt oft [x] seine Jugend."]
+
+    db_session.delete(later.answers[0])
+    db_session.commit()
+    assert search_examples(db_session, "daran") == []
+
+
+def test_ranking_prefix_and_diacritics(db_engine, db_session):
+    ensure_search_index(db_engine)
+    db_session.add_all([
+        _example("Wir sprechen [x] das Wetter.", "sprechen über", "über", "von"),
+        _example("Das Gespräch [x] Politik war lang.", "Gespräch über + Akk; das Wetter ist egal", "über", "von"),
+    ])
+    db_session.commit()
+
+    # A hit in the sentence ranks above a hit in the explanation
+    assert [s for _, s in search_examples(db_session, "wetter")][0] == "Wir sprechen [x] das Wetter."
+    # Prefix of the last word, and umlauts found without them
+    assert [s for _, s in search_examples(db_session, "Gespr")] == ["Das Gespräch [x] Politik war lang."]
+    assert len(search_examples(db_session, "uber")) == 2
+
+
+def test_user_input_cannot_break_the_match_syntax():
+    assert fts_query('auf "OR* NEAR(') == '"auf" "OR" "NEAR"*'
+    assert fts_query("  !? ") is None
@@ -0,0 +1,100 @@
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from app.db.models import Example, Level, User, UserExampleStat
+from app.services.example_index import ExampleIndex
+from app.services.selector import LeitnerSelector, RandomSelector, BOX_INTERVALS
+
+
+@pytest.fixture
+def level_with_history(db_session):
+    level = Level(id=1, name="B1")
+    examples = [Example(id=i, sentence=f"Satz {i} [x]") for i in range(1, 21)]
+    for example in examples:
+        example.levels.append(level)
+    now = datetime.utcnow()
+    db_session.add_all([level, User(id=7, username="anna"), *examples])
+    db_session.add_all([
+        # Answered wrong: due right away
+        UserExampleStat(user_id=7, example_id=1, correct_attempts=0, total_attempts=1, box=1, due_at=now),
+        UserExampleStat(user_id=7, example_id=2, correct_attempts=0, total_attempts=2, box=1, due_at=now),
+        # Learned: due in a week
+        *[
+            UserExampleStat(user_id=7, example_id=i, correct_attempts=3, total_attempts=3, box=4,
+                            due_at=now + timedelta(days=7))
+            for i in range(3, 18)
+        ],
+    ])
+    db_session.commit()
+
+    index = ExampleIndex()
+    index.load(db_session)
+    return index
+
+
+@pytest.mark.asyncio
+async def test_leitner_prefers_due_then_unseen(session_factory, level_with_history):
+    selector = LeitnerSelector(level_with_history, session_factory)
+
+    selected = await selector.select(7, 1, 5)
+
+    # Two failed examples, then the three never-seen ones (18, 19, 20)
+    assert sorted(selected) == [1, 2, 18, 19, 20]
+
+
+@pytest.mark.asyncio
+async def test_leitner_falls_back_to_soonest_due(session_factory, level_with_history):
+    selector = LeitnerSelector(level_with_history, session_factory)
+
+    selected = await selector.select(7, 1, 10)
+
+    assert len(selected) == len(set(selected)) == 10
+    assert {1, 2, 18, 19, 20} <= set(selected)
+
+
+@pytest.mark.asyncio
+async def test_leitner_answers_reschedule_without_database(session_factory, level_with_history):
+    selector = LeitnerSelector(level_with_history, session_factory)
+    await selector.select(7, 1, 5)
+
+    box, due_at = selector.record_answer(7, 1, 1, is_correct=True)
+    assert box == 2
+    assert due_at > datetime.utcnow() + timedelta(seconds=BOX_INTERVALS[2] - 60)
+    assert selector.record_answer(7, 18, 1, is_correct=False)[0] == 1
+
+    # The user's queue is cached: no further reads for the next round
+    with patch.object(selector, "_load_rows", side_effect=AssertionError("database hit")):
+        selected = await selector.select(7, 1, 3)
+    assert 2 in selected and 18 in selected and 1 not in selected
+
+
+@pytest.mark.asyncio
+async def test_random_selector_caps_to_available(level_with_history):
+    selector = RandomSelector(level_with_history)
+
+    assert len(await selector.select(7, 1, 50)) == 20
+    assert selector.record_answer(7, 1, 1, True) == (None, None)
+
+
+@pytest.mark.asyncio
+async def test_leitner_finds_last_unseen_examples_of_a_mostly_seen_level():
+    index = ExampleIndex()
+    for example_id in range(1, 1001):
+        index.add(example_id, [1])
+    selector = LeitnerSelector(index)
+    await _warm_queue(selector, user_id=3, seen=range(1, 996))
+
+    selected = await selector.select(3, 1, 5)
+
+    assert sorted(selected) == [996, 997, 998, 999, 1000]
+    selector.record_answer(3, 998, 1, is_correct=True)
+    assert 998 not in selector._queues[3].unseen_pool(1, index.ids(1))
+
+
+async def _warm_queue(selector: LeitnerSelector, user_id: int, seen):
+    with patch.object(selector, "_load_rows", return_value=[]):
+        await selector.select(user_id, 1, 0)
+    for example_id in seen:
+        selector.record_answer(user_id, example_id, 1, is_correct=True)
@@ -0,0 +1,20 @@
+from app.db.models import Example, UserExampleStat
+from app.services.statistics import weakest_examples
+
+
+def test_weakest_examples_orders_by_accuracy(db_session):
+    db_session.add_all([Example(id=i, sentence=f"Satz {i} [x]") for i in range(1, 5)])
+    db_session.add_all([
+        UserExampleStat(user_id=1, example_id=1, correct_attempts=4, total_attempts=4),
+        UserExampleStat(user_id=1, example_id=2, correct_attempts=1, total_attempts=4),
+        UserExampleStat(user_id=1, example_id=3, correct_attempts=0, total_attempts=1),
+        UserExampleStat(user_id=1, example_id=4, correct_attempts=1, total_attempts=2),
+        UserExampleStat(user_id=2, example_id=1, correct_attempts=0, total_attempts=9),
+    ])
+    db_session.commit()
+
+    rows = weakest_examples(db_session, user_id=1, limit=3)
+
+    assert [row.example_id for row in rows] == [3, 2, 4]
+    assert rows[1].sentence == "Satz 2 [x]"
+    assert weakest_examples(db_session, user_id=1, min_attempts=3)[0].example_id == 2
@@ -0,0 +1,140 @@
+import asyncio
+import logging
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app.db.models import UserCategoryStat, UserExampleStat
+from app.services.stats_recorder import StatsRecorder
+
+
+def _stats(session):
+    session.expire_all()
+    return {
+        (s.user_id, s.category_id): (s.correct_attempts, s.total_attempts)
+        for s in session.query(UserCategoryStat).all()
+    }
+
+
+@pytest.mark.asyncio
+async def test_flush_upserts_buffered_increments(session_factory, db_session):
+    recorder = StatsRecorder(session_factory, flush_threshold=1000)
+    for _ in range(3):
+        recorder.record_attempt(1, 10)
+    recorder.record_correct(1, 10)
+    recorder.record_attempt(2, 10)
+
+    # Nothing is written until a flush
+    assert _stats(db_session) == {}
+
+    await recorder.flush()
+    assert _stats(db_session) == {(1, 10): (1, 3), (2, 10): (0, 1)}
+
+    recorder.record_attempt(1, 10)
+    recorder.record_correct(1, 10)
+    await recorder.flush()
+    assert _stats(db_session) == {(1, 10): (2, 4), (2, 10): (0, 1)}
+
+
+@pytest.mark.asyncio
+async def test_threshold_triggers_background_flush(session_factory, db_session):
+    recorder = StatsRecorder(session_factory, flush_threshold=3)
+    recorder.record_attempt(5, 1)
+    recorder.record_attempt(5, 1)
+    recorder.record_attempt(5, 2)
+
+    for _ in range(100):
+        if _stats(db_session):
+            break
+        await asyncio.sleep(0.01)
+    assert _stats(db_session) == {(5, 1): (0, 2), (5, 2): (0, 1)}
+
+
+@pytest.mark.asyncio
+async def test_close_flushes_pending_increments(session_factory, db_session):
+    recorder = StatsRecorder(session_factory, flush_interval=3600)
+    await recorder.start()
+    recorder.record_attempt(9, 3)
+
+    await recorder.close()
+
+    assert _stats(db_session) == {(9, 3): (0, 1)}
+
+
+@pytest.mark.asyncio
+async def test_flush_writes_per_example_attempts(session_factory, db_session):
+    recorder = StatsRecorder(session_factory, flush_threshold=1000)
+    recorder.record_answer(1, 100, is_correct=False)
+    recorder.record_answer(1, 100, is_correct=True)
+    recorder.record_answer(1, 200, is_correct=True)
+    await recorder.flush()
+    recorder.record_answer(1, 100, is_correct=False)
+    await recorder.flush()
+
+    db_session.expire_all()
+    stats = {s.example_id: s for s in db_session.query(UserExampleStat).filter_by(user_id=1)}
+    assert (stats[100].correct_attempts, stats[100].total_attempts) == (1, 3)
+    assert (stats[200].correct_attempts, stats[200].total_attempts) == (1, 1)
+    assert stats[100].last_attempt_at >= stats[200].last_attempt_at
+
+
+@pytest.mark.asyncio
+async def test_examples_without_category_have_no_category_stats(session_factory, db_session):
+    recorder = StatsRecorder(session_factory, flush_threshold=1000)
+    recorder.record_attempt(1, 3)
+    recorder.record_attempt(1, None)
+    recorder.record_correct(1, None)
+    recorder.record_answer(1, 10, is_correct=True)
+
+    await recorder.flush()
+
+    assert _stats(db_session) == {(1, 3): (0, 1)}
+
+
+@pytest.mark.asyncio
+@pytest.mark.filterwarnings("ignore::sqlalchemy.exc.SAWarning")
+async def test_rejected_rows_are_dropped_and_the_rest_written(session_factory, db_session):
+    recorder = StatsRecorder(session_factory, flush_threshold=1000)
+    recorder.record_attempt(1, 3)
+    recorder.record_answer(1, 10, is_correct=True)
+    # NOT NULL primary key column: the database rejects this row
+    recorder.record_answer(1, None, is_correct=True)
+
+    await recorder.flush()
+    await recorder.flush()
+
+    assert _stats(db_session) == {(1, 3): (0, 1)}
+    db_session.expire_all()
+    assert [s.example_id for s in db_session.query(UserExampleStat).filter_by(user_id=1)] == [10]
+    assert recorder._pending_size() == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_a_bounded_buffer(db_session, caplog):
+    def broken_session():
+        raise OperationalError("INSERT", {}, Exception("database is unavailable"))
+
+    recorder = StatsRecorder(broken_session, flush_threshold=1000, max_pending=2)
+    recorder.record_attempt(1, 1)
+    recorder.record_attempt(1, 2)
+    recorder.record_attempt(1, 3)
+
+    with pytest.raises(OperationalError):
+        await recorder.flush()
+    assert recorder._pending_size() == 2
+
+    # Rows already pending keep accumulating; shutdown logs the failure instead of raising
+    recorder.record_attempt(1, 1)
+    await recorder.close()
+    assert recorder._pending[(1, 1)] == [0, 2]
+
+    # A flush started by the threshold logs its failure instead of leaving it in the task
+    recorder = StatsRecorder(broken_session, flush_threshold=3, max_pending=2)
+    with caplog.at_level(logging.ERROR, logger="app.services.stats_recorder"):
+        for category_id in (1, 2, 3):
+            recorder.record_attempt(1, category_id)
+        threshold_flush = recorder._threshold_flush
+        await threshold_flush
+    assert threshold_flush.exception() is None
+    assert "Failed to flush training statistics" in caplog.text
+    assert recorder._pending_size() == 2 and recorder._threshold_flush is None
@@ -0,0 +1,68 @@
+from sqlalchemy import event
+
+from app.db.models import Example, Answer, Category, UserSettings, User
+from app.services.training import Question, load_round, DEFAULT_ANSWERS_COUNT
+
+
+def _add_example(session) -> Example:
+    category = session.query(Category).filter_by(name="Präpositionen").first() or Category(name="Präpositionen")
+    example = Example(sentence="Ich warte [x] dich.", explanation="warten auf + Akk.", category=category)
+    example.answers = [
+        Answer(text="auf", is_correct=True),
+        Answer(text="an", is_correct=False),
+        Answer(text="für", is_correct=False),
+        Answer(text="über", is_correct=False),
+    ]
+    session.add(example)
+    session.commit()
+    return example
+
+
+def test_question_carries_answers_and_settings(db_engine, db_session):
+    example = _add_example(db_session)
+    db_session.add_all([User(id=7, username="anna"), UserSettings(user_id=7, answers_count=4)])
+    db_session.commit()
+    example_id, category_id = example.id, example.category_id
+
+    statements = []
+    event.listen(db_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    [question] = load_round(db_session, [example_id], user_id=7)
+
+    assert len(statements) == 1
+    assert question.sentence == "Ich warte [x] dich."
+    assert question.explanation == "warten auf + Akk."
+    assert question.category_id == category_id
+    assert question.correct_answer == "auf"
+    assert sorted(question.incorrect_answers) == ["an", "für", "über"]
+    assert question.answers_count == 4
+
+
+def test_answers_count_defaults_without_settings(db_session):
+    example = _add_example(db_session)
+
+    [question] = load_round(db_session, [example.id], user_id=99)
+    options = question.pick_options()
+
+    assert question.answers_count == DEFAULT_ANSWERS_COUNT
+    assert len(options) == DEFAULT_ANSWERS_COUNT
+    assert "auf" in options
+
+
+def test_load_round_prefetches_all_questions_in_order(db_engine, db_session):
+    first = _add_example(db_session)
+    second = _add_example(db_session)
+    ids = [second.id, 424242, first.id]
+
+    statements = []
+    event.listen(db_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    questions = load_round(db_session, ids, user_id=1)
+
+    assert len(statements) == 1
+    assert [q.example_id for q in questions] == [ids[0], ids[2]]
+
+
+def test_question_survives_fsm_round_trip(db_session):
+    example = _add_example(db_session)
+    [question] = load_round(db_session, [example.id], user_id=1)
+
+    assert Question.from_dict(question.to_dict()) == question
@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+from sqlalchemy import event
+
+from app.db.enums import UserRole
+from app.db.models import User
+from app.services.role_cache import RoleCache
+from app.services.user_registry import UserRegistry
+
+
+@pytest.mark.asyncio
+async def test_new_users_arriving_together_share_one_insert(db_engine, session_factory, db_session):
+    db_session.add(User(id=3, username="old", role=UserRole.EDITOR.value))
+    db_session.commit()
+    cache = RoleCache(session_factory)
+    registry = UserRegistry(session_factory, cache, batch_window=0.01)
+
+    statements = []
+    event.listen(db_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    await asyncio.gather(*(registry.ensure(user_id, f"user{user_id}") for user_id in range(1, 51)))
+
+    assert len([s for s in statements if s.startswith("INSERT")]) == 1
+    assert db_session.query(User).count() == 50
+    # The pre-existing editor keeps its role; new users are cached as plain users
+    assert db_session.get(User, 3).role == UserRole.EDITOR.value
+    assert await cache.get_role(3) == UserRole.EDITOR.value
+    assert await cache.get_role(7) == UserRole.USER.value
+
+    statements.clear()
+    await registry.ensure(7, "user7")
+    assert statements == []
+
+
+@pytest.mark.asyncio
+async def test_preloaded_users_never_touch_the_database(db_engine, session_factory, db_session):
+    db_session.add(User(id=1, username="anna"))
+    db_session.commit()
+    registry = UserRegistry(session_factory)
+    registry.load(db_session)
+
+    statements = []
+    event.listen(db_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    await registry.ensure(1, "anna")
+
+    assert registry.is_known(1)
+    assert statements == []
+
+
+@pytest.mark.asyncio
+async def test_batch_is_flushed_early_when_full(session_factory, db_session):
+    registry = UserRegistry(session_factory, RoleCache(session_factory), batch_window=60, max_batch=3)
+
+    await asyncio.wait_for(asyncio.gather(*(registry.ensure(i, "x") for i in (1, 2, 3))), timeout=5)
+
+    assert db_session.query(User).count() == 3
@@ -0,0 +1,127 @@
+import asyncio
+import queue
+from datetime import time as dt_time
+
+import pytest
+from aiogram import Bot, Dispatcher, Router
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.types import Message, Update
+
+from app.services.example_catalog import ExampleCatalog
+from app.services.example_events import ExampleEvents
+from app.services.example_index import ExampleIndex
+from app.services.reminders import ReminderScheduler
+from app.sharding import (
+    ShardSupervisor, ShardWorker, link_examples, link_reminders, update_chat_id, update_payload,
+)
+from benchmarks.sharding import make_update
+
+
+def test_update_chat_id():
+    assert update_chat_id(make_update(1, 77)) == 77
+    callback = {"update_id": 2, "callback_query": {
+        "id": "1", "from": {"id": 5}, "chat_instance": "x", "data": "train_answer_0",
+        "message": {"message_id": 3, "date": 0, "chat": {"id": -100}},
+    }}
+    assert update_chat_id(callback) == -100
+    assert update_chat_id({"update_id": 3, "inline_query": {"id": "1", "from": {"id": 9}, "query": ""}}) == 9
+    assert update_chat_id({"update_id": 4, "poll": {"id": "1"}}) is None
+
+
+def test_polled_updates_are_routed_like_webhook_json():
+    # An inline-keyboard callback of an inline message carries no message, only the sender
+    raw = {"update_id": 5, "callback_query": {
+        "id": "1", "from": {"id": 41, "is_bot": False, "first_name": "A"},
+        "chat_instance": "x", "inline_message_id": "m", "data": "a:n:0:1",
+    }}
+    payload = update_payload(Update.model_validate(raw))
+
+    assert payload["callback_query"]["from"]["id"] == 41
+    assert update_chat_id(payload) == update_chat_id(raw) == 41
+
+
+def test_supervisor_routes_by_chat():
+    supervisor = ShardSupervisor(3)
+    shards = [supervisor.dispatch(make_update(update_id, chat_id))
+              for update_id, chat_id in enumerate([4, 5, 4, 9, 4])]
+
+    assert shards == [1, 2, 1, 0, 1]
+    assert supervisor.dispatched == [1, 3, 1]
+    chat_id, _, update = supervisor._inboxes[1].get(timeout=5)
+    assert (chat_id, update["update_id"]) == (4, 0)
+
+
+@pytest.mark.asyncio
+async def test_worker_keeps_chat_order_and_drains_on_stop():
+    dp = Dispatcher(storage=MemoryStorage())
+    router = Router()
+    handled = []
+
+    @router.message()
+    async def handler(message: Message):
+        # Earlier updates of a chat take longer, so concurrent handling would reorder them
+        await asyncio.sleep((30 - message.message_id) / 2000)
+        handled.append((message.chat.id, message.message_id))
+
+    dp.include_router(router)
+    bot = Bot("42:TEST")
+    report = queue.Queue()
+    worker = ShardWorker(0, dp, bot, report)
+    inbox = queue.Queue()
+    for update_id in range(30):
+        inbox.put((update_id % 3, 0.0, make_update(update_id, update_id % 3)))
+    inbox.put(None)
+
+    await asyncio.wait_for(worker.run(inbox), timeout=10)
+
+    assert worker.handled == 30
+    assert report.qsize() == 30
+    for chat_id in range(3):
+        assert [update_id for chat, update_id in handled if chat == chat_id] == list(range(chat_id, 30, 3))
+
+
+@pytest.mark.asyncio
+async def test_reminder_times_chosen_in_any_shard_reach_shard_0():
+    # Shard 0's inbox; in production a multiprocessing queue shared with every worker
+    primary_inbox = queue.Queue()
+    schedulers = [ReminderScheduler() for _ in range(3)]
+    controls = [link_reminders(shard, primary_inbox, scheduler) for shard, scheduler in enumerate(schedulers)]
+
+    schedulers[1].notify(dt_time(7, 30))
+    schedulers[2].notify(dt_time(18, 0))
+    schedulers[2].notify(None)
+    primary_inbox.put((0, 0.0, make_update(1, 3)))
+    primary_inbox.put(None)
+    worker = ShardWorker(0, Dispatcher(storage=MemoryStorage()), Bot("42:TEST"), controls=controls[0])
+    await asyncio.wait_for(worker.run(primary_inbox), timeout=10)
+
+    assert schedulers[0]._scheduled == {7 * 60 + 30, 18 * 60}
+    assert not schedulers[1]._scheduled and not schedulers[2]._scheduled
+    assert worker.handled == 1
+
+
+@pytest.mark.asyncio
+async def test_examples_saved_in_one_shard_reach_every_shard():
+    inboxes = [queue.Queue() for _ in range(3)]
+    events = [ExampleEvents(ExampleIndex(), ExampleCatalog()) for _ in range(3)]
+    controls = [link_examples(shard, inboxes, shard_events) for shard, shard_events in enumerate(events)]
+
+    events[1].added([(7, 2, [1, 3])])
+    events[1].added([])
+    for shard in range(3):
+        inboxes[shard].put(None)
+        worker = ShardWorker(shard, Dispatcher(storage=MemoryStorage()), Bot("42:TEST"), controls=controls[shard])
+        await asyncio.wait_for(worker.run(inboxes[shard]), timeout=10)
+
+    # The saving shard applied the example itself and sent it to the other two only
+    for shard_events in events:
+        assert list(shard_events._index.ids(1)) == [7] and list(shard_events._index.ids(3)) == [7]
+
+
+def test_a_single_worker_broadcasts_nothing():
+    events = ExampleEvents(ExampleIndex(), ExampleCatalog())
+    inbox = queue.Queue()
+
+    assert link_examples(0, [inbox], events) == {}
+    events.added([(7, 2, [1])])
+    assert inbox.empty() and events._index.count(1) == 1
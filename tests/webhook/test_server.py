@@ -0,0 +1,79 @@
+from datetime import datetime
+
+import pytest
+from aiogram import Bot, Dispatcher, Router
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.types import Chat, Message, Update, User
+from aiohttp.test_utils import TestClient, TestServer
+
+from app.webhook import build_app
+
+SECRET = "test-secret"
+
+
+def _update(update_id: int) -> dict:
+    message = Message(
+        message_id=update_id, date=datetime.now(), chat=Chat(id=1, type="private"),
+        from_user=User(id=1, is_bot=False, first_name="Anna"), text="hallo",
+    )
+    return Update(update_id=update_id, message=message).model_dump(mode="json", exclude_none=True)
+
+
+@pytest.fixture
+def dispatcher():
+    dp = Dispatcher(storage=MemoryStorage())
+    router = Router()
+    dp["received"] = []
+
+    @router.message()
+    async def handler(message: Message, received: list):
+        received.append(message.text)
+
+    dp.include_router(router)
+    return dp
+
+
+async def _client(dispatcher: Dispatcher, bot: Bot) -> TestClient:
+    app = build_app(dispatcher, bot, SECRET, path="/hook", handle_in_background=False)
+    client = TestClient(TestServer(app))
+    await client.start_server()
+    return client
+
+
+@pytest.mark.asyncio
+async def test_webhook_feeds_updates_with_valid_secret(dispatcher):
+    client = await _client(dispatcher, Bot("42:TEST"))
+    try:
+        response = await client.post(
+            "/hook", json=_update(1), headers={"X-Telegram-Bot-Api-Secret-Token": SECRET},
+        )
+        assert response.status == 200
+        assert dispatcher["received"] == ["hallo"]
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_webhook_rejects_wrong_secret(dispatcher):
+    client = await _client(dispatcher, Bot("42:TEST"))
+    try:
+        response = await client.post(
+            "/hook", json=_update(2), headers={"X-Telegram-Bot-Api-Secret-Token": "wrong"},
+        )
+        assert response.status == 401
+        assert dispatcher["received"] == []
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_healthz(dispatcher):
+    client = await _client(dispatcher, Bot("42:TEST"))
+    try:
+        response = await client.get("/healthz")
+        body = await response.json()
+        assert response.status == 200
+        assert body["status"] == "ok"
+        assert "calls_per_update" in body["fsm"]
+    finally:
+        await client.close()